@@ -1,6 +1,9 @@
-from fastapi import APIRouter
+from typing import Any
+
+from fastapi import APIRouter, Response, status
 
 from app.infra.db import health_check
+from app.services.asr.warmup import warmup_state
 
 router = APIRouter(prefix="/v1", tags=["health"])
 
@@ -11,6 +14,12 @@ def health() -> dict[str, str]:
 
 
 @router.get("/ready")
-def ready() -> dict[str, str]:
-    return {"database": "ok" if health_check() else "unavailable"}
+def ready(response: Response) -> dict[str, Any]:
+    database_ok = health_check()
+    if not (database_ok and warmup_state.ready):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "database": "ok" if database_ok else "unavailable",
+        "asr": warmup_state.as_dict(),
+    }
 
@@ -1,11 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import hashlib
+import time
+from typing import Annotated, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from starlette.concurrency import run_in_threadpool
 
 from app import deps
 from app.domain import repositories, schemas
 from app.domain.models import User
-from app.infra import auth
-from app.infra.broker import get_queue
-from app.workers import tasks
+from app.infra import auth, storage
+from app.infra.broker import get_queue, priority_queue_name
+from app.infra.db import session_scope
+from app.services.asr.checkpoint import CheckpointStore, ChunkCheckpoint, job_checkpoint_key
+from app.services.job_events import publish_job_changed
+from app.websocket.manager import ConnectionManager, ConnectionRejected
+from app.settings import get_settings
+from app.workers import dispatch, tasks
 
 router = APIRouter(prefix="/v1/jobs", tags=["jobs"])
 
@@ -13,15 +33,80 @@ router = APIRouter(prefix="/v1/jobs", tags=["jobs"])
 @router.post("", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED)
 def create_job(
     job_in: schemas.JobCreate,
+    idempotency_key: Annotated[
+        Optional[str], Header(alias="Idempotency-Key", max_length=255)
+    ] = None,
     current_user: User = Depends(auth.get_current_user),
     job_repo: repositories.JobRepository = Depends(deps.get_job_repository),
 ):
-    job = job_repo.create(current_user.id, job_in)
-    queue = get_queue()
-    queue.enqueue(tasks.transcribe_batch, job.id, {"input_uri": job_in.input_uri})
+    """Create a job and enqueue it, at most once per idempotency key.
+
+    The key comes from the ``Idempotency-Key`` header or, without one, is
+    derived from the job type, input URI and the stored object's content
+    hash.  Repeating a submission with the same key returns the job created
+    the first time instead of creating and enqueueing another, unless that
+    job has failed; reusing an ``Idempotency-Key`` for a different job is a
+    409 conflict.  Every job submitted here is transcribed, so one without
+    an ``input_uri`` is rejected with 422.  With fair scheduling a job
+    waits for :func:`dispatch.dispatch_pending` to give it a slot instead
+    of being enqueued right away.
+    """
+
+    if not job_in.input_uri:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="A transcription job needs an input_uri",
+        )
+    # A plain ``def`` endpoint: FastAPI runs it, and with it the storage
+    # round-trip that derives the key, in its threadpool, off the event loop.
+    key = idempotency_key or _derive_idempotency_key(job_in)
+    if key is None:
+        job = job_repo.create(current_user.id, job_in)
+    else:
+        job, created = job_repo.create_idempotent(current_user.id, job_in, key)
+        if not created:
+            if idempotency_key is not None and not _same_submission(job, job_in):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Idempotency-Key was already used for a different job",
+                )
+            return schemas.JobRead.from_orm(job)
+    publish_job_changed(deps.get_job_event_bus(), job)
+    if get_settings().JOB_FAIR_SCHEDULING_ENABLED:
+        dispatch.dispatch_pending(job_repo)
+    else:
+        queue = get_queue(priority_queue_name(job.priority))
+        queue.enqueue(
+            tasks.transcribe_batch,
+            job.id,
+            {"input_uri": job_in.input_uri, "priority": job.priority, "enqueued_at": time.time()},
+        )
     return schemas.JobRead.from_orm(job)
 
 
+def _same_submission(job, job_in: schemas.JobCreate) -> bool:
+    # ``audio_seconds`` is only an estimate and is replaced once the job runs.
+    return (
+        job.type == job_in.type
+        and job.input_uri == job_in.input_uri
+        and job.transcription_id == job_in.transcription_id
+        and job.assignee_id == job_in.assignee_id
+        and job.priority == job_in.priority.value
+    )
+
+
+def _derive_idempotency_key(job_in: schemas.JobCreate) -> Optional[str]:
+    if not job_in.input_uri:
+        return None
+    content_hash = storage.storage_client.content_hash(
+        storage.storage_client.key_from_uri(job_in.input_uri)
+    )
+    if content_hash is None:
+        return None
+    material = "\n".join((job_in.type, job_in.input_uri, content_hash))
+    return "derived:" + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
 @router.get("", response_model=list[schemas.JobRead])
 def list_jobs(
     current_user: User = Depends(auth.get_current_user),
@@ -31,6 +116,59 @@ def list_jobs(
     return [schemas.JobRead.from_orm(job) for job in jobs]
 
 
+@router.websocket("/events")
+async def job_events(
+    websocket: WebSocket,
+    token: str = Query(...),
+    manager: ConnectionManager = Depends(deps.get_job_events_manager),
+):
+    """Push the caller's job changes instead of having them poll ``/v1/jobs``.
+
+    The first message is a ``snapshot`` of the caller's jobs.  After it,
+    a ``job`` message carries a job that was created or changed state, and
+    a ``progress`` message the stage and percentage of a running one.
+    """
+
+    try:
+        user_id = await run_in_threadpool(_token_user_id, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    deps.get_job_event_relay().start(asyncio.get_running_loop())
+    try:
+        connection = await manager.connect(websocket, user_id=user_id)
+    except ConnectionRejected:
+        return
+
+    try:
+        # Subscribed before the snapshot is read, so no change falls in between.
+        jobs = await run_in_threadpool(_job_snapshot, user_id)
+        await connection.send({"type": "snapshot", "jobs": jobs})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await manager.disconnect(connection)
+
+
+# Blocking database work of the websocket endpoint, run in the threadpool.
+def _token_user_id(token: str) -> int:
+    with session_scope() as session:
+        return auth.get_current_user(db=session, token=token).id
+
+
+def _job_snapshot(user_id: int) -> list[dict]:
+    with session_scope() as session:
+        return [
+            schemas.JobRead.from_orm(job).model_dump(mode="json")
+            for job in repositories.JobRepository(session).list_for_user(user_id)
+        ]
+
+
 @router.get("/history", response_model=schemas.JobHistoryResponse)
 def get_job_history(
     current_user: User = Depends(auth.get_current_user),
@@ -67,3 +205,19 @@ def get_job(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
     return schemas.JobRead.from_orm(job)
 
+
+@router.get("/{job_id}/progress", response_model=schemas.JobProgress)
+def get_job_progress(
+    job_id: int,
+    current_user: User = Depends(auth.get_current_user),
+    job_repo: repositories.JobRepository = Depends(deps.get_job_repository),
+    checkpoint_store: CheckpointStore = Depends(deps.get_checkpoint_store),
+):
+    job = job_repo.get(job_id)
+    if not job or (
+        job.created_by_id != current_user.id
+        and job.assignee_id != current_user.id
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    progress = ChunkCheckpoint(checkpoint_store, job_checkpoint_key(job_id)).progress()
+    return schemas.JobProgress(job_id=job.id, status=job.status, **progress)
@@ -1,75 +1,402 @@
+import asyncio
+import hashlib
+import json
 import logging
-import os
-import tempfile
-from pathlib import Path
+import weakref
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, BinaryIO, Iterator
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+import numpy as np
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
 from starlette.concurrency import run_in_threadpool
 
-from app.domain.models import User
+from app.domain.models import JobPriority, User, UserRole
+from app.services.asr.admission import AdmissionController, AdmissionRejected, AdmissionTicket
+from app.services.asr.batching import BatchScheduler
+from app.services.asr.cache import TranscriptCache, cache_key
+from app.services.asr.client import InferenceClient
+from app.services.asr.registry import ModelRegistry
+from app.services.asr.silence import SilenceTrim
+from app.services.asr.streaming import AudioFrameDecoder, StreamingTranscriber
+from app.services.asr.timing import StageTimer
 from app.services.asr.whisper_service import WhisperService
 from app.infra import auth
+from app.infra.db import session_scope
+from app.settings import Settings
+from app.utils.audio import decode_stream
+from app.websocket.manager import Connection, ConnectionManager, ConnectionRejected
 from app import deps
 
 router = APIRouter(prefix="/v1/transcribe", tags=["transcribe"])
 
 logger = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/upload")
 async def upload_transcription(
     file: UploadFile,
+    response: Response,
+    job_type: str | None = Query(None, description="Workload profile, e.g. 'draft' or 'final'"),
+    debug: bool = Query(False, description="Include a per-stage timing breakdown"),
+    priority: JobPriority = Query(JobPriority.ROUTINE, description="Clinical urgency"),
     current_user: User = Depends(auth.get_current_user),
-    whisper_service: WhisperService = Depends(deps.get_whisper_service),
+    whisper_service: WhisperService | InferenceClient = Depends(deps.get_whisper_service),
+    batch_scheduler: BatchScheduler | None = Depends(deps.get_batch_scheduler),
+    transcript_cache: TranscriptCache | None = Depends(deps.get_transcript_cache),
+    model_registry: ModelRegistry = Depends(deps.get_model_registry),
+    admission: AdmissionController = Depends(deps.get_admission_controller),
+    silence_trimmer: partial | None = Depends(deps.get_silence_trimmer),
+    settings: Settings = Depends(deps.get_settings_dependency),
 ):
-    suffix = Path(file.filename or "recording").suffix or ".webm"
+    """Transcribe an uploaded recording.
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-        temp_path = temp_file.name
-        written_bytes = 0
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
-            temp_file.write(chunk)
-            written_bytes += len(chunk)
+    Time spent in each stage is exported as a histogram and returned in a
+    ``Server-Timing`` header; ``debug=true`` also adds it to the body.  The
+    ``language_detection``, ``vad``, ``encoder`` and ``decoder`` stages break
+    down ``inference`` when the request is not micro-batched.
+    """
 
-    if written_bytes == 0:
+    timer = StageTimer()
+    model_name = model_registry.select(job_type=job_type, specialty=current_user.specialty)
+    engine = nullcontext(whisper_service)
+    if model_name != model_registry.default_model:
+        # Batching is only set up for the default model; routed models run
+        # directly, leased so they are not evicted while the request waits
+        # for admission and runs.
+        engine = deps.lease_asr_engine(settings, model_name)
+        batch_scheduler = None
+
+    with engine as whisper_service:
+        with timer.stage("spool"):
+            digest, written_bytes = await run_in_threadpool(_hash_upload, file.file)
+        if written_bytes == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded file is empty",
+            )
+
+        key = cache_key(digest, _model_config(whisper_service, silence_trimmer))
+        if transcript_cache is not None:
+            with timer.stage("cache_lookup"):
+                cached = await run_in_threadpool(transcript_cache.get, key)
+            if cached is not None:
+                response.headers["Server-Timing"] = timer.server_timing()
+                return {
+                    "detail": "Transcription completed",
+                    "filename": file.filename,
+                    "transcript": cached,
+                    "model": whisper_service.model_name,
+                    "cached": True,
+                    **({"stages": timer.as_milliseconds()} if debug else {}),
+                }
+
+        with timer.stage("admission_wait"):
+            ticket = await _admit(admission, priority)
         try:
-            os.remove(temp_path)
-        except OSError:
-            logger.warning("Failed to remove empty temporary file: %s", temp_path)
+            with timer.stage("decode"):
+                audio = await _decode_upload(file, settings)
+            with timer.stage("trim"):
+                trimmed = await run_in_threadpool(_trim, audio, silence_trimmer)
+
+            try:
+                with timer.stage("inference"):
+                    if trimmed.audio.size == 0:
+                        transcript = ""
+                    elif batch_scheduler is not None:
+                        transcript = await batch_scheduler.run(trimmed.audio)
+                    else:
+                        transcript = await run_in_threadpool(
+                            partial(whisper_service.transcribe, trimmed.audio, timer=timer)
+                        )
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Failed to transcribe audio file: %s", file.filename)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Unable to transcribe audio",
+                ) from exc
+        finally:
+            ticket.release()
+
+        if transcript_cache is not None:
+            await run_in_threadpool(transcript_cache.set, key, transcript)
+
+        timer.observe(whisper_service.model_name, trimmed.original_seconds)
+        response.headers["Server-Timing"] = timer.server_timing()
+        stages = timer.as_milliseconds()
+        return {
+            "detail": "Transcription completed",
+            "filename": file.filename,
+            "transcript": transcript,
+            "model": whisper_service.model_name,
+            "cached": False,
+            "audio": {
+                "duration_seconds": round(trimmed.original_seconds, 2),
+                "skipped_pct": round(trimmed.skipped_ratio * 100, 1),
+            },
+            "timings": {
+                "decode_ms": stages["decode"],
+                "trim_ms": stages["trim"],
+                "inference_ms": stages["inference"],
+            },
+            **({"stages": stages} if debug else {}),
+        }
+
+
+@router.post("/upload/stream")
+async def upload_transcription_stream(
+    file: UploadFile,
+    priority: JobPriority = Query(JobPriority.ROUTINE, description="Clinical urgency"),
+    current_user: User = Depends(auth.get_current_user),
+    whisper_service: WhisperService | InferenceClient = Depends(deps.get_whisper_service),
+    admission: AdmissionController = Depends(deps.get_admission_controller),
+    silence_trimmer: partial | None = Depends(deps.get_silence_trimmer),
+    settings: Settings = Depends(deps.get_settings_dependency),
+):
+    """Transcribe an upload and stream segments back as server-sent events.
+
+    A ``segment`` event is sent for every decoded segment as soon as Whisper
+    produces it, followed by one ``done`` event with the full transcript, or
+    an ``error`` event if decoding fails part-way.
+    """
+
+    if (await run_in_threadpool(_hash_upload, file.file))[1] == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Uploaded file is empty",
         )
+    ticket = await _admit(admission, priority)
+    try:
+        audio = await _decode_upload(file, settings)
+        trimmed = await run_in_threadpool(_trim, audio, silence_trimmer)
+    except BaseException:
+        ticket.release()
+        raise
+
+    def events() -> Iterator[str]:
+        texts = []
+        try:
+            segments = whisper_service.iter_segments(trimmed.audio) if trimmed.audio.size else ()
+            for segment in segments:
+                # Report times against the original recording, not the trimmed audio.
+                segment["start"] = round(trimmed.offsets.to_original(segment["start"]), 3)
+                segment["end"] = round(trimmed.offsets.to_original(segment["end"]), 3)
+                texts.append(segment["text"])
+                yield _sse("segment", segment)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to stream transcription for: %s", file.filename)
+            yield _sse("error", {"detail": "Unable to transcribe audio"})
+            return
+        finally:
+            ticket.release()
+        yield _sse(
+            "done",
+            {
+                "filename": file.filename,
+                "transcript": " ".join(texts).strip(),
+                "skipped_pct": round(trimmed.skipped_ratio * 100, 1),
+            },
+        )
+
+    stream = events()
+    # The slot is held for the life of the stream; also free it if the
+    # client disconnects before the generator ever starts.
+    weakref.finalize(stream, ticket.release)
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _model_config(
+    whisper_service: WhisperService | InferenceClient, silence_trimmer: partial | None
+) -> dict[str, Any]:
+    return {
+        **whisper_service.cache_identity(),
+        "silence_trim": silence_trimmer.keywords if silence_trimmer is not None else None,
+    }
+
+
+def _trim(audio: np.ndarray, silence_trimmer: partial | None) -> SilenceTrim:
+    return silence_trimmer(audio) if silence_trimmer is not None else SilenceTrim.untrimmed(audio)
+
+
+async def _admit(
+    admission: AdmissionController, priority: JobPriority = JobPriority.ROUTINE
+) -> AdmissionTicket:
+    try:
+        return await admission.acquire(priority.value)
+    except AdmissionRejected as exc:
+        logger.warning("Shedding transcription request (%s)", exc.reason)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Transcription capacity is exhausted, please retry later",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
+async def _decode_upload(file: UploadFile, settings: Settings) -> np.ndarray:
+    # Decode straight from the upload's spooled file into a float32 buffer;
+    # short clips never touch disk and Whisper receives the decoded array.
     try:
-        transcript = await run_in_threadpool(
-            whisper_service.transcribe,
-            temp_path,
+        return await run_in_threadpool(
+            decode_stream,
+            file.file,
+            memmap_threshold_bytes=settings.ASR_DECODE_MEMMAP_THRESHOLD_MB * 1024 * 1024,
         )
     except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to transcribe audio file: %s", file.filename)
+        logger.warning("Failed to decode uploaded audio: %s", file.filename, exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unable to transcribe audio",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unable to decode audio",
         ) from exc
+
+
+def _hash_upload(fileobj: BinaryIO) -> tuple[str, int]:
+    """Return the SHA-256 hex digest and size of ``fileobj``, rewound afterwards."""
+
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+@router.get("/pool")
+def get_model_pool_stats(
+    current_user: User = Depends(auth.require_roles(UserRole.ADMIN)),
+    whisper_service: WhisperService | InferenceClient = Depends(deps.get_whisper_service),
+):
+    return {"model": whisper_service.model_name, **whisper_service.pool_stats()}
+
+
+@router.websocket("/stream")
+async def websocket_transcription(
+    websocket: WebSocket,
+    token: str = Query(...),
+    audio_format: str = Query("pcm_s16le", alias="format"),
+    sample_rate: int = Query(16000),
+    settings: Settings = Depends(deps.get_settings_dependency),
+    whisper_service: WhisperService | InferenceClient = Depends(deps.get_whisper_service),
+    manager: ConnectionManager = Depends(deps.get_connection_manager),
+):
+    """Stream live audio and receive partial and committed transcript events.
+
+    Binary messages carry audio frames in the requested ``format``; a text
+    message ``"stop"`` ends the stream, after which the remaining audio is
+    committed and the socket is closed.
+    """
+
+    try:
+        await run_in_threadpool(_authenticate, token)
+        decoder = AudioFrameDecoder(audio_format, sample_rate)
+    except (HTTPException, ValueError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        connection = await manager.connect(websocket)
+    except ConnectionRejected:
+        logger.warning("Rejected streaming connection: limit of %d reached", manager.max_connections)
+        return
+
+    transcriber = StreamingTranscriber(
+        whisper_service.transcribe_words,
+        min_chunk_seconds=settings.ASR_STREAM_MIN_CHUNK_SECONDS,
+        max_buffer_seconds=settings.ASR_STREAM_MAX_BUFFER_SECONDS,
+    )
+    audio_ready = asyncio.Event()
+    finished = False
+
+    async def decode_loop() -> None:
+        while not finished:
+            await audio_ready.wait()
+            audio_ready.clear()
+            if finished or not transcriber.ready:
+                continue
+            events = await run_in_threadpool(transcriber.process)
+            await _send_events(connection, events)
+
+    decoder_task = asyncio.create_task(decode_loop())
+    receiver: asyncio.Task | None = None
+    close_code = status.WS_1000_NORMAL_CLOSURE
+    await connection.send({"type": "ready"})
+    try:
+        while True:
+            # Wait on the decoder too, so a decoding failure closes the
+            # socket right away instead of once the buffer overflows.
+            receiver = asyncio.ensure_future(websocket.receive())
+            await asyncio.wait({receiver, decoder_task}, return_when=asyncio.FIRST_COMPLETED)
+            if decoder_task.done():
+                # It only stops before the stream ends when it failed.
+                await connection.send({"type": "error", "detail": "Transcription failed"})
+                close_code = status.WS_1011_INTERNAL_ERROR
+                break
+            message = receiver.result()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                transcriber.append(decoder.decode(message["bytes"]))
+                if transcriber.buffered_seconds > 2 * settings.ASR_STREAM_MAX_BUFFER_SECONDS:
+                    await connection.send({"type": "error", "detail": "Transcription is falling behind"})
+                    close_code = status.WS_1013_TRY_AGAIN_LATER
+                    break
+                if transcriber.ready:
+                    audio_ready.set()
+            elif (message.get("text") or "").strip().lower() == "stop":
+                break
+    except WebSocketDisconnect:
+        pass
+    except Exception:  # noqa: BLE001
+        logger.exception("Live transcription stream failed")
+        close_code = status.WS_1011_INTERNAL_ERROR
     finally:
+        finished = True
+        audio_ready.set()
+        if receiver is not None and not receiver.done():
+            receiver.cancel()
         try:
-            os.remove(temp_path)
-        except OSError:
-            logger.warning("Failed to remove temporary file: %s", temp_path)
+            await decoder_task
+            if close_code == status.WS_1000_NORMAL_CLOSURE and not connection.closed:
+                await _send_events(connection, await run_in_threadpool(transcriber.flush))
+                await connection.send({"type": "final", "text": transcriber.transcript})
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to finalise live transcription stream")
+            close_code = status.WS_1011_INTERNAL_ERROR
+        await manager.disconnect(connection, close_code)
 
-    return {
-        "detail": "Transcription completed",
-        "filename": file.filename,
-        "transcript": transcript,
-    }
 
+async def _send_events(connection: Connection, events) -> None:
+    for event in events:
+        await connection.send(event.to_dict(), droppable=event.type == "partial")
 
-@router.websocket("/stream")
-async def websocket_transcription(websocket):
-    # TODO: Implement websocket streaming for live transcription.
-    await websocket.close()
 
+def _authenticate(token: str) -> None:
+    """Validate a websocket's access token; blocking, so run it in the threadpool."""
+
+    with session_scope() as session:
+        auth.get_current_user(db=session, token=token)
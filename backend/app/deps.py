@@ -1,8 +1,12 @@
-from functools import lru_cache
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import Iterator
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from app.domain.models import JobPriority
 from app.domain.repositories import (
     JobRepository,
     PatientRepository,
@@ -10,9 +14,24 @@ from app.domain.repositories import (
     TranscriptionRepository,
     UserRepository,
 )
+from app.infra.broker import redis_conn
 from app.infra.db import get_db
+from app.services.asr.admission import AdmissionController
+from app.services.asr.batching import BatchScheduler
+from app.services.asr.cache import RedisTranscriptStore, TranscriptCache
+from app.services.asr.checkpoint import (
+    CheckpointStore,
+    MemoryCheckpointStore,
+    RedisCheckpointStore,
+)
+from app.services.asr.client import InferenceClient
+from app.services.asr.registry import ModelRegistry, parse_model_routes
+from app.services.asr.silence import trim_silence
 from app.services.asr.whisper_service import WhisperService
+from app.services.job_events import JobEventBus, MemoryJobEventBus, RedisJobEventBus
 from app.settings import Settings, get_settings
+from app.websocket.job_events import JobEventRelay
+from app.websocket.manager import ConnectionManager
 
 
 def get_settings_dependency() -> Settings:
@@ -41,25 +60,241 @@ def get_transcription_repository(
     return TranscriptionRepository(db)
 
 
-@lru_cache(maxsize=1)
-def _get_whisper_service_cached(
-    model_name: str,
-    device: str | None,
-    compute_type: str | None,
+def _build_whisper_service(
+    settings: Settings, model_name: str, model_path: str | None = None
 ) -> WhisperService:
     return WhisperService(
         model_name=model_name,
-        device=device,
-        compute_type=compute_type,
+        model_path=model_path,
+        device=settings.ASR_WHISPER_DEVICE,
+        compute_type=settings.ASR_WHISPER_COMPUTE_TYPE,
+        pool_size=settings.ASR_MODEL_POOL_SIZE,
+        cpu_threads=settings.ASR_CPU_THREADS,
+        num_workers=settings.ASR_NUM_WORKERS,
+        beam_size=settings.ASR_BEAM_SIZE,
+        pin_cpu_threads=settings.ASR_PIN_CPU_THREADS,
+        chunking_enabled=settings.ASR_CHUNKING_ENABLED,
+        chunk_min_audio_seconds=settings.ASR_CHUNK_MIN_AUDIO_SECONDS,
+        chunk_max_seconds=settings.ASR_CHUNK_MAX_SECONDS,
+        chunk_overlap_seconds=settings.ASR_CHUNK_OVERLAP_SECONDS,
+        chunk_workers=settings.ASR_CHUNK_WORKERS,
+        executor=settings.ASR_EXECUTOR,
+        process_workers=settings.ASR_PROCESS_WORKERS,
     )
 
 
+@lru_cache(maxsize=1)
+def _get_model_registry_cached() -> ModelRegistry:
+    settings = get_settings()
+    registry = ModelRegistry(
+        lambda name, path: _build_whisper_service(settings, name, path),
+        default_model=settings.ASR_MODEL,
+        model_dir=settings.ASR_MODEL_DIR,
+        memory_budget_mb=settings.ASR_MODEL_MEMORY_BUDGET_MB,
+        idle_timeout_seconds=settings.ASR_MODEL_IDLE_SECONDS,
+        routes=parse_model_routes(settings.ASR_MODEL_ROUTES),
+    )
+    registry.start_reaper()
+    return registry
+
+
+def get_model_registry() -> ModelRegistry:
+    return _get_model_registry_cached()
+
+
+@lru_cache(maxsize=1)
+def _get_inference_client_cached(socket_path: str) -> InferenceClient:
+    return InferenceClient(socket_path)
+
+
+def get_asr_engine(
+    settings: Settings, model_name: str | None = None
+) -> WhisperService | InferenceClient:
+    """Return the transcriber for ``model_name``.
+
+    When ``ASR_INFERENCE_SOCKET`` is set, models live in the node-local
+    inference server and this process only holds a client for it.
+    """
+
+    if settings.ASR_INFERENCE_SOCKET:
+        client = _get_inference_client_cached(settings.ASR_INFERENCE_SOCKET)
+        return client.for_model(model_name) if model_name else client
+    return get_model_registry().get(model_name or settings.ASR_MODEL)
+
+
+@contextmanager
+def lease_asr_engine(
+    settings: Settings, model_name: str | None = None
+) -> Iterator[WhisperService | InferenceClient]:
+    """Like :func:`get_asr_engine`, but keep a local model resident until the block exits."""
+
+    if settings.ASR_INFERENCE_SOCKET:
+        yield get_asr_engine(settings, model_name)
+        return
+    with get_model_registry().lease(model_name or settings.ASR_MODEL) as service:
+        yield service
+
+
 def get_whisper_service(
     settings: Settings = Depends(get_settings_dependency),
-) -> WhisperService:
-    return _get_whisper_service_cached(
-        settings.ASR_MODEL,
-        settings.ASR_WHISPER_DEVICE,
-        settings.ASR_WHISPER_COMPUTE_TYPE,
+) -> WhisperService | InferenceClient:
+    return get_asr_engine(settings)
+
+
+_BatchKey = tuple[WhisperService | InferenceClient, int, float]
+_batch_scheduler: tuple[_BatchKey, BatchScheduler] | None = None
+_batch_scheduler_lock = threading.Lock()
+
+
+def _get_batch_scheduler_cached(
+    whisper_service: WhisperService | InferenceClient,
+    max_batch_size: int,
+    max_wait_ms: float,
+) -> BatchScheduler:
+    # One scheduler at a time, like ``lru_cache(maxsize=1)``, but the one it
+    # replaces is shut down instead of leaking its dispatcher thread.
+    global _batch_scheduler
+    key = (whisper_service, max_batch_size, max_wait_ms)
+    with _batch_scheduler_lock:
+        if _batch_scheduler is not None and _batch_scheduler[0] == key:
+            return _batch_scheduler[1]
+        if _batch_scheduler is not None:
+            _batch_scheduler[1].shutdown(wait=False)
+        scheduler = BatchScheduler(
+            whisper_service.transcribe_many,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+        )
+        _batch_scheduler = (key, scheduler)
+        return scheduler
+
+
+def get_batch_scheduler(
+    settings: Settings = Depends(get_settings_dependency),
+    whisper_service: WhisperService | InferenceClient = Depends(get_whisper_service),
+) -> BatchScheduler | None:
+    # The inference server batches requests from every process itself.
+    if not settings.ASR_BATCH_ENABLED or settings.ASR_INFERENCE_SOCKET:
+        return None
+    return _get_batch_scheduler_cached(
+        whisper_service,
+        settings.ASR_BATCH_MAX_SIZE,
+        settings.ASR_BATCH_MAX_WAIT_MS,
+    )
+
+
+def get_silence_trimmer(
+    settings: Settings = Depends(get_settings_dependency),
+) -> partial | None:
+    if not settings.ASR_SILENCE_TRIM_ENABLED:
+        return None
+    return partial(
+        trim_silence,
+        threshold_db=settings.ASR_SILENCE_THRESHOLD_DB,
+        min_silence_ms=settings.ASR_SILENCE_MIN_MS,
+        keep_silence_ms=settings.ASR_SILENCE_KEEP_MS,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_admission_controller_cached(
+    max_concurrency: int,
+    max_queue: int,
+    queue_timeout_seconds: float,
+    aging_seconds: float,
+) -> AdmissionController:
+    return AdmissionController(
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        queue_timeout_seconds=queue_timeout_seconds,
+        priorities=[priority.value for priority in JobPriority],
+        aging_seconds=aging_seconds,
+    )
+
+
+def get_admission_controller(
+    settings: Settings = Depends(get_settings_dependency),
+) -> AdmissionController:
+    return _get_admission_controller_cached(
+        settings.ASR_ADMISSION_MAX_CONCURRENCY,
+        settings.ASR_ADMISSION_MAX_QUEUE,
+        settings.ASR_ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        settings.ASR_PRIORITY_AGING_SECONDS,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_connection_manager_cached(max_connections: int, max_queue: int) -> ConnectionManager:
+    return ConnectionManager(max_connections=max_connections, max_queue=max_queue)
+
+
+def get_connection_manager(
+    settings: Settings = Depends(get_settings_dependency),
+) -> ConnectionManager:
+    return _get_connection_manager_cached(
+        settings.ASR_STREAM_MAX_CONNECTIONS,
+        settings.ASR_STREAM_SEND_QUEUE,
     )
 
+
+@lru_cache(maxsize=1)
+def get_job_event_bus() -> JobEventBus:
+    if hasattr(redis_conn, "publish"):
+        return RedisJobEventBus(redis_conn)
+    return MemoryJobEventBus()
+
+
+@lru_cache(maxsize=1)
+def _get_job_events_manager_cached(max_connections: int, max_queue: int) -> ConnectionManager:
+    return ConnectionManager(max_connections=max_connections, max_queue=max_queue)
+
+
+def get_job_events_manager(
+    settings: Settings = Depends(get_settings_dependency),
+) -> ConnectionManager:
+    return _get_job_events_manager_cached(
+        settings.JOB_EVENTS_MAX_CONNECTIONS,
+        settings.JOB_EVENTS_SEND_QUEUE,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_job_event_relay() -> JobEventRelay:
+    return JobEventRelay(get_job_event_bus(), get_job_events_manager(get_settings()))
+
+
+@lru_cache(maxsize=1)
+def _get_transcript_cache_cached(
+    max_bytes: int,
+    redis_enabled: bool,
+    ttl_seconds: int,
+) -> TranscriptCache:
+    store = None
+    if redis_enabled and hasattr(redis_conn, "get"):
+        store = RedisTranscriptStore(redis_conn, ttl_seconds=ttl_seconds)
+    return TranscriptCache(max_bytes=max_bytes, store=store)
+
+
+def get_transcript_cache(
+    settings: Settings = Depends(get_settings_dependency),
+) -> TranscriptCache | None:
+    if not settings.ASR_CACHE_ENABLED:
+        return None
+    return _get_transcript_cache_cached(
+        settings.ASR_CACHE_MAX_BYTES,
+        settings.ASR_CACHE_REDIS_ENABLED,
+        settings.ASR_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_checkpoint_store_cached(ttl_seconds: int) -> CheckpointStore:
+    if hasattr(redis_conn, "hgetall"):
+        return RedisCheckpointStore(redis_conn, ttl_seconds=ttl_seconds)
+    return MemoryCheckpointStore()
+
+
+def get_checkpoint_store(
+    settings: Settings = Depends(get_settings_dependency),
+) -> CheckpointStore:
+    return _get_checkpoint_store_cached(settings.ASR_CHECKPOINT_TTL_SECONDS)
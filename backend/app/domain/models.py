@@ -2,7 +2,20 @@ from datetime import datetime, date
 from enum import Enum as PyEnum
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import declarative_base, relationship
 
 
@@ -55,14 +68,60 @@ class JobStatus(str, PyEnum):
     FAILED = "failed"
 
 
+# The job state machine: the statuses each status may move to.  Enforced
+# atomically by ``JobRepository.transition``; failed jobs can be requeued.
+JOB_TRANSITIONS: dict[JobStatus, frozenset[JobStatus]] = {
+    JobStatus.PENDING: frozenset({JobStatus.PROCESSING, JobStatus.FAILED}),
+    JobStatus.PROCESSING: frozenset({JobStatus.PENDING, JobStatus.COMPLETED, JobStatus.FAILED}),
+    JobStatus.COMPLETED: frozenset(),
+    JobStatus.FAILED: frozenset({JobStatus.PENDING}),
+}
+
+
+def job_status_sources(status: str) -> frozenset[JobStatus]:
+    """Statuses a job may be in to move to ``status``."""
+
+    target = JobStatus(status)
+    return frozenset(source for source, targets in JOB_TRANSITIONS.items() if target in targets)
+
+
+class JobPriority(str, PyEnum):
+    """Clinical urgency of a job, most urgent first."""
+
+    STAT = "stat"
+    URGENT = "urgent"
+    ROUTINE = "routine"
+
+
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        UniqueConstraint(
+            "created_by_id", "idempotency_key", name="uq_jobs_created_by_idempotency_key"
+        ),
+        Index("ix_jobs_status_heartbeat_at", "status", "heartbeat_at"),
+        Index("ix_jobs_status_dispatched_at", "status", "dispatched_at"),
+    )
 
     id: int = Column(Integer, primary_key=True, index=True)
     type: str = Column(String(100), nullable=False)
     status: str = Column(String(50), nullable=False, default=JobStatus.PENDING.value)
+    priority: str = Column(
+        String(20), nullable=False, default=JobPriority.ROUTINE.value, index=True
+    )
     input_uri: Optional[str] = Column(Text, nullable=True)
     output_uri: Optional[str] = Column(Text, nullable=True)
+    attempts: int = Column(Integer, nullable=False, default=0)
+    heartbeat_at: Optional[datetime] = Column(DateTime, nullable=True)
+    last_error: Optional[str] = Column(Text, nullable=True)
+    # When the fair-share dispatcher released the job to the workers.
+    dispatched_at: Optional[datetime] = Column(DateTime, nullable=True)
+    # Deduplicates retried submissions per user; see ``routes_jobs.create_job``.
+    idempotency_key: Optional[str] = Column(String(255), nullable=True)
+    input_bytes: Optional[int] = Column(BigInteger, nullable=True)
+    audio_seconds: Optional[float] = Column(Float, nullable=True)
+    # Wall-clock processing seconds per second of audio (the real-time factor).
+    processing_rtf: Optional[float] = Column(Float, nullable=True)
     created_by_id: int = Column(
         Integer, ForeignKey("users.id"), nullable=False, index=True
     )
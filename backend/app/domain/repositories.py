@@ -1,8 +1,10 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Iterable, Optional
 
-from sqlalchemy import or_
+from sqlalchemy import func, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from . import models, schemas
 
@@ -59,19 +61,370 @@ class JobRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, created_by_id: int, job_in: schemas.JobCreate) -> models.Job:
+    def create(
+        self,
+        created_by_id: int,
+        job_in: schemas.JobCreate,
+        idempotency_key: Optional[str] = None,
+    ) -> models.Job:
         job = models.Job(
             created_by_id=created_by_id,
             type=job_in.type,
             input_uri=job_in.input_uri,
             transcription_id=job_in.transcription_id,
             assignee_id=job_in.assignee_id,
+            priority=job_in.priority.value,
+            idempotency_key=idempotency_key,
+            audio_seconds=job_in.audio_seconds,
         )
         self.db.add(job)
         self.db.commit()
         self.db.refresh(job)
         return job
 
+    def create_idempotent(
+        self, created_by_id: int, job_in: schemas.JobCreate, idempotency_key: str
+    ) -> tuple[models.Job, bool]:
+        """Create a job unless the user already submitted one with ``idempotency_key``.
+
+        Returns the job and whether it was created by this call.  Concurrent
+        submissions are settled by the unique constraint on the key.  A job
+        that has failed for good gives its key up, so resubmitting the same
+        recording creates a new job instead of returning the dead one.
+        """
+
+        existing = self.get_by_idempotency_key(created_by_id, idempotency_key)
+        if existing is not None and existing.status == models.JobStatus.FAILED.value:
+            self._release_idempotency_key(existing.id)
+            existing = None
+        if existing is not None:
+            return existing, False
+        try:
+            return self.create(created_by_id, job_in, idempotency_key), True
+        except IntegrityError:
+            self.db.rollback()
+            existing = self.get_by_idempotency_key(created_by_id, idempotency_key)
+            if existing is None:
+                raise
+            return existing, False
+
+    def _release_idempotency_key(self, job_id: int) -> None:
+        self.db.execute(
+            update(models.Job)
+            .where(
+                models.Job.id == job_id,
+                models.Job.status == models.JobStatus.FAILED.value,
+            )
+            .values(idempotency_key=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def get_by_idempotency_key(self, created_by_id: int, idempotency_key: str) -> Optional[models.Job]:
+        return (
+            self.db.query(models.Job)
+            .filter(
+                models.Job.created_by_id == created_by_id,
+                models.Job.idempotency_key == idempotency_key,
+            )
+            .first()
+        )
+
+    def transition(
+        self,
+        job_id: int,
+        status: str,
+        *,
+        from_statuses: Optional[Iterable[str]] = None,
+        expected_attempts: Optional[int] = None,
+        **values: Any,
+    ) -> Optional[models.Job]:
+        """Move a job to ``status`` and set ``values`` in one statement.
+
+        The ``UPDATE ... WHERE id = :id AND status IN (...) RETURNING``
+        only matches while the job is in one of ``from_statuses`` (by
+        default every status the state machine allows to move to
+        ``status``) and, with ``expected_attempts``, still on that attempt.
+        Returns the updated job, or ``None`` when it does not exist or is
+        no longer in an allowed status, e.g. because another worker moved
+        it first.
+        """
+
+        criteria = [models.Job.id == job_id]
+        if expected_attempts is not None:
+            criteria.append(models.Job.attempts == expected_attempts)
+        jobs = self._transition(criteria, status, from_statuses, values)
+        return jobs[0] if jobs else None
+
+    def transition_many(
+        self,
+        job_ids: Iterable[int],
+        status: str,
+        *,
+        from_statuses: Optional[Iterable[str]] = None,
+        where: Iterable[Any] = (),
+        **values: Any,
+    ) -> list[models.Job]:
+        """Bulk :meth:`transition`; returns the jobs that moved, in no particular order.
+
+        ``where`` adds criteria every job must also match to move.
+        """
+
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        return self._transition(
+            [models.Job.id.in_(job_ids), *where], status, from_statuses, values
+        )
+
+    def claim(self, job_id: int) -> Optional[models.Job]:
+        """Move a pending job to processing; ``None`` if another worker got it first.
+
+        Claiming starts a new attempt and its heartbeat.
+        """
+
+        now = datetime.utcnow()
+        return self.transition(
+            job_id,
+            models.JobStatus.PROCESSING.value,
+            attempts=models.Job.attempts + 1,
+            heartbeat_at=now,
+            dispatched_at=func.coalesce(models.Job.dispatched_at, now),
+        )
+
+    def complete(
+        self,
+        job_id: int,
+        *,
+        output_uri: Optional[str] = None,
+        input_bytes: Optional[int] = None,
+        audio_seconds: Optional[float] = None,
+        processing_seconds: Optional[float] = None,
+        attempts: Optional[int] = None,
+    ) -> Optional[models.Job]:
+        """Finish a processing job, recording its output and processing stats.
+
+        With ``attempts`` only that attempt may finish the job; ``None`` is
+        returned when it was reaped or claimed again meanwhile.
+        """
+
+        values: dict[str, Any] = {"heartbeat_at": None}
+        if output_uri is not None:
+            values["output_uri"] = output_uri
+        if audio_seconds is not None:
+            values.update(input_bytes=input_bytes, audio_seconds=audio_seconds)
+            if processing_seconds is not None:
+                values["processing_rtf"] = (
+                    processing_seconds / audio_seconds if audio_seconds > 0 else None
+                )
+        return self.transition(
+            job_id,
+            models.JobStatus.COMPLETED.value,
+            from_statuses=[models.JobStatus.PROCESSING.value],
+            expected_attempts=attempts,
+            **values,
+        )
+
+    def heartbeat(self, job_id: int, *, attempts: Optional[int] = None) -> bool:
+        """Refresh a processing job's heartbeat; return whether it is still processing.
+
+        With ``attempts`` it must also still be on that attempt.
+        """
+
+        criteria = [
+            models.Job.id == job_id,
+            models.Job.status == models.JobStatus.PROCESSING.value,
+        ]
+        if attempts is not None:
+            criteria.append(models.Job.attempts == attempts)
+        result = self.db.execute(
+            update(models.Job).where(*criteria).values(heartbeat_at=datetime.utcnow())
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def release_for_retry(
+        self, job_id: int, error: str, *, attempts: Optional[int] = None
+    ) -> Optional[models.Job]:
+        """Return a processing job to pending so it can be claimed again.
+
+        With ``attempts`` only that attempt is released, which keeps a reaper
+        from releasing a job a worker has meanwhile claimed again.
+        """
+
+        return self._finish_attempt(job_id, models.JobStatus.PENDING.value, error, attempts)
+
+    def mark_failed(
+        self, job_id: int, error: str, *, attempts: Optional[int] = None
+    ) -> Optional[models.Job]:
+        return self._finish_attempt(job_id, models.JobStatus.FAILED.value, error, attempts)
+
+    def list_stale(self, heartbeat_before: datetime) -> list[models.Job]:
+        """Processing jobs whose last heartbeat is older than ``heartbeat_before``."""
+
+        return (
+            self.db.query(models.Job)
+            .filter(
+                models.Job.status == models.JobStatus.PROCESSING.value,
+                _heartbeat_expired(heartbeat_before),
+            )
+            .all()
+        )
+
+    def fail_stale(
+        self, job_ids: Iterable[int], heartbeat_before: datetime, error: str
+    ) -> list[models.Job]:
+        """Fail those of ``job_ids`` whose heartbeat is still older than ``heartbeat_before``."""
+
+        return self.transition_many(
+            job_ids,
+            models.JobStatus.FAILED.value,
+            from_statuses=[models.JobStatus.PROCESSING.value],
+            where=[_heartbeat_expired(heartbeat_before)],
+            last_error=error[:2000],
+            heartbeat_at=None,
+        )
+
+    def _finish_attempt(
+        self, job_id: int, status: str, error: str, attempts: Optional[int]
+    ) -> Optional[models.Job]:
+        return self.transition(
+            job_id,
+            status,
+            from_statuses=[models.JobStatus.PROCESSING.value],
+            expected_attempts=attempts,
+            last_error=error[:2000],
+            heartbeat_at=None,
+        )
+
+    def _transition(
+        self,
+        criteria: list[Any],
+        status: str,
+        from_statuses: Optional[Iterable[str]],
+        values: dict[str, Any],
+    ) -> list[models.Job]:
+        sources = models.job_status_sources(status)
+        if from_statuses is not None:
+            requested = {models.JobStatus(source) for source in from_statuses}
+            if not requested <= sources:
+                raise ValueError(
+                    "Jobs cannot move from %s to '%s'"
+                    % (sorted(source.value for source in requested - sources), status)
+                )
+            sources = frozenset(requested)
+        if not sources:
+            raise ValueError("No job status can move to '%s'" % status)
+
+        return self._update_returning(
+            [*criteria, models.Job.status.in_(sorted(source.value for source in sources))],
+            {"status": status, **values},
+        )
+
+    def _update_returning(self, criteria: list[Any], values: dict[str, Any]) -> list[models.Job]:
+        table = models.Job.__table__
+        statement = update(table).where(*criteria).values(**values).returning(*table.columns)
+        # Loading the RETURNING rows as a query refreshes jobs already in the
+        # session instead of leaving them stale.
+        jobs = list(
+            self.db.scalars(
+                select(models.Job)
+                .from_statement(statement)
+                .execution_options(populate_existing=True)
+            )
+        )
+        # Committing expires every loaded object; keep the values RETURNING
+        # just delivered so reading the jobs does not cost another SELECT.
+        loaded = [
+            {attr.key: getattr(job, attr.key) for attr in inspect(job).mapper.column_attrs}
+            for job in jobs
+        ]
+        self.db.commit()
+        for job, columns in zip(jobs, loaded):
+            for key, value in columns.items():
+                set_committed_value(job, key, value)
+        return jobs
+
+    def list_undispatched(self) -> list[models.Job]:
+        """Pending transcription jobs not yet released to the workers, oldest first.
+
+        Jobs without a recording are left out: they are review jobs, which
+        wait in the review queue instead.
+        """
+
+        return (
+            self.db.query(models.Job)
+            .filter(
+                models.Job.status == models.JobStatus.PENDING.value,
+                models.Job.dispatched_at.is_(None),
+                models.Job.input_uri.isnot(None),
+            )
+            .order_by(models.Job.created_at.asc(), models.Job.id.asc())
+            .all()
+        )
+
+    def dispatched_load(self, default_audio_seconds: float) -> dict[int, tuple[int, float]]:
+        """Jobs and audio-seconds released to the workers and not finished, per creator."""
+
+        rows = (
+            self.db.query(
+                models.Job.created_by_id,
+                func.count(models.Job.id),
+                func.sum(func.coalesce(models.Job.audio_seconds, default_audio_seconds)),
+            )
+            .filter(
+                models.Job.status.in_(
+                    (models.JobStatus.PENDING.value, models.JobStatus.PROCESSING.value)
+                ),
+                models.Job.dispatched_at.isnot(None),
+            )
+            .group_by(models.Job.created_by_id)
+            .all()
+        )
+        return {user_id: (count, float(seconds or 0.0)) for user_id, count, seconds in rows}
+
+    def mark_dispatched(self, job_ids: Iterable[int]) -> list[models.Job]:
+        """Stamp ``dispatched_at`` on those of ``job_ids`` no other dispatcher took."""
+
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        return self._update_returning(
+            [
+                models.Job.id.in_(job_ids),
+                models.Job.status == models.JobStatus.PENDING.value,
+                models.Job.dispatched_at.is_(None),
+            ],
+            {"dispatched_at": datetime.utcnow()},
+        )
+
+    def release_dispatched(self, job_ids: Iterable[int]) -> list[models.Job]:
+        """Clear ``dispatched_at`` on those of ``job_ids`` that are still pending."""
+
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        return self._update_returning(
+            [models.Job.id.in_(job_ids), models.Job.status == models.JobStatus.PENDING.value],
+            {"dispatched_at": None},
+        )
+
+    def release_unclaimed(self, dispatched_before: datetime) -> list[models.Job]:
+        """Clear ``dispatched_at`` on pending jobs dispatched, and untouched, since before then.
+
+        Such a job's enqueue was lost: no worker claimed it, yet it holds a
+        dispatch slot until it is released to be dispatched again.
+        """
+
+        return self._update_returning(
+            [
+                models.Job.status == models.JobStatus.PENDING.value,
+                models.Job.dispatched_at < dispatched_before,
+                models.Job.updated_at < dispatched_before,
+            ],
+            {"dispatched_at": None},
+        )
+
     def get(self, job_id: int) -> Optional[models.Job]:
         return self.db.query(models.Job).filter(models.Job.id == job_id).first()
 
@@ -107,15 +460,12 @@ class JobRepository:
             .all()
         )
 
-    def update_status(self, job_id: int, status: str, output_uri: Optional[str] = None) -> Optional[models.Job]:
-        job = self.get(job_id)
-        if job:
-            job.status = status
-            if output_uri is not None:
-                job.output_uri = output_uri
-            self.db.commit()
-            self.db.refresh(job)
-        return job
+
+def _heartbeat_expired(heartbeat_before: datetime):
+    return or_(
+        models.Job.heartbeat_at < heartbeat_before,
+        models.Job.heartbeat_at.is_(None) & (models.Job.updated_at < heartbeat_before),
+    )
 
 
 class ReportRepository:
@@ -196,3 +546,14 @@ class TranscriptionRepository:
         self.db.refresh(transcription)
         return transcription
 
+    def update_text(self, transcription_id: int, transcript_text: str) -> Optional[models.Transcription]:
+        transcription = (
+            self.db.query(models.Transcription)
+            .filter(models.Transcription.id == transcription_id)
+            .first()
+        )
+        if transcription:
+            transcription.transcript_text = transcript_text
+            self.db.commit()
+            self.db.refresh(transcription)
+        return transcription
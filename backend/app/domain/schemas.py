@@ -4,6 +4,8 @@ from typing import Any, Optional, Sequence
 from pydantic import BaseModel, Field
 from pydantic import ConfigDict
 
+from app.domain.models import JobPriority
+
 
 class Token(BaseModel):
     access_token: str
@@ -89,16 +91,23 @@ class JobBase(BaseModel):
     input_uri: Optional[str] = None
     transcription_id: Optional[int] = None
     assignee_id: Optional[int] = None
+    priority: JobPriority = JobPriority.ROUTINE
 
 
 class JobCreate(JobBase):
-    pass
+    # Expected recording length, if known; weighs the job for fair scheduling.
+    audio_seconds: Optional[float] = Field(default=None, gt=0)
 
 
 class JobRead(JobBase):
     id: int
     status: str
     output_uri: Optional[str] = None
+    input_bytes: Optional[int] = None
+    audio_seconds: Optional[float] = None
+    processing_rtf: Optional[float] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
     created_by_id: int
     created_at: datetime
     updated_at: datetime
@@ -106,6 +115,13 @@ class JobRead(JobBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class JobProgress(BaseModel):
+    job_id: int
+    status: str
+    completed_chunks: int = 0
+    total_chunks: int = 0
+
+
 def _normalise_status(value: Any) -> str:
     if value is None:
         return ""
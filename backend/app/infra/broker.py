@@ -20,6 +20,9 @@ except ModuleNotFoundError:  # pragma: no cover
         def enqueue(self, *args, **kwargs):  # pragma: no cover
             return None
 
+        def enqueue_in(self, *args, **kwargs):  # pragma: no cover
+            return None
+
 from app.settings import get_settings
 
 settings = get_settings()
@@ -31,4 +34,14 @@ def get_queue(name: str = "default") -> Queue:
     return Queue(name, connection=redis_conn)
 
 
-__all__ = ["redis_conn", "get_queue"]
+def priority_queue_name(priority: str) -> str:
+    """Return the RQ queue for a job priority class.
+
+    Workers listen on these most urgent first, e.g.
+    ``rq worker asr-stat asr-urgent asr-routine``.
+    """
+
+    return f"asr-{priority}"
+
+
+__all__ = ["redis_conn", "get_queue", "priority_queue_name"]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import BinaryIO
+from urllib.parse import urlparse
 
 try:
     import boto3  # type: ignore
@@ -17,6 +18,12 @@ except ModuleNotFoundError:  # pragma: no cover
         def upload_fileobj(self, *args, **kwargs):  # pragma: no cover
             return None
 
+        def download_fileobj(self, *args, **kwargs):  # pragma: no cover
+            return None
+
+        def head_object(self, *args, **kwargs):  # pragma: no cover
+            return {}
+
         def generate_presigned_url(self, *args, **kwargs):  # pragma: no cover
             return "https://example.com/mock"
 
@@ -55,6 +62,35 @@ class StorageClient:
         self._client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs=extra_args)
         return key
 
+    def download_fileobj(self, key: str, fileobj: BinaryIO) -> int:
+        """Stream the object at ``key`` into ``fileobj`` and return the bytes written.
+
+        The transfer runs in ranged parts, so the object is never held in
+        memory as a whole.
+        """
+
+        start = fileobj.tell()
+        self._client.download_fileobj(self.bucket, key, fileobj)
+        return fileobj.tell() - start
+
+    def content_hash(self, key: str) -> str | None:
+        """Return the object's ETag, or ``None`` when it cannot be looked up."""
+
+        try:
+            etag = self._client.head_object(Bucket=self.bucket, Key=key).get("ETag")
+        except Exception:  # noqa: BLE001
+            return None
+        return etag.strip('"') if etag else None
+
+    @staticmethod
+    def key_from_uri(uri: str) -> str:
+        """Return the object key for ``s3://bucket/key`` URIs or bare keys."""
+
+        parsed = urlparse(uri)
+        if parsed.scheme == "s3":
+            return parsed.path.lstrip("/")
+        return uri
+
     def get_signed_url(self, key: str, expires_in: int = 3600) -> str:
         return self._client.generate_presigned_url(
             "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires_in
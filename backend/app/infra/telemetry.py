@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 REQUEST_COUNT = Counter(
     "api_request_total",
@@ -12,6 +12,140 @@ REQUEST_LATENCY = Histogram(
     ["method", "endpoint"],
 )
 
+ASR_BATCH_SIZE = Histogram(
+    "asr_batch_size",
+    "Number of transcription requests dispatched together in one batch",
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+
+ASR_BATCH_WAIT = Histogram(
+    "asr_batch_wait_seconds",
+    "Time a transcription request spent waiting for its batch to be dispatched",
+)
+
+ASR_POOL_IN_USE = Gauge(
+    "asr_model_pool_in_use",
+    "Number of model instances currently checked out",
+    ["pool"],
+)
+
+ASR_POOL_WAITING = Gauge(
+    "asr_model_pool_waiting",
+    "Number of callers waiting for a free model instance",
+    ["pool"],
+)
+
+ASR_MODEL_LOAD_SECONDS = Histogram(
+    "asr_model_load_seconds",
+    "Time spent creating an ASR model instance",
+    ["pool"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+ASR_JOB_MODEL_LOAD_SECONDS = Histogram(
+    "asr_job_model_load_seconds",
+    "Model-load time paid inside a background job; zero once models are resident",
+    ["queue"],
+    buckets=(0, 0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+ASR_POOL_WAIT = Histogram(
+    "asr_model_pool_wait_seconds",
+    "Time spent waiting to check out a model instance",
+    ["pool"],
+)
+
+ASR_CACHE_REQUESTS = Counter(
+    "asr_transcript_cache_requests_total",
+    "Transcript cache lookups by tier and result",
+    ["tier", "result"],
+)
+
+ASR_COLD_START = Gauge(
+    "asr_cold_start_seconds",
+    "Seconds spent warming up an ASR model at startup, by phase",
+    ["model", "phase"],
+)
+
+ASR_RESIDENT_MODELS = Gauge(
+    "asr_resident_models",
+    "Number of ASR models currently registered in this process",
+)
+
+ASR_ADMISSION_IN_FLIGHT = Gauge(
+    "asr_admission_in_flight",
+    "Number of admitted ASR jobs currently running",
+    ["controller"],
+)
+
+ASR_ADMISSION_QUEUED = Gauge(
+    "asr_admission_queued",
+    "Number of ASR jobs waiting for admission",
+    ["controller"],
+)
+
+ASR_ADMISSION_WAIT = Histogram(
+    "asr_admission_wait_seconds",
+    "Time an ASR job waited in the admission queue",
+    ["controller"],
+)
+
+JOB_ATTEMPTS = Counter(
+    "job_attempts_total",
+    "Finished background job attempts, by task and outcome",
+    ["task", "outcome"],
+)
+
+JOB_TENANT_QUEUE_DEPTH = Gauge(
+    "job_tenant_queue_depth",
+    "Transcription jobs waiting for the fair-share dispatcher, by tenant",
+    ["tenant"],
+)
+
+JOB_TENANT_AUDIO_SECONDS = Gauge(
+    "job_tenant_audio_seconds",
+    "Outstanding audio-seconds per tenant, queued or dispatched to the workers",
+    ["tenant", "state"],
+)
+
+ASR_QUEUE_WAIT = Histogram(
+    "asr_queue_wait_seconds",
+    "Time ASR work waited before it started, by queue and priority class",
+    ["queue", "priority"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+
+ASR_ADMISSION_REJECTED = Counter(
+    "asr_admission_rejected_total",
+    "ASR jobs shed by admission control, by reason",
+    ["controller", "reason"],
+)
+
+ASR_EXECUTOR_RESTARTS = Counter(
+    "asr_executor_restarts_total",
+    "Times an ASR worker process pool was rebuilt after a worker died",
+    ["pool"],
+)
+
+ASR_SILENCE_SKIPPED = Histogram(
+    "asr_silence_skipped_ratio",
+    "Fraction of each recording removed by silence trimming before decoding",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0),
+)
+
+ASR_CHECKPOINT_CHUNKS = Counter(
+    "asr_checkpoint_chunks_total",
+    "Long-recording chunks checkpointed as completed or reused on resume",
+    ["result"],
+)
+
+ASR_STAGE_SECONDS = Histogram(
+    "asr_stage_seconds",
+    "Time spent in each stage of a transcription request",
+    ["stage", "model", "duration_bucket"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
 
 async def record_metrics(request, call_next):
     method = request.method
@@ -1,9 +1,13 @@
+import asyncio
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app import deps
 from app.api.v1 import (
     routes_auth,
     routes_health,
@@ -15,6 +19,8 @@ from app.api.v1 import (
 )
 from app.infra.logging import logger
 from app.infra.telemetry import record_metrics
+from app.services.asr.registry import parse_model_routes
+from app.services.asr.warmup import WarmupStatus, warm_up, warmup_state
 from app.settings import get_settings
 
 settings = get_settings()
@@ -44,11 +50,28 @@ app.include_router(routes_users.router)
 async def startup_event() -> None:
     logger.info("Starting %s in %s", settings.APP_NAME, settings.ENV)
     logger.info("CORS allow_origins: %s", settings.frontend_origins)
+    if settings.ASR_WARMUP_ENABLED:
+        whisper_service = deps.get_whisper_service(settings)
+        routed = set(parse_model_routes(settings.ASR_MODEL_ROUTES).values()) - {settings.ASR_MODEL}
+        # Routed models load lazily otherwise, on their first request.
+        routed_warm_ups = {name: partial(_warm_routed_model, name) for name in sorted(routed)}
+        # Keep a reference so the task is not garbage collected mid-flight.
+        app.state.asr_warmup_task = asyncio.create_task(
+            warm_up(settings.ASR_MODEL, whisper_service.warm_up, routed=routed_warm_ups)
+        )
+    else:
+        warmup_state.status = WarmupStatus.DISABLED
+    deps.get_job_event_relay().start(asyncio.get_running_loop())
+
+
+def _warm_routed_model(name: str) -> dict[str, float]:
+    return deps.get_asr_engine(settings, name).warm_up()
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     logger.info("Shutting down %s", settings.APP_NAME)
+    deps.get_job_event_relay().stop()
 
 
 @app.get("/metrics")
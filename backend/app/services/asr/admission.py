@@ -0,0 +1,226 @@
+"""Bounded admission control for ASR work on the request path."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, Sequence
+
+from app.infra.telemetry import (
+    ASR_ADMISSION_IN_FLIGHT,
+    ASR_ADMISSION_QUEUED,
+    ASR_ADMISSION_REJECTED,
+    ASR_ADMISSION_WAIT,
+    ASR_QUEUE_WAIT,
+)
+
+DEFAULT_PRIORITIES = ("stat", "urgent", "routine")
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when ASR work cannot be admitted; ``retry_after`` is in whole seconds."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(eq=False)
+class _Waiter:
+    loop: asyncio.AbstractEventLoop
+    priority: str
+    future: asyncio.Future = field(init=False)
+    granted: bool = False
+
+    def __post_init__(self) -> None:
+        self.future = self.loop.create_future()
+
+
+class AdmissionTicket:
+    """A granted admission slot; releasing it more than once is a no-op."""
+
+    def __init__(self, controller: "AdmissionController") -> None:
+        self._controller = controller
+        self._granted_at = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._controller.release(time.monotonic() - self._granted_at)
+
+
+class AdmissionController:
+    """Limit concurrent ASR jobs and the number of callers queued behind them.
+
+    Up to ``max_concurrency`` callers run at once and up to ``max_queue``
+    more wait for at most ``queue_timeout_seconds``.  Anyone beyond that is
+    rejected straight away with a ``Retry-After`` estimate derived from the
+    moving average of recent job durations, so excess load is shed before it
+    can occupy the shared threadpool.
+
+    Waiters are served by priority class (``priorities``, most urgent first)
+    with aging: each class below the top one counts as ``aging_seconds`` of
+    extra waiting, so a routine caller that has waited that much longer than
+    an urgent one goes first and no class can be starved.  Within a class
+    the order is FIFO.
+
+    State is guarded by a thread lock and waiters are woken through their
+    own event loop, so one controller can be shared across loops and the
+    slot can be released from worker threads.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        *,
+        queue_timeout_seconds: float = 30.0,
+        name: str = "asr",
+        smoothing: float = 0.2,
+        initial_service_seconds: float = 1.0,
+        priorities: Sequence[str] = DEFAULT_PRIORITIES,
+        aging_seconds: float = 10.0,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        if not priorities:
+            raise ValueError("at least one priority class is required")
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout_seconds
+        self._name = name
+        self._smoothing = smoothing
+        self._service_seconds = initial_service_seconds
+        self._ranks = {priority: rank for rank, priority in enumerate(priorities)}
+        self._default_priority = priorities[-1]
+        self._aging_seconds = aging_seconds
+        self._in_flight = 0
+        # Heap of (effective enqueue time, sequence, waiter).
+        self._waiters: list[tuple[float, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free for a new caller."""
+
+        backlog = self._in_flight + len(self._waiters)
+        estimate = backlog / self._max_concurrency * self._service_seconds
+        return max(1, math.ceil(estimate))
+
+    async def acquire(self, priority: Optional[str] = None) -> AdmissionTicket:
+        """Wait for a slot and return the ticket that releases it.
+
+        ``priority`` is one of the controller's priority classes and defaults
+        to the least urgent one.
+        """
+
+        priority = priority or self._default_priority
+        if priority not in self._ranks:
+            raise ValueError("Unknown priority class '%s'" % priority)
+        started_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_flight < self._max_concurrency and not self._waiters:
+                self._in_flight += 1
+                self._record_gauges()
+                self._observe_wait(priority, 0.0)
+                return AdmissionTicket(self)
+            if len(self._waiters) >= self._max_queue:
+                ASR_ADMISSION_REJECTED.labels(controller=self._name, reason="queue_full").inc()
+                raise AdmissionRejected("queue_full", self.retry_after())
+            waiter = _Waiter(loop, priority)
+            entry = (
+                started_at + self._ranks[priority] * self._aging_seconds,
+                next(self._sequence),
+                waiter,
+            )
+            heapq.heappush(self._waiters, entry)
+            self._record_gauges()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self._queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._record_gauges()
+            if granted:
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            ASR_ADMISSION_REJECTED.labels(controller=self._name, reason="timeout").inc()
+            raise AdmissionRejected("timeout", self.retry_after()) from None
+
+        self._observe_wait(priority, time.monotonic() - started_at)
+        return AdmissionTicket(self)
+
+    def release(self, service_seconds: float | None = None) -> None:
+        """Free a slot, handing it to the next waiter.  Safe to call from any thread.
+
+        Callers normally go through :meth:`AdmissionTicket.release`, which
+        also feeds the job duration into the ``Retry-After`` estimate.
+        """
+
+        with self._lock:
+            if service_seconds is not None:
+                self._service_seconds += self._smoothing * (service_seconds - self._service_seconds)
+            while self._waiters:
+                # The slot moves to the waiter without touching ``_in_flight``.
+                _, _, waiter = heapq.heappop(self._waiters)
+                try:
+                    waiter.loop.call_soon_threadsafe(_grant, waiter.future)
+                except RuntimeError:  # the waiter's loop has been closed
+                    continue
+                waiter.granted = True
+                self._record_gauges()
+                return
+            self._in_flight -= 1
+            self._record_gauges()
+
+    @asynccontextmanager
+    async def admit(self, priority: Optional[str] = None) -> AsyncIterator[None]:
+        ticket = await self.acquire(priority)
+        try:
+            yield
+        finally:
+            ticket.release()
+
+    def _observe_wait(self, priority: str, seconds: float) -> None:
+        ASR_ADMISSION_WAIT.labels(controller=self._name).observe(seconds)
+        ASR_QUEUE_WAIT.labels(queue=self._name, priority=priority).observe(seconds)
+
+    def _record_gauges(self) -> None:
+        ASR_ADMISSION_IN_FLIGHT.labels(controller=self._name).set(self._in_flight)
+        ASR_ADMISSION_QUEUED.labels(controller=self._name).set(len(self._waiters))
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+__all__ = ["DEFAULT_PRIORITIES", "AdmissionController", "AdmissionRejected", "AdmissionTicket"]
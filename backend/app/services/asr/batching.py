@@ -0,0 +1,169 @@
+"""Dynamic micro-batching of concurrent transcription requests.
+
+The pinned faster-whisper (1.0.0) has no batched inference, so the batch
+function decodes a batch's recordings one by one or across the model pool:
+batching coalesces requests but does not raise throughput.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Optional, Sequence, TypeVar
+
+from app.infra.telemetry import ASR_BATCH_SIZE, ASR_BATCH_WAIT
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest(Generic[T]):
+    item: T
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class BatchScheduler(Generic[T, R]):
+    """Gather requests arriving within a short window and run them as one batch.
+
+    ``batch_fn`` receives the list of submitted items and must return one
+    result per item, in the same order.  A result that is an exception
+    instance is raised to the corresponding caller only, so a single bad
+    recording does not fail the rest of its batch.
+
+    A batch is dispatched as soon as it holds ``max_batch_size`` items or the
+    oldest request in it has waited ``max_wait_ms``, which bounds the latency
+    the scheduler adds on top of inference.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], Sequence[Any]],
+        *,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+        name: str = "asr-batch",
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._name = name
+        self._queue: "queue.Queue[Optional[_PendingRequest[T]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    @property
+    def max_wait_ms(self) -> float:
+        return self._max_wait * 1000.0
+
+    def submit(self, item: T) -> Future:
+        """Queue ``item`` for the next batch and return a future for its result."""
+
+        if self._closed:
+            raise RuntimeError("BatchScheduler has been shut down")
+        self._ensure_worker()
+        request: _PendingRequest[T] = _PendingRequest(item)
+        self._queue.put(request)
+        return request.future
+
+    async def run(self, item: T) -> R:
+        """Submit ``item`` and await its result from the event loop."""
+
+        return await asyncio.wrap_future(self.submit(item))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and let the dispatcher drain queued requests."""
+
+        self._closed = True
+        self._queue.put(None)
+        thread = self._thread
+        if wait and thread is not None:
+            thread.join()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run_loop, name=self._name, daemon=True
+                )
+                self._thread.start()
+
+    def _run_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = first.enqueued_at + self._max_wait
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        request = self._queue.get(timeout=remaining)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[_PendingRequest[T]]) -> None:
+        started_at = time.monotonic()
+        ASR_BATCH_SIZE.observe(len(batch))
+        for request in batch:
+            ASR_BATCH_WAIT.observe(started_at - request.enqueued_at)
+
+        active = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not active:
+            return
+
+        try:
+            results = self._batch_fn([request.item for request in active])
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Batch of %d transcription requests failed", len(active))
+            for request in active:
+                request.future.set_exception(exc)
+            return
+
+        if len(results) != len(active):
+            error = RuntimeError(
+                "Batch function returned %d results for %d requests"
+                % (len(results), len(active))
+            )
+            for request in active:
+                request.future.set_exception(error)
+            return
+
+        for request, result in zip(active, results):
+            if isinstance(result, BaseException):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+
+
+__all__ = ["BatchScheduler"]
@@ -0,0 +1,126 @@
+"""Content-addressed cache of finished transcripts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Mapping, Optional, Protocol
+
+from app.infra.telemetry import ASR_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(audio_digest: str, model_config: Mapping[str, Any]) -> str:
+    """Build the cache key for audio with ``audio_digest`` decoded under ``model_config``."""
+
+    config = json.dumps(model_config, sort_keys=True, separators=(",", ":"), default=str)
+    config_digest = hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]
+    return f"{audio_digest}:{config_digest}"
+
+
+class TranscriptStore(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, transcript: str) -> None: ...
+
+
+class RedisTranscriptStore:
+    """Shared second-tier store backed by Redis.
+
+    Errors talking to Redis are logged and treated as misses so an outage
+    only costs cache hits, never transcriptions.
+    """
+
+    def __init__(self, connection: Any, *, prefix: str = "asr:transcript:", ttl_seconds: int = 0) -> None:
+        self._connection = connection
+        self._prefix = prefix
+        self._ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self._connection.get(self._prefix + key)
+        except Exception:  # noqa: BLE001
+            logger.warning("Transcript cache lookup failed", exc_info=True)
+            return None
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+    def set(self, key: str, transcript: str) -> None:
+        try:
+            self._connection.set(
+                self._prefix + key,
+                transcript.encode("utf-8"),
+                ex=self._ttl_seconds or None,
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning("Transcript cache write failed", exc_info=True)
+
+
+class TranscriptCache:
+    """Two-tier transcript cache: an in-process LRU in front of a shared store.
+
+    The LRU is bounded by the total UTF-8 size of the cached transcripts;
+    the least recently used entries are evicted once ``max_bytes`` is
+    exceeded.  Hits in the shared store are copied into the LRU.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, store: TranscriptStore | None = None) -> None:
+        self._max_bytes = max_bytes
+        self._store = store
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            transcript = self._entries.get(key)
+            if transcript is not None:
+                self._entries.move_to_end(key)
+        if transcript is not None:
+            ASR_CACHE_REQUESTS.labels(tier="memory", result="hit").inc()
+            return transcript
+        ASR_CACHE_REQUESTS.labels(tier="memory", result="miss").inc()
+
+        if self._store is None:
+            return None
+        transcript = self._store.get(key)
+        ASR_CACHE_REQUESTS.labels(
+            tier="shared", result="hit" if transcript is not None else "miss"
+        ).inc()
+        if transcript is not None:
+            self._remember(key, transcript)
+        return transcript
+
+    def set(self, key: str, transcript: str) -> None:
+        self._remember(key, transcript)
+        if self._store is not None:
+            self._store.set(key, transcript)
+
+    def _remember(self, key: str, transcript: str) -> None:
+        size = len(transcript.encode("utf-8"))
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.encode("utf-8"))
+            self._entries[key] = transcript
+            self._size += size
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.encode("utf-8"))
+
+
+__all__ = ["RedisTranscriptStore", "TranscriptCache", "TranscriptStore", "cache_key"]
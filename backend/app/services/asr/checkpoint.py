@@ -0,0 +1,200 @@
+"""Per-chunk checkpoints so long transcriptions resume where they stopped."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Mapping, Optional, Protocol, Sequence
+
+from app.infra.telemetry import ASR_CHECKPOINT_CHUNKS
+
+logger = logging.getLogger(__name__)
+
+_PLAN_FIELD = "plan"
+_TOTAL_FIELD = "total"
+_CHUNK_PREFIX = "chunk:"
+
+
+class CheckpointStore(Protocol):
+    def load(self, key: str) -> dict[str, str]: ...
+
+    def save(self, key: str, fields: Mapping[str, str]) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryCheckpointStore:
+    """Process-local store, for development and tests."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> dict[str, str]:
+        with self._lock:
+            return dict(self._entries.get(key, {}))
+
+    def save(self, key: str, fields: Mapping[str, str]) -> None:
+        with self._lock:
+            self._entries.setdefault(key, {}).update(fields)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisCheckpointStore:
+    """Keep each job's checkpoint in one Redis hash that expires after ``ttl_seconds``.
+
+    Redis errors are logged and swallowed: losing a checkpoint only costs
+    the re-transcription of some chunks.
+    """
+
+    def __init__(self, connection: Any, *, prefix: str = "asr:checkpoint:", ttl_seconds: int = 0) -> None:
+        self._connection = connection
+        self._prefix = prefix
+        self._ttl_seconds = ttl_seconds
+
+    def load(self, key: str) -> dict[str, str]:
+        try:
+            raw = self._connection.hgetall(self._prefix + key)
+        except Exception:  # noqa: BLE001
+            logger.warning("Checkpoint lookup failed for '%s'", key, exc_info=True)
+            return {}
+        return {_text(field): _text(value) for field, value in raw.items()}
+
+    def save(self, key: str, fields: Mapping[str, str]) -> None:
+        try:
+            self._connection.hset(self._prefix + key, mapping=dict(fields))
+            if self._ttl_seconds:
+                self._connection.expire(self._prefix + key, self._ttl_seconds)
+        except Exception:  # noqa: BLE001
+            logger.warning("Checkpoint write failed for '%s'", key, exc_info=True)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connection.delete(self._prefix + key)
+        except Exception:  # noqa: BLE001
+            logger.warning("Checkpoint cleanup failed for '%s'", key, exc_info=True)
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+def plan_fingerprint(
+    bounds: Sequence[tuple[float, float]], identity: Optional[Mapping[str, Any]] = None
+) -> str:
+    """Identify a chunk plan so checkpoints from a different plan are ignored.
+
+    ``identity`` holds the settings that shape each chunk's transcript
+    (model, compute type, beam size, ...), so chunks decoded by another
+    model or with other decode settings are never stitched together.
+    """
+
+    plan = ";".join("%.3f-%.3f" % (start, end) for start, end in bounds)
+    if identity:
+        plan += "|" + json.dumps(dict(identity), sort_keys=True, default=str)
+    return hashlib.sha256(plan.encode("utf-8")).hexdigest()[:16]
+
+
+class ChunkCheckpoint:
+    """Checkpoint of one recording's chunk transcripts, stored under ``key``.
+
+    :meth:`begin` returns the transcripts already finished for the same
+    chunk plan; a different plan (other audio, chunking or decode settings)
+    starts over.  Each finished chunk is recorded immediately, so a retried job
+    only transcribes the chunks that are still missing.  ``on_progress`` is
+    called with the finished and total chunk counts as chunks are recorded
+    in this process; chunks may be recorded from several threads, and the
+    reported count never goes backwards.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        key: str,
+        *,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        self._store = store
+        self._key = key
+        self._on_progress = on_progress
+        self._completed = 0
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    def begin(
+        self,
+        bounds: Sequence[tuple[float, float]],
+        *,
+        identity: Optional[Mapping[str, Any]] = None,
+    ) -> dict[int, str]:
+        fingerprint = plan_fingerprint(bounds, identity)
+        stored = self._store.load(self._key)
+        self._total = len(bounds)
+        if stored.get(_PLAN_FIELD) != fingerprint:
+            self._store.delete(self._key)
+            self._store.save(self._key, {_PLAN_FIELD: fingerprint, _TOTAL_FIELD: str(len(bounds))})
+            self._report(0)
+            return {}
+        completed = {
+            int(field[len(_CHUNK_PREFIX):]): text
+            for field, text in stored.items()
+            if field.startswith(_CHUNK_PREFIX)
+        }
+        if completed:
+            ASR_CHECKPOINT_CHUNKS.labels(result="resumed").inc(len(completed))
+            logger.info(
+                "Resuming '%s' with %d of %d chunks already transcribed",
+                self._key,
+                len(completed),
+                len(bounds),
+            )
+        self._report(len(completed))
+        return completed
+
+    def record(self, index: int, text: str) -> None:
+        self._store.save(self._key, {"%s%d" % (_CHUNK_PREFIX, index): text})
+        ASR_CHECKPOINT_CHUNKS.labels(result="completed").inc()
+        with self._lock:
+            self._completed += 1
+            self._notify()
+
+    def progress(self) -> dict[str, int]:
+        stored = self._store.load(self._key)
+        completed = sum(1 for field in stored if field.startswith(_CHUNK_PREFIX))
+        return {"completed_chunks": completed, "total_chunks": int(stored.get(_TOTAL_FIELD, 0))}
+
+    def clear(self) -> None:
+        self._store.delete(self._key)
+
+    def _report(self, completed: int) -> None:
+        with self._lock:
+            self._completed = completed
+            self._notify()
+
+    def _notify(self) -> None:
+        # Called with the lock held so concurrent chunks report in order.
+        if self._on_progress is not None:
+            self._on_progress(self._completed, self._total)
+
+
+def job_checkpoint_key(job_id: int) -> str:
+    return "job:%d" % job_id
+
+
+__all__ = [
+    "CheckpointStore",
+    "ChunkCheckpoint",
+    "MemoryCheckpointStore",
+    "RedisCheckpointStore",
+    "job_checkpoint_key",
+    "plan_fingerprint",
+]
@@ -0,0 +1,157 @@
+"""Client for the node-local ASR inference server."""
+
+from __future__ import annotations
+
+import socket
+import time
+from typing import Any, Iterator, Optional
+
+from app.services.asr.checkpoint import ChunkCheckpoint
+from app.services.asr.protocol import audio_to_bytes, encode_message, read_message
+from app.services.asr.streaming import TimedWord
+from app.services.asr.timing import StageTimer
+from app.utils.audio import AudioInput, load_audio
+
+
+class InferenceError(RuntimeError):
+    """Raised when the inference server reports a failed request."""
+
+
+class InferenceClient:
+    """Drop-in replacement for :class:`WhisperService` backed by the inference server.
+
+    Audio is decoded in the calling process and sent as float32 samples, so
+    callers never import or load a model.  Each call uses its own short-lived
+    Unix socket connection, which keeps the client thread-safe and lets it
+    survive server restarts.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        *,
+        model_name: Optional[str] = None,
+        timeout_seconds: float = 600.0,
+    ) -> None:
+        self._socket_path = socket_path
+        self._requested_model = model_name
+        self._timeout = timeout_seconds
+        self._description: Optional[dict[str, Any]] = None
+
+    def for_model(self, model_name: str) -> "InferenceClient":
+        return InferenceClient(
+            self._socket_path, model_name=model_name, timeout_seconds=self._timeout
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self._describe()["model"]
+
+    def cache_identity(self) -> dict[str, Any]:
+        return self._describe()["cache_identity"]
+
+    def pool_stats(self) -> dict[str, Any]:
+        return self._request({"op": "stats"})["stats"]
+
+    def warm_up(self, wait_seconds: float = 300.0) -> dict[str, float]:
+        """Wait until the server answers; the server warms its own models."""
+
+        started_at = time.perf_counter()
+        deadline = started_at + wait_seconds
+        while True:
+            try:
+                self._request({"op": "ping"})
+                break
+            except (ConnectionError, FileNotFoundError, socket.timeout):
+                if time.perf_counter() >= deadline:
+                    raise
+                time.sleep(0.5)
+        return {"connect_seconds": time.perf_counter() - started_at}
+
+    def transcribe(self, audio_path: AudioInput, *, timer: StageTimer | None = None) -> str:
+        response = self._request({"op": "transcribe", "timed": timer is not None}, audio_path)
+        self._merge_stages(response, timer)
+        return response["transcript"]
+
+    def transcribe_segments(
+        self,
+        audio_path: AudioInput,
+        *,
+        checkpoint: ChunkCheckpoint | None = None,
+        timer: StageTimer | None = None,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Like :meth:`WhisperService.transcribe_segments`.
+
+        Only the checkpoint's key crosses the socket; the server records
+        chunks in its own checkpoint store.
+        """
+
+        header = {
+            "op": "transcribe_segments",
+            "timed": timer is not None,
+            "checkpoint": checkpoint.key if checkpoint is not None else None,
+        }
+        response = self._request(header, audio_path)
+        self._merge_stages(response, timer)
+        return response["transcript"], response["segments"]
+
+    def transcribe_many(self, audio_paths: list[AudioInput]) -> list[str | Exception]:
+        results: list[str | Exception] = []
+        for audio_path in audio_paths:
+            try:
+                results.append(self.transcribe(audio_path))
+            except Exception as exc:  # noqa: BLE001
+                results.append(exc)
+        return results
+
+    def transcribe_words(self, audio: AudioInput, initial_prompt: str | None = None) -> list[TimedWord]:
+        response = self._request({"op": "words", "initial_prompt": initial_prompt}, audio)
+        return [TimedWord(*word) for word in response["words"]]
+
+    def iter_segments(self, audio_path: AudioInput) -> Iterator[dict[str, Any]]:
+        with self._connect() as sock:
+            sock.sendall(self._encode({"op": "segments"}, audio_path))
+            while True:
+                header = self._check(read_message(sock)[0])
+                if header.get("done"):
+                    return
+                yield header["segment"]
+
+    @staticmethod
+    def _merge_stages(response: dict[str, Any], timer: StageTimer | None) -> None:
+        if timer is not None:
+            for stage, seconds in response.get("stages", {}).items():
+                timer.add(stage, seconds)
+
+    def _describe(self) -> dict[str, Any]:
+        if self._description is None:
+            self._description = self._request({"op": "describe"})
+        return self._description
+
+    def _request(self, header: dict[str, Any], audio: AudioInput | None = None) -> dict[str, Any]:
+        with self._connect() as sock:
+            sock.sendall(self._encode(header, audio))
+            return self._check(read_message(sock)[0])
+
+    def _encode(self, header: dict[str, Any], audio: AudioInput | None) -> bytes:
+        payload = audio_to_bytes(load_audio(audio)) if audio is not None else b""
+        return encode_message({**header, "model": self._requested_model}, payload)
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._timeout)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    @staticmethod
+    def _check(header: dict[str, Any]) -> dict[str, Any]:
+        if not header.get("ok"):
+            raise InferenceError(header.get("error") or "Inference request failed")
+        return header
+
+
+__all__ = ["InferenceClient", "InferenceError"]
@@ -0,0 +1,217 @@
+"""Process-pool backend that runs ASR inference outside the API process."""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.infra.telemetry import ASR_EXECUTOR_RESTARTS
+from app.services.asr.timing import StageTimer
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_BACKENDS = ("thread", "process")
+
+# Set in each child by ``_init_worker``; one transcriber per worker process.
+_worker_transcriber: Any = None
+
+
+def _init_worker(factory: Callable[[], Any]) -> None:
+    global _worker_transcriber
+    _worker_transcriber = factory()
+    warm_up = getattr(_worker_transcriber, "warm_up", None)
+    if warm_up is not None:
+        warm_up()
+
+
+def _worker_call(method: str, args: tuple[Any, ...], timed: bool) -> tuple[Any, dict[str, float]]:
+    """Call ``method`` on this worker's transcriber; return its result and stage times.
+
+    Generators are drained here, since they cannot cross the process boundary.
+    """
+
+    timer = StageTimer() if timed else None
+    target = getattr(_worker_transcriber, method)
+    result = target(*args, timer=timer) if timer is not None else target(*args)
+    if inspect.isgenerator(result):
+        result = list(result)
+    return result, timer.stages if timer is not None else {}
+
+
+def _worker_ping() -> int:
+    return multiprocessing.current_process().pid or 0
+
+
+class ProcessPoolTranscriber:
+    """Transcribe in ``workers`` child processes that each load the model once.
+
+    ``factory`` must be picklable (a module-level callable or a
+    :func:`functools.partial` of one); it runs once in every child to build
+    the transcriber.  Children are started with ``spawn`` so they never
+    inherit the parent's threads or loaded models.  If a child dies (for
+    example killed by the OOM killer) the pool is rebuilt and the request is
+    retried once before the error is raised.  Requests that have been
+    submitted but not answered yet are counted in :attr:`in_flight`, and
+    :meth:`shutdown_if_idle` only stops the workers while there are none.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        workers: int = 1,
+        *,
+        name: str = "asr",
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._factory = factory
+        self._workers = workers
+        self._name = name
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._restarts = 0
+        self._in_flight = 0
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def warm_up(self) -> None:
+        """Start every worker and wait for its model to load."""
+
+        executor = self._get_executor()
+        for future in [executor.submit(_worker_ping) for _ in range(self._workers)]:
+            future.result()
+
+    def call(self, method: str, *args: Any, timer: Optional[StageTimer] = None) -> Any:
+        """Run the worker transcriber's ``method`` and return its result.
+
+        With a ``timer`` the method is called with a timer of its own in the
+        worker, and the stage times it records are added to ``timer``.
+        """
+
+        result, stages = self._submit(method, args, timer is not None).result()
+        if timer is not None:
+            for stage, seconds in stages.items():
+                timer.add(stage, seconds)
+        return result
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        return self.call("transcribe", audio)
+
+    def transcribe_many(self, audio: list[np.ndarray]) -> list[str | Exception]:
+        futures = [self._submit("transcribe", (item,), False) for item in audio]
+        results: list[str | Exception] = []
+        for future in futures:
+            try:
+                results.append(future.result()[0])
+            except Exception as exc:  # noqa: BLE001
+                results.append(exc)
+        return results
+
+    def shutdown(self) -> None:
+        """Stop the workers; requests that have not started are cancelled."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def shutdown_if_idle(self) -> bool:
+        """Stop the workers unless a request is in flight; return whether it did."""
+
+        with self._lock:
+            if self._in_flight:
+                return False
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        return True
+
+    def _submit(self, method: str, args: tuple[Any, ...], timed: bool) -> Future:
+        """Submit a call and return a future that survives one pool crash."""
+
+        outer: Future = Future()
+        with self._lock:
+            self._in_flight += 1
+        outer.add_done_callback(self._settled)
+
+        def attempt(retries_left: int) -> None:
+            executor = self._get_executor()
+            try:
+                inner = executor.submit(_worker_call, method, args, timed)
+            except BrokenProcessPool as exc:
+                self._restart(executor)
+                if retries_left:
+                    attempt(retries_left - 1)
+                else:
+                    outer.set_exception(exc)
+                return
+            except Exception as exc:  # noqa: BLE001 - e.g. shut down meanwhile
+                outer.set_exception(exc)
+                return
+
+            def done(future: Future) -> None:
+                if future.cancelled():
+                    # Cancelled by a shutdown before a worker picked it up.
+                    outer.cancel()
+                    return
+                exc = future.exception()
+                if isinstance(exc, BrokenProcessPool):
+                    self._restart(executor)
+                    if retries_left:
+                        attempt(retries_left - 1)
+                        return
+                if exc is not None:
+                    outer.set_exception(exc)
+                else:
+                    outer.set_result(future.result())
+
+            inner.add_done_callback(done)
+
+        attempt(1)
+        return outer
+
+    def _settled(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self._factory,),
+                )
+            return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return  # another caller already replaced it
+            self._executor = None
+            self._restarts += 1
+        ASR_EXECUTOR_RESTARTS.labels(pool=self._name).inc()
+        logger.error("ASR worker process for '%s' died; restarting the pool", self._name)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["EXECUTOR_BACKENDS", "ProcessPoolTranscriber"]
@@ -0,0 +1,276 @@
+"""Fixed-size pool of inference model instances with optional CPU pinning."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+from app.infra.telemetry import (
+    ASR_MODEL_LOAD_SECONDS,
+    ASR_POOL_IN_USE,
+    ASR_POOL_WAIT,
+    ASR_POOL_WAITING,
+)
+
+M = TypeVar("M")
+
+logger = logging.getLogger(__name__)
+
+_load_lock = threading.Lock()
+_load_seconds_total = 0.0
+
+
+def model_load_seconds() -> float:
+    """Seconds this process has spent creating model instances, across all pools.
+
+    Sampling it before and after a unit of work gives the model-load overhead
+    that work paid.
+    """
+
+    with _load_lock:
+        return _load_seconds_total
+
+
+def _record_load(pool: str, seconds: float) -> None:
+    global _load_seconds_total
+    with _load_lock:
+        _load_seconds_total += seconds
+    ASR_MODEL_LOAD_SECONDS.labels(pool=pool).observe(seconds)
+
+
+def cpu_slices(count: int, threads_per_instance: int = 0) -> list[Optional[set[int]]]:
+    """Split the CPUs available to this process into ``count`` disjoint sets.
+
+    When ``threads_per_instance`` is positive each slice holds at most that
+    many cores.  ``None`` is returned for every slot on platforms without
+    ``sched_getaffinity`` or when there are fewer cores than instances.
+    """
+
+    if not hasattr(os, "sched_getaffinity"):
+        return [None] * count
+    cores = sorted(os.sched_getaffinity(0))
+    if count <= 0 or len(cores) < count:
+        return [None] * count
+
+    per_instance = len(cores) // count
+    if threads_per_instance > 0:
+        per_instance = min(per_instance, threads_per_instance)
+    return [
+        set(cores[index * per_instance : (index + 1) * per_instance])
+        for index in range(count)
+    ]
+
+
+def run_pinned(factory: Callable[[], M], cores: Optional[set[int]]) -> M:
+    """Call ``factory`` on a helper thread restricted to ``cores``.
+
+    Native inference runtimes spawn their worker threads while the model is
+    constructed and those threads inherit the creating thread's affinity, so
+    building the model on a pinned thread keeps all of its compute on the
+    given cores without touching the affinity of the calling thread.
+    """
+
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return factory()
+
+    outcome: dict[str, object] = {}
+
+    def target() -> None:
+        try:
+            os.sched_setaffinity(0, cores)
+            outcome["value"] = factory()
+        except BaseException as exc:  # noqa: BLE001
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=target, name="asr-model-loader", daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]  # type: ignore[misc]
+    return outcome["value"]  # type: ignore[return-value]
+
+
+class ModelPool(Generic[M]):
+    """Hand out model instances to a bounded number of concurrent callers.
+
+    Instances are created lazily by ``factory(index)`` the first time a
+    checkout finds no idle slot and the pool is below ``size``.  Each
+    instance serves up to ``slots_per_instance`` callers at once, matching
+    runtimes that accept concurrent requests on one model (``num_workers``).
+    Once every slot is busy, callers block until one is returned (or
+    ``timeout`` expires).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], M],
+        size: int = 1,
+        *,
+        slots_per_instance: int = 1,
+        name: str = "default",
+    ) -> None:
+        if size < 1:
+            raise ValueError("Model pool size must be at least 1")
+        if slots_per_instance < 1:
+            raise ValueError("slots_per_instance must be at least 1")
+        self._factory = factory
+        self._size = size
+        self._slots = slots_per_instance
+        self._name = name
+        self._condition = threading.Condition()
+        self._idle: list[M] = []
+        self._instances: list[M] = []
+        self._creating = 0
+        self._next_index = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of concurrent checkouts across all instances."""
+
+        return self._size * self._slots
+
+    @property
+    def loaded(self) -> int:
+        return len(self._instances)
+
+    @contextmanager
+    def checkout(self, timeout: float | None = None) -> Iterator[M]:
+        """Borrow an instance for the duration of the ``with`` block."""
+
+        instance = self._acquire(timeout)
+        acquired_at = time.monotonic()
+        try:
+            yield instance
+        finally:
+            self._release(instance, time.monotonic() - acquired_at)
+
+    def instances(self) -> list[M]:
+        """Return the instances created so far."""
+
+        with self._condition:
+            return list(self._instances)
+
+    def warm(self) -> None:
+        """Create every instance of the pool up front."""
+
+        while True:
+            with self._condition:
+                if len(self._instances) + self._creating >= self._size:
+                    return
+                index = self._reserve_slot()
+            self._create(index, hold=False)
+
+    def clear(self) -> bool:
+        """Drop every instance if none is checked out; return whether it did.
+
+        The next checkout creates instances again from the factory.
+        """
+
+        with self._condition:
+            if self._in_use or self._creating:
+                return False
+            self._idle.clear()
+            self._instances.clear()
+            self._next_index = 0
+            return True
+
+    def stats(self) -> dict[str, float]:
+        with self._condition:
+            elapsed = max(time.monotonic() - self._started_at, 1e-9)
+            busy = self._busy_seconds
+            return {
+                "size": self._size,
+                "loaded": len(self._instances),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "avg_wait_seconds": self._total_wait / self._checkouts if self._checkouts else 0.0,
+                "utilization": min(busy / (elapsed * self.capacity), 1.0),
+            }
+
+    def _acquire(self, timeout: float | None) -> M:
+        requested_at = time.monotonic()
+        deadline = None if timeout is None else requested_at + timeout
+        with self._condition:
+            self._waiting += 1
+            ASR_POOL_WAITING.labels(pool=self._name).set(self._waiting)
+            try:
+                while not self._idle:
+                    if len(self._instances) + self._creating < self._size:
+                        index = self._reserve_slot()
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(
+                            "Timed out waiting for a free model instance in pool '%s'" % self._name
+                        )
+                    self._condition.wait(remaining)
+                else:
+                    return self._checked_out(self._idle.pop(), requested_at)
+            finally:
+                self._waiting -= 1
+                ASR_POOL_WAITING.labels(pool=self._name).set(self._waiting)
+
+        instance = self._create(index, hold=True)
+        with self._condition:
+            return self._checked_out(instance, requested_at)
+
+    def _reserve_slot(self) -> int:
+        self._creating += 1
+        index = self._next_index % self._size
+        self._next_index += 1
+        return index
+
+    def _create(self, index: int, *, hold: bool) -> M:
+        logger.info("Creating model instance %d/%d for pool '%s'", index + 1, self._size, self._name)
+        started_at = time.perf_counter()
+        try:
+            instance = self._factory(index)
+        except BaseException:
+            with self._condition:
+                self._creating -= 1
+                self._condition.notify()
+            raise
+        finally:
+            _record_load(self._name, time.perf_counter() - started_at)
+        with self._condition:
+            self._creating -= 1
+            self._instances.append(instance)
+            spare_slots = self._slots if not hold else self._slots - 1
+            self._idle.extend([instance] * spare_slots)
+            self._condition.notify(spare_slots)
+        return instance
+
+    def _checked_out(self, instance: M, requested_at: float) -> M:
+        waited = time.monotonic() - requested_at
+        self._in_use += 1
+        self._checkouts += 1
+        self._total_wait += waited
+        ASR_POOL_WAIT.labels(pool=self._name).observe(waited)
+        ASR_POOL_IN_USE.labels(pool=self._name).set(self._in_use)
+        return instance
+
+    def _release(self, instance: M, busy_seconds: float) -> None:
+        with self._condition:
+            self._in_use -= 1
+            self._busy_seconds += busy_seconds
+            self._idle.append(instance)
+            ASR_POOL_IN_USE.labels(pool=self._name).set(self._in_use)
+            self._condition.notify()
+
+
+__all__ = ["ModelPool", "cpu_slices", "model_load_seconds", "run_pinned"]
@@ -0,0 +1,90 @@
+"""Wire format shared by the local inference server and its clients.
+
+Every message is a 4-byte big-endian header length, a UTF-8 JSON header and
+an optional binary payload whose size is given by the header's
+``payload_bytes`` field.  Audio travels as raw little-endian float32 samples
+at 16 kHz.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import struct
+from typing import Any
+
+import numpy as np
+
+_LENGTH = struct.Struct(">I")
+MAX_HEADER_BYTES = 1024 * 1024
+
+
+class ProtocolError(RuntimeError):
+    """Raised when a peer sends a malformed message."""
+
+
+def encode_message(header: dict[str, Any], payload: bytes = b"") -> bytes:
+    body = json.dumps({**header, "payload_bytes": len(payload)}).encode("utf-8")
+    return _LENGTH.pack(len(body)) + body + payload
+
+
+def _decode_header(raw: bytes) -> dict[str, Any]:
+    try:
+        header = json.loads(raw.decode("utf-8"))
+    except ValueError as exc:
+        raise ProtocolError("Invalid message header") from exc
+    if not isinstance(header, dict):
+        raise ProtocolError("Message header must be an object")
+    return header
+
+
+def _check_length(length: int) -> None:
+    if length > MAX_HEADER_BYTES:
+        raise ProtocolError("Message header too large")
+
+
+def audio_to_bytes(audio: np.ndarray) -> bytes:
+    return np.ascontiguousarray(audio, dtype="<f4").tobytes()
+
+
+def bytes_to_audio(payload: bytes) -> np.ndarray:
+    return np.frombuffer(payload, dtype="<f4").astype(np.float32, copy=False)
+
+
+async def read_message_async(reader: asyncio.StreamReader) -> tuple[dict[str, Any], bytes]:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    _check_length(length)
+    header = _decode_header(await reader.readexactly(length))
+    payload = await reader.readexactly(int(header.get("payload_bytes", 0)))
+    return header, payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Inference server closed the connection")
+        received += count
+    return bytes(buffer)
+
+
+def read_message(sock: socket.socket) -> tuple[dict[str, Any], bytes]:
+    (length,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    _check_length(length)
+    header = _decode_header(_recv_exactly(sock, length))
+    payload = _recv_exactly(sock, int(header.get("payload_bytes", 0)))
+    return header, payload
+
+
+__all__ = [
+    "ProtocolError",
+    "audio_to_bytes",
+    "bytes_to_audio",
+    "encode_message",
+    "read_message",
+    "read_message_async",
+]
@@ -0,0 +1,308 @@
+"""Registry of Whisper models with memory-bounded LRU residency."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Mapping, Optional
+
+from app.infra.telemetry import ASR_RESIDENT_MODELS
+from app.services.asr.whisper_service import WhisperService
+
+logger = logging.getLogger(__name__)
+
+# Approximate resident size of the int8 CTranslate2 conversions, used for
+# hub models whose files are not in the local model directory.
+DEFAULT_MODEL_SIZES_MB = {
+    "tiny": 75,
+    "tiny.en": 75,
+    "base": 145,
+    "base.en": 145,
+    "small": 480,
+    "small.en": 480,
+    "medium": 1500,
+    "medium.en": 1500,
+    "large-v2": 3000,
+    "large-v3": 3000,
+}
+FALLBACK_MODEL_SIZE_MB = 500
+
+ServiceFactory = Callable[[str, Optional[str]], WhisperService]
+
+
+def parse_model_routes(value: str) -> dict[str, str]:
+    """Parse ``"draft=tiny,final=small,specialty:cardiology=small"`` into a mapping."""
+
+    routes: dict[str, str] = {}
+    for item in value.split(","):
+        key, separator, model = item.partition("=")
+        if separator and key.strip() and model.strip():
+            routes[key.strip().lower()] = model.strip()
+    return routes
+
+
+def discover_local_models(model_dir: str | None) -> dict[str, Path]:
+    """Return CTranslate2 model directories (those holding ``model.bin``) by name."""
+
+    if not model_dir:
+        return {}
+    root = Path(model_dir)
+    if not root.is_dir():
+        logger.warning("ASR model directory '%s' does not exist", model_dir)
+        return {}
+    return {
+        path.name: path
+        for path in sorted(root.iterdir())
+        if path.is_dir() and (path / "model.bin").is_file()
+    }
+
+
+@dataclass
+class _Resident:
+    size_mb: float
+    last_used: float
+    leases: int = 0
+    # Resolves to the service once the factory has built it.
+    loaded: Future = field(default_factory=Future)
+    # Set while the service is being unloaded; fired once that is over.
+    evicting: Optional[threading.Event] = None
+
+    @property
+    def service(self) -> WhisperService:
+        return self.loaded.result()
+
+
+class ModelRegistry:
+    """Serve several Whisper models from one process without exceeding a memory budget.
+
+    Models are created on first use.  Before a new model is admitted, least
+    recently used models that are not serving a request are unloaded until
+    the estimated footprint fits ``memory_budget_mb``; models idle for longer
+    than ``idle_timeout_seconds`` are unloaded by :meth:`evict_idle`.  The
+    ``pinned`` models are never evicted, and neither is a model while it is
+    held by a :meth:`lease`.
+
+    The lock only guards the bookkeeping: a model is built, and evicted
+    models are unloaded, after it is released, so a cold load or a slow
+    shutdown only holds up the requests for that model.
+    """
+
+    def __init__(
+        self,
+        factory: ServiceFactory,
+        *,
+        default_model: str,
+        model_dir: str | None = None,
+        memory_budget_mb: float = 0,
+        idle_timeout_seconds: float = 0,
+        routes: Mapping[str, str] | None = None,
+        pinned: tuple[str, ...] = (),
+    ) -> None:
+        self._factory = factory
+        self._default_model = default_model
+        self._local_models = discover_local_models(model_dir)
+        self._memory_budget_mb = memory_budget_mb
+        self._idle_timeout = idle_timeout_seconds
+        self._routes = dict(routes or {})
+        self._pinned = set(pinned) | {default_model}
+        self._resident: "OrderedDict[str, _Resident]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def default_model(self) -> str:
+        return self._default_model
+
+    def available_models(self) -> list[str]:
+        return sorted(set(self._local_models) | {self._default_model} | set(self._routes.values()))
+
+    def resident_models(self) -> list[str]:
+        with self._lock:
+            return list(self._resident)
+
+    def select(self, *, job_type: str | None = None, specialty: str | None = None) -> str:
+        """Pick the model for a request: specialty route, then job type, then default."""
+
+        if specialty:
+            model = self._routes.get("specialty:%s" % specialty.strip().lower())
+            if model:
+                return model
+        if job_type:
+            model = self._routes.get(job_type.strip().lower())
+            if model:
+                return model
+        return self._default_model
+
+    def get(self, model_name: str | None = None) -> WhisperService:
+        """Return the service for ``model_name``, loading it on first use.
+
+        Nothing stops the service from being evicted afterwards; requests
+        that run on a model which may not be pinned should :meth:`lease` it.
+        """
+
+        return self._acquire(model_name or self._default_model, lease=False).service
+
+    @contextmanager
+    def lease(self, model_name: str | None = None) -> Iterator[WhisperService]:
+        """Hold the service for ``model_name``; it is not evicted until the block exits."""
+
+        resident = self._acquire(model_name or self._default_model, lease=True)
+        try:
+            yield resident.service
+        finally:
+            with self._lock:
+                resident.leases -= 1
+                resident.last_used = time.monotonic()
+
+    def evict_idle(self) -> list[str]:
+        """Unload models that have not been used within the idle timeout."""
+
+        if self._idle_timeout <= 0:
+            return []
+        cutoff = time.monotonic() - self._idle_timeout
+        with self._lock:
+            victims = [
+                (name, resident)
+                for name, resident in self._resident.items()
+                if resident.last_used < cutoff and self._evictable(name, resident)
+            ]
+            for _, resident in victims:
+                resident.evicting = threading.Event()
+        return self._unload(victims)
+
+    def start_reaper(self, interval_seconds: float = 30.0) -> None:
+        if self._idle_timeout <= 0 or self._reaper is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.evict_idle()
+                except Exception:  # noqa: BLE001
+                    logger.exception("Idle model eviction failed")
+
+        self._reaper = threading.Thread(target=run, name="asr-model-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        self._stop.set()
+
+    def _acquire(self, name: str, *, lease: bool) -> _Resident:
+        while True:
+            with self._lock:
+                resident = self._resident.get(name)
+                if resident is None or resident.evicting is None:
+                    created = resident is None
+                    victims: list[tuple[str, _Resident]] = []
+                    if created:
+                        resident, victims = self._reserve(name)
+                    resident.last_used = time.monotonic()
+                    self._resident.move_to_end(name)
+                    if lease:
+                        resident.leases += 1
+                    break
+                evicting = resident.evicting
+            # Whether the unload succeeds decides if the model is loaded anew.
+            evicting.wait()
+
+        if created:
+            self._unload(victims)
+            self._load(name, resident)
+        # Waits for a load another request started.
+        error = resident.loaded.exception()
+        if error is not None:
+            if lease:
+                with self._lock:
+                    resident.leases -= 1
+            raise error
+        return resident
+
+    def _reserve(self, name: str) -> tuple[_Resident, list[tuple[str, _Resident]]]:
+        # Called with the lock held: admits ``name`` and marks the models to
+        # evict for it, leaving the slow work to ``_load`` and ``_unload``.
+        size_mb = self._estimate_size_mb(name, self._local_models.get(name))
+        victims = []
+        if self._memory_budget_mb > 0:
+            for candidate, resident in self._resident.items():
+                if self._committed_mb() + size_mb <= self._memory_budget_mb:
+                    break
+                if self._evictable(candidate, resident):
+                    resident.evicting = threading.Event()
+                    victims.append((candidate, resident))
+            if self._committed_mb() + size_mb > self._memory_budget_mb:
+                logger.warning(
+                    "Loading model '%s' exceeds the %.0f MB ASR memory budget",
+                    name,
+                    self._memory_budget_mb,
+                )
+        resident = _Resident(size_mb, time.monotonic())
+        self._resident[name] = resident
+        ASR_RESIDENT_MODELS.set(len(self._resident))
+        return resident, victims
+
+    def _load(self, name: str, resident: _Resident) -> None:
+        local_path = self._local_models.get(name)
+        try:
+            service = self._factory(name, str(local_path) if local_path else None)
+        except BaseException as exc:
+            with self._lock:
+                if self._resident.get(name) is resident:
+                    del self._resident[name]
+                    ASR_RESIDENT_MODELS.set(len(self._resident))
+            resident.loaded.set_exception(exc)
+            return
+        with self._lock:
+            resident.size_mb *= service.pool_size
+        resident.loaded.set_result(service)
+        logger.info("Registered ASR model '%s' (~%.0f MB)", name, resident.size_mb)
+
+    def _unload(self, victims: list[tuple[str, _Resident]]) -> list[str]:
+        evicted = []
+        for name, resident in victims:
+            try:
+                unloaded = resident.service.unload()
+            except Exception:  # noqa: BLE001
+                logger.exception("Unloading ASR model '%s' failed", name)
+                unloaded = False
+            with self._lock:
+                if unloaded:
+                    del self._resident[name]
+                    ASR_RESIDENT_MODELS.set(len(self._resident))
+                if resident.evicting is not None:
+                    resident.evicting.set()
+                    resident.evicting = None
+            if unloaded:
+                logger.info("Evicted ASR model '%s'", name)
+                evicted.append(name)
+        return evicted
+
+    def _evictable(self, name: str, resident: _Resident) -> bool:
+        return (
+            name not in self._pinned
+            and not resident.leases
+            and resident.evicting is None
+            and resident.loaded.done()
+        )
+
+    def _committed_mb(self) -> float:
+        # Models being evicted no longer count against the budget.
+        return sum(
+            resident.size_mb for resident in self._resident.values() if resident.evicting is None
+        )
+
+    @staticmethod
+    def _estimate_size_mb(name: str, local_path: Path | None) -> float:
+        if local_path is not None:
+            total = sum(path.stat().st_size for path in local_path.rglob("*") if path.is_file())
+            return total / (1024 * 1024)
+        return DEFAULT_MODEL_SIZES_MB.get(name.removeprefix("whisper-"), FALLBACK_MODEL_SIZE_MB)
+
+
+__all__ = ["ModelRegistry", "discover_local_models", "parse_model_routes"]
@@ -0,0 +1,225 @@
+"""Node-local inference daemon that owns the Whisper models.
+
+API workers and background workers talk to it through
+:class:`app.services.asr.client.InferenceClient` over a Unix socket, so the
+models (and the micro-batching in front of them) are loaded once per node
+instead of once per process.  Run it with::
+
+    python -m app.services.asr.server --socket /run/asr/inference.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+from typing import Any, Optional
+
+from app.services.asr.batching import BatchScheduler
+from app.services.asr.checkpoint import CheckpointStore, ChunkCheckpoint
+from app.services.asr.protocol import (
+    ProtocolError,
+    bytes_to_audio,
+    encode_message,
+    read_message_async,
+)
+from app.services.asr.registry import ModelRegistry
+from app.services.asr.timing import StageTimer
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class InferenceServer:
+    """Serve transcription requests for the models in ``registry``.
+
+    Requests for the default model go through ``scheduler`` when one is
+    given so concurrent callers from every worker process share batches.
+    Segment requests that name a checkpoint key record their chunks in
+    ``checkpoint_store``, so a retried job resumes on any client.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        socket_path: str,
+        *,
+        scheduler: Optional[BatchScheduler] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+    ) -> None:
+        self._registry = registry
+        self._socket_path = socket_path
+        self._scheduler = scheduler
+        self._checkpoint_store = checkpoint_store
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self._socket_path)
+        os.chmod(self._socket_path, 0o660)
+        logger.info("ASR inference server listening on %s", self._socket_path)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header, payload = await read_message_async(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                await self._dispatch(header, payload, writer)
+        except ProtocolError as exc:
+            logger.warning("Dropping inference client: %s", exc)
+            writer.write(encode_message({"ok": False, "error": str(exc)}))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(
+        self, header: dict[str, Any], payload: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        op = header.get("op")
+        try:
+            if op == "segments":
+                await self._stream_segments(header, payload, writer)
+                return
+            result = await self._call(op, header, payload)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Inference request '%s' failed", op)
+            writer.write(encode_message({"ok": False, "error": str(exc) or type(exc).__name__}))
+        else:
+            writer.write(encode_message({"ok": True, **result}))
+        await writer.drain()
+
+    async def _call(self, op: Any, header: dict[str, Any], payload: bytes) -> dict[str, Any]:
+        if op == "ping":
+            return {"model": self._registry.default_model}
+        # Leased so an idle-model reaper cannot evict it mid-request.
+        with self._registry.lease(header.get("model")) as service:
+            return await self._run(op, service, header, payload)
+
+    async def _run(
+        self, op: Any, service: Any, header: dict[str, Any], payload: bytes
+    ) -> dict[str, Any]:
+        if op == "describe":
+            return {"model": service.model_name, "cache_identity": service.cache_identity()}
+        if op == "stats":
+            return {"model": service.model_name, "stats": service.pool_stats()}
+
+        audio = bytes_to_audio(payload)
+        if op == "transcribe":
+            if self._scheduler is not None and service.model_name == self._default_service_name():
+                return {"transcript": await self._scheduler.run(audio)}
+            timer = StageTimer() if header.get("timed") else None
+            transcript = await asyncio.to_thread(service.transcribe, audio, timer=timer)
+            return {"transcript": transcript, "stages": timer.stages if timer else {}}
+        if op == "transcribe_segments":
+            timer = StageTimer() if header.get("timed") else None
+            checkpoint = None
+            if header.get("checkpoint") and self._checkpoint_store is not None:
+                checkpoint = ChunkCheckpoint(self._checkpoint_store, header["checkpoint"])
+            transcript, segments = await asyncio.to_thread(
+                service.transcribe_segments, audio, checkpoint=checkpoint, timer=timer
+            )
+            return {
+                "transcript": transcript,
+                "segments": segments,
+                "stages": timer.stages if timer else {},
+            }
+        if op == "words":
+            words = await asyncio.to_thread(
+                service.transcribe_words, audio, header.get("initial_prompt")
+            )
+            return {"words": [list(word) for word in words]}
+        raise ProtocolError("Unknown operation '%s'" % op)
+
+    async def _stream_segments(
+        self, header: dict[str, Any], payload: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        with self._registry.lease(header.get("model")) as service:
+            segments = service.iter_segments(bytes_to_audio(payload))
+            try:
+                while True:
+                    segment = await asyncio.to_thread(next, segments, _END)
+                    if segment is _END:
+                        break
+                    writer.write(encode_message({"ok": True, "segment": segment}))
+                    await writer.drain()
+            finally:
+                await asyncio.to_thread(segments.close)
+        writer.write(encode_message({"ok": True, "done": True}))
+
+    def _default_service_name(self) -> str:
+        return self._registry.get().model_name
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app import deps
+    from app.settings import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the node-local ASR inference server.")
+    parser.add_argument(
+        "--socket",
+        default=settings.ASR_INFERENCE_SOCKET or "/tmp/asr-inference.sock",
+        help="Unix socket path to listen on",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    registry = deps.get_model_registry()
+    service = registry.get()
+    scheduler = None
+    if settings.ASR_BATCH_ENABLED:
+        scheduler = BatchScheduler(
+            service.transcribe_many,
+            max_batch_size=settings.ASR_BATCH_MAX_SIZE,
+            max_wait_ms=settings.ASR_BATCH_MAX_WAIT_MS,
+        )
+    if settings.ASR_WARMUP_ENABLED:
+        timings = service.warm_up()
+        logger.info(
+            "ASR model '%s' warm (%s)",
+            service.model_name,
+            ", ".join("%s=%.2fs" % item for item in timings.items()),
+        )
+
+    server = InferenceServer(
+        registry,
+        args.socket,
+        scheduler=scheduler,
+        checkpoint_store=deps.get_checkpoint_store(settings),
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        if scheduler is not None:
+            scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["InferenceServer", "main"]
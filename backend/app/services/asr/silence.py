@@ -0,0 +1,137 @@
+"""Energy-based pre-pass that compresses silence before decoding."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.infra.telemetry import ASR_SILENCE_SKIPPED
+from app.utils.audio import SAMPLE_RATE
+
+# Frames quieter than this are silence regardless of the recording's level.
+ABSOLUTE_SILENCE_DB = -60.0
+# Percentile of frame energies taken as the speech level.  A high percentile
+# rather than the maximum, so a single click or cough cannot raise it.
+SPEECH_LEVEL_PERCENTILE = 95.0
+
+
+@dataclass(frozen=True)
+class OffsetMap:
+    """Map times in trimmed audio back to times in the original recording.
+
+    ``trimmed_starts`` and ``original_starts`` hold, in seconds, where each
+    kept piece begins in the trimmed and the original audio respectively.
+    """
+
+    trimmed_starts: np.ndarray
+    original_starts: np.ndarray
+
+    @classmethod
+    def identity(cls) -> "OffsetMap":
+        return cls(np.zeros(1), np.zeros(1))
+
+    def to_original(self, seconds: float) -> float:
+        index = max(int(np.searchsorted(self.trimmed_starts, seconds, side="right")) - 1, 0)
+        return float(self.original_starts[index] + (seconds - self.trimmed_starts[index]))
+
+
+@dataclass(frozen=True)
+class SilenceTrim:
+    audio: np.ndarray
+    offsets: OffsetMap
+    original_seconds: float
+    sampling_rate: int = SAMPLE_RATE
+
+    @classmethod
+    def untrimmed(cls, audio: np.ndarray, sampling_rate: int = SAMPLE_RATE) -> "SilenceTrim":
+        return cls(audio, OffsetMap.identity(), audio.size / sampling_rate, sampling_rate)
+
+    @property
+    def kept_seconds(self) -> float:
+        return self.audio.size / self.sampling_rate
+
+    @property
+    def skipped_ratio(self) -> float:
+        if self.original_seconds <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.kept_seconds / self.original_seconds)
+
+
+def frame_energy_db(audio: np.ndarray, frame_samples: int) -> np.ndarray:
+    """Return the mean power of each complete frame, in dBFS."""
+
+    count = audio.size // frame_samples
+    frames = np.asarray(audio[: count * frame_samples], dtype=np.float32).reshape(count, frame_samples)
+    power = np.einsum("ij,ij->i", frames, frames) / frame_samples
+    return 10.0 * np.log10(power + 1e-10)
+
+
+def trim_silence(
+    audio: np.ndarray,
+    *,
+    sampling_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    threshold_db: float = -35.0,
+    min_silence_ms: int = 600,
+    keep_silence_ms: int = 200,
+) -> SilenceTrim:
+    """Drop long silent stretches from ``audio``, keeping a short pad around speech.
+
+    A frame is silent when its energy is more than ``threshold_db`` below the
+    speech level (the :data:`SPEECH_LEVEL_PERCENTILE` percentile of frame
+    energies), or below :data:`ABSOLUTE_SILENCE_DB`.  Runs of silent
+    frames lasting at least ``min_silence_ms`` are cut down to
+    ``keep_silence_ms`` (half on each side of the neighbouring speech);
+    leading and trailing room noise is cut down to one half-pad.  The
+    returned :class:`OffsetMap` converts timestamps decoded from the trimmed
+    audio back to the original recording.
+    """
+
+    original_seconds = audio.size / sampling_rate
+    frame_samples = max(int(sampling_rate * frame_ms / 1000), 1)
+    if audio.size < frame_samples:
+        return SilenceTrim.untrimmed(audio, sampling_rate)
+
+    energy = frame_energy_db(audio, frame_samples)
+    speech_level = np.percentile(energy, SPEECH_LEVEL_PERCENTILE)
+    silent = (energy < speech_level + threshold_db) | (energy < ABSOLUTE_SILENCE_DB)
+
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1) * frame_samples
+    run_ends = np.flatnonzero(edges == -1) * frame_samples
+    # The partial frame at the end belongs to whatever run reaches it.
+    run_ends[run_ends >= energy.size * frame_samples] = audio.size
+
+    long_runs = run_ends - run_starts >= int(sampling_rate * min_silence_ms / 1000)
+    run_starts, run_ends = run_starts[long_runs], run_ends[long_runs]
+    pad = int(sampling_rate * keep_silence_ms / 2000)
+    cut_starts = np.where(run_starts > 0, run_starts + pad, 0)
+    cut_ends = np.where(run_ends < audio.size, run_ends - pad, audio.size)
+    valid = cut_ends > cut_starts
+    cut_starts, cut_ends = cut_starts[valid], cut_ends[valid]
+    if cut_starts.size == 0:
+        return SilenceTrim.untrimmed(audio, sampling_rate)
+
+    keep_starts = np.concatenate(([0], cut_ends))
+    keep_ends = np.concatenate((cut_starts, [audio.size]))
+    nonempty = keep_ends > keep_starts
+    keep_starts, keep_ends = keep_starts[nonempty], keep_ends[nonempty]
+    if keep_starts.size == 0:
+        ASR_SILENCE_SKIPPED.observe(1.0)
+        return SilenceTrim(
+            np.zeros(0, dtype=np.float32), OffsetMap.identity(), original_seconds, sampling_rate
+        )
+
+    lengths = keep_ends - keep_starts
+    trimmed_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    trimmed = np.concatenate([audio[start:end] for start, end in zip(keep_starts, keep_ends)])
+    offsets = OffsetMap(trimmed_starts / sampling_rate, keep_starts / sampling_rate)
+    result = SilenceTrim(
+        trimmed.astype(np.float32, copy=False), offsets, original_seconds, sampling_rate
+    )
+    ASR_SILENCE_SKIPPED.observe(result.skipped_ratio)
+    return result
+
+
+__all__ = ["OffsetMap", "SilenceTrim", "frame_energy_db", "trim_silence"]
@@ -0,0 +1,232 @@
+"""Incremental transcription of live audio streams."""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.utils.audio import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+_WORD_NORMALISER = re.compile(r"[^\w']+")
+
+SUPPORTED_FORMATS = ("pcm_s16le", "f32le", "opus")
+
+
+class TimedWord(NamedTuple):
+    start: float
+    end: float
+    text: str
+
+
+DecodeFn = Callable[[np.ndarray, Optional[str]], Sequence[TimedWord]]
+
+
+class AudioFrameDecoder:
+    """Turn client audio frames into 16 kHz mono float32 samples.
+
+    ``pcm_s16le`` and ``f32le`` frames must already be mono at
+    ``sample_rate``.  ``opus`` frames are raw Opus packets (as produced by
+    WebCodecs' ``AudioEncoder``) and are decoded and resampled with PyAV.
+    """
+
+    def __init__(self, audio_format: str = "pcm_s16le", sample_rate: int = SAMPLE_RATE) -> None:
+        if audio_format not in SUPPORTED_FORMATS:
+            raise ValueError(
+                "Unsupported stream format '%s'. Supported formats are: %s"
+                % (audio_format, ", ".join(SUPPORTED_FORMATS))
+            )
+        if audio_format != "opus" and sample_rate != SAMPLE_RATE:
+            raise ValueError("PCM streams must be sampled at %d Hz" % SAMPLE_RATE)
+        self._format = audio_format
+        self._codec = None
+        self._resampler = None
+        if audio_format == "opus":
+            import av
+
+            self._codec = av.CodecContext.create("opus", "r")
+            self._codec.sample_rate = sample_rate
+            self._codec.layout = "mono"
+            self._resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+
+    def decode(self, frame: bytes) -> np.ndarray:
+        if self._format == "pcm_s16le":
+            usable = len(frame) - len(frame) % 2
+            return np.frombuffer(frame[:usable], dtype="<i2").astype(np.float32) / 32768.0
+        if self._format == "f32le":
+            usable = len(frame) - len(frame) % 4
+            return np.frombuffer(frame[:usable], dtype="<f4").astype(np.float32)
+
+        import av
+
+        samples = []
+        for decoded in self._codec.decode(av.Packet(frame)):
+            for resampled in self._resampler.resample(decoded):
+                samples.append(resampled.to_ndarray().reshape(-1))
+        if not samples:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(samples).astype(np.float32, copy=False)
+
+
+@dataclass
+class StreamEvent:
+    type: str
+    text: str
+    start: float | None = None
+    end: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"type": self.type, "text": self.text}
+        if self.start is not None:
+            payload["start"] = round(self.start, 3)
+        if self.end is not None:
+            payload["end"] = round(self.end, 3)
+        return payload
+
+
+def _normalise(word: str) -> str:
+    return _WORD_NORMALISER.sub("", word.lower())
+
+
+class StreamingTranscriber:
+    """Rolling-buffer transcription of one live audio stream.
+
+    Audio is appended to a buffer that starts where the last committed word
+    ended.  Each decode re-transcribes only that buffer; words on which two
+    consecutive hypotheses agree are committed and cut from the buffer, the
+    rest is reported as a partial hypothesis.  When the buffer grows past
+    ``max_buffer_seconds`` without agreement the current hypothesis is
+    committed so memory and decode cost stay bounded.
+    """
+
+    def __init__(
+        self,
+        decode_fn: DecodeFn,
+        *,
+        min_chunk_seconds: float = 1.0,
+        max_buffer_seconds: float = 15.0,
+        prompt_words: int = 30,
+    ) -> None:
+        self._decode_fn = decode_fn
+        self._min_chunk_samples = int(min_chunk_seconds * SAMPLE_RATE)
+        self._max_buffer_samples = int(max_buffer_seconds * SAMPLE_RATE)
+        self._prompt_words = prompt_words
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_offset = 0.0
+        self._undecoded_samples = 0
+        self._previous: list[TimedWord] = []
+        self._committed: list[TimedWord] = []
+        self._lock = threading.Lock()
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Seconds of audio waiting in the buffer, committed or not."""
+
+        return self._buffer.size / SAMPLE_RATE
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough new audio has arrived to justify another decode."""
+
+        return self._undecoded_samples >= self._min_chunk_samples
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(word.text for word in self._committed)
+
+    def append(self, samples: np.ndarray) -> None:
+        if samples.size == 0:
+            return
+        with self._lock:
+            self._buffer = np.concatenate([self._buffer, samples])
+            self._undecoded_samples += samples.size
+
+    def process(self) -> list[StreamEvent]:
+        """Decode the unstable tail and return the resulting events."""
+
+        with self._lock:
+            if self._buffer.size == 0:
+                return []
+            self._undecoded_samples = 0
+            audio = self._buffer
+        hypothesis = self._decode(audio)
+
+        agreed = 0
+        for current, previous in zip(hypothesis, self._previous):
+            if _normalise(current.text) != _normalise(previous.text):
+                break
+            agreed += 1
+
+        force_commit = audio.size > self._max_buffer_samples
+        stable = hypothesis if force_commit else hypothesis[:agreed]
+        pending = [] if force_commit else hypothesis[agreed:]
+
+        events: list[StreamEvent] = []
+        if stable:
+            events.append(self._commit(stable))
+            cut_at = stable[-1].end
+        elif force_commit:
+            cut_at = self._buffer_offset + audio.size / SAMPLE_RATE
+        else:
+            cut_at = None
+        if cut_at is not None:
+            self._trim(cut_at)
+        self._previous = pending
+        events.append(StreamEvent("partial", " ".join(word.text for word in pending)))
+        return events
+
+    def flush(self) -> list[StreamEvent]:
+        """Commit whatever is left at the end of the stream."""
+
+        with self._lock:
+            audio = self._buffer
+            self._buffer = np.zeros(0, dtype=np.float32)
+            self._undecoded_samples = 0
+        if audio.size == 0:
+            return []
+        hypothesis = self._decode(audio)
+        self._previous = []
+        if not hypothesis:
+            return []
+        return [self._commit(hypothesis)]
+
+    def _decode(self, audio: np.ndarray) -> list[TimedWord]:
+        prompt_source = self._committed[-self._prompt_words :] if self._prompt_words else []
+        prompt = " ".join(word.text for word in prompt_source) or None
+        words = self._decode_fn(audio, prompt)
+        return [
+            TimedWord(word.start + self._buffer_offset, word.end + self._buffer_offset, word.text.strip())
+            for word in words
+            if word.text.strip()
+        ]
+
+    def _commit(self, words: list[TimedWord]) -> StreamEvent:
+        self._committed.extend(words)
+        return StreamEvent(
+            "committed",
+            " ".join(word.text for word in words),
+            start=words[0].start,
+            end=words[-1].end,
+        )
+
+    def _trim(self, until: float) -> None:
+        with self._lock:
+            cut = int(round((until - self._buffer_offset) * SAMPLE_RATE))
+            cut = max(0, min(cut, self._buffer.size))
+            self._buffer = self._buffer[cut:]
+            self._buffer_offset += cut / SAMPLE_RATE
+
+
+__all__ = [
+    "SUPPORTED_FORMATS",
+    "AudioFrameDecoder",
+    "StreamEvent",
+    "StreamingTranscriber",
+    "TimedWord",
+]
@@ -0,0 +1,78 @@
+"""Per-stage timing of the transcription hot path."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.infra.telemetry import ASR_STAGE_SECONDS
+
+# Upper bounds (seconds of audio) of the duration buckets used as a label.
+_DURATION_BUCKETS = ((15, "lt_15s"), (60, "15s_1m"), (300, "1m_5m"), (1200, "5m_20m"))
+
+
+def duration_bucket(audio_seconds: float) -> str:
+    for limit, label in _DURATION_BUCKETS:
+        if audio_seconds < limit:
+            return label
+    return "gte_20m"
+
+
+class StageTimer:
+    """Accumulate wall-clock seconds per named stage of one request.
+
+    Stages may be recorded from several threads (for example parallel
+    chunks), in which case their times are summed.  Stage names keep the
+    order in which they were first recorded.
+    """
+
+    def __init__(self) -> None:
+        self._stages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stages(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._stages)
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started_at)
+
+    def as_milliseconds(self) -> dict[str, float]:
+        return {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Render the stages as a ``Server-Timing`` header value."""
+
+        return ", ".join(
+            "%s;dur=%.1f" % (stage, milliseconds)
+            for stage, milliseconds in self.as_milliseconds().items()
+        )
+
+    def observe(self, model: str, audio_seconds: float) -> None:
+        bucket = duration_bucket(audio_seconds)
+        for stage, seconds in self.stages.items():
+            ASR_STAGE_SECONDS.labels(stage=stage, model=model, duration_bucket=bucket).observe(seconds)
+
+
+@contextmanager
+def optional_stage(timer: Optional[StageTimer], name: str) -> Iterator[None]:
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+__all__ = ["StageTimer", "duration_bucket", "optional_stage"]
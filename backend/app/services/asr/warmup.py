@@ -0,0 +1,93 @@
+"""Startup warm-up of ASR models and the readiness state it drives."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Mapping, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.infra.telemetry import ASR_COLD_START
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupStatus(str, Enum):
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+    DISABLED = "disabled"
+
+
+@dataclass
+class WarmupState:
+    status: WarmupStatus = WarmupStatus.PENDING
+    started_at: Optional[float] = None
+    cold_start_seconds: Optional[float] = None
+    timings: dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in (WarmupStatus.READY, WarmupStatus.DISABLED)
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"status": self.status.value}
+        if self.cold_start_seconds is not None:
+            payload["cold_start_seconds"] = round(self.cold_start_seconds, 3)
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+warmup_state = WarmupState()
+
+
+async def warm_up(
+    model_name: str,
+    warm_fn: Callable[[], dict[str, float]],
+    state: WarmupState = warmup_state,
+    *,
+    routed: Optional[Mapping[str, Callable[[], dict[str, float]]]] = None,
+) -> None:
+    """Run ``warm_fn`` off the event loop and record the outcome in ``state``.
+
+    The models in ``routed`` (name to warm-up function) are warmed after
+    it, and ``state`` only turns ready once every one of them is warm.
+    ``state.timings`` holds the phase timings of ``model_name``.
+    """
+
+    state.status = WarmupStatus.WARMING
+    state.started_at = time.perf_counter()
+    for index, (name, fn) in enumerate([(model_name, warm_fn), *(routed or {}).items()]):
+        logger.info("Warming up ASR model '%s'", name)
+        started = time.perf_counter()
+        try:
+            timings = await run_in_threadpool(fn)
+        except Exception as exc:  # noqa: BLE001
+            state.status = WarmupStatus.FAILED
+            state.error = str(exc)
+            logger.exception("ASR warm-up failed for model '%s'", name)
+            return
+        elapsed = time.perf_counter() - started
+        if index == 0:
+            state.timings = timings
+        for phase, seconds in timings.items():
+            ASR_COLD_START.labels(model=name, phase=phase).set(seconds)
+        ASR_COLD_START.labels(model=name, phase="total").set(elapsed)
+        logger.info(
+            "ASR model '%s' warm in %.2fs (%s)",
+            name,
+            elapsed,
+            ", ".join("%s=%.2fs" % item for item in timings.items()),
+        )
+
+    state.cold_start_seconds = time.perf_counter() - state.started_at
+    state.status = WarmupStatus.READY
+
+
+__all__ = ["WarmupState", "WarmupStatus", "warm_up", "warmup_state"]
@@ -2,19 +2,43 @@
 
 from __future__ import annotations
 
+import functools
+import json
 import logging
 import threading
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
 
+import numpy as np
 from faster_whisper import WhisperModel
 
+from app.services.asr.checkpoint import ChunkCheckpoint
+from app.services.asr.executor import EXECUTOR_BACKENDS, ProcessPoolTranscriber
+from app.services.asr.pool import ModelPool, cpu_slices, run_pinned
+from app.services.asr.streaming import TimedWord
+from app.services.asr.timing import StageTimer, optional_stage
+from app.utils.audio import SAMPLE_RATE, AudioChunk, AudioInput, load_audio, split_audio, stitch_transcripts
+
 AVAILABLE_MODELS = {
     "tiny",
     "tiny.en",
+    "base",
+    "base.en",
+    "small",
+    "small.en",
+    "medium",
+    "medium.en",
+    "large-v2",
+    "large-v3",
 }
 
 logger = logging.getLogger(__name__)
 
+# Per-thread accumulator the instrumented encoder adds its time to while a
+# timed decode is running on that thread.
+_encoder_time = threading.local()
+
 
 class WhisperService:
     """Thin wrapper around the Whisper model to provide cached inference."""
@@ -23,15 +47,73 @@ class WhisperService:
         self,
         model_name: str,
         *,
+        model_path: str | None = None,
         device: str | None = None,
         compute_type: str | None = None,
+        pool_size: int = 1,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int | None = None,
+        pin_cpu_threads: bool = False,
+        chunking_enabled: bool = True,
+        chunk_min_audio_seconds: float = 60.0,
+        chunk_max_seconds: float = 30.0,
+        chunk_overlap_seconds: float = 1.0,
+        chunk_workers: int = 0,
+        executor: str = "thread",
+        process_workers: int = 1,
     ) -> None:
+        if executor not in EXECUTOR_BACKENDS:
+            raise ValueError(
+                "Unknown ASR executor '%s'; expected one of: %s"
+                % (executor, ", ".join(EXECUTOR_BACKENDS))
+            )
         self._configured_model_name = model_name
-        self._model_name = self._resolve_model_name(model_name)
-        self._model_lock = threading.Lock()
+        # Models loaded from a local directory are addressed by their own name.
+        self._model_name = model_name if model_path else self._resolve_model_name(model_name)
+        self._model_path = model_path
         self._device = device or "auto"
         self._compute_type = compute_type or "int8"
-        self._model: Optional[WhisperModel] = None
+        self._cpu_threads = cpu_threads
+        self._num_workers = max(num_workers, 1)
+        # ``None`` keeps faster-whisper's own default beam width.
+        self._beam_size = beam_size
+        self._cpu_affinity = (
+            cpu_slices(pool_size, cpu_threads) if pin_cpu_threads else [None] * pool_size
+        )
+        self._pool: ModelPool[WhisperModel] = ModelPool(
+            self._load_model,
+            size=pool_size,
+            slots_per_instance=self._num_workers,
+            name=self._model_name,
+        )
+        self._chunking_enabled = chunking_enabled
+        self._chunk_min_audio_seconds = chunk_min_audio_seconds
+        self._chunk_max_seconds = chunk_max_seconds
+        self._chunk_overlap_seconds = chunk_overlap_seconds
+        self._chunk_workers = chunk_workers or self._pool.capacity
+        self._executor = executor
+        self._process_pool: ProcessPoolTranscriber | None = None
+        if executor == "process":
+            # Each child builds its own single-instance, thread-backed service.
+            # Long recordings are chunked here and the chunks spread across
+            # the children, so the children never chunk themselves.
+            self._process_pool = ProcessPoolTranscriber(
+                functools.partial(
+                    WhisperService,
+                    model_name,
+                    model_path=model_path,
+                    device=device,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                    beam_size=beam_size,
+                    chunking_enabled=False,
+                ),
+                workers=process_workers,
+                name=self._model_name,
+            )
+            self._chunk_workers = chunk_workers or process_workers
 
     @staticmethod
     def _resolve_model_name(model_name: str) -> str:
@@ -73,43 +155,480 @@ class WhisperService:
             % (model_name, ", ".join(sorted(available_models)))
         )
 
-    def _get_model(self) -> WhisperModel:
-        if self._model is None:
-            with self._model_lock:
-                if self._model is None:
-                    if self._configured_model_name == self._model_name:
-                        logger.info("Loading Whisper model '%s'", self._model_name)
-                    else:
-                        logger.info(
-                            "Loading Whisper model '%s' (configured as '%s')",
-                            self._model_name,
-                            self._configured_model_name,
-                        )
-                    self._model = WhisperModel(
-                        self._model_name,
-                        device=self._device,
-                        compute_type=self._compute_type,
-                    )
-        return self._model
-
-    def transcribe(self, audio_path: str) -> str:
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    def cache_identity(self) -> dict[str, Any]:
+        """Return the settings that affect transcript output, for cache keys."""
+
+        return {
+            "model": self._model_name,
+            "compute_type": self._compute_type,
+            "beam_size": self._beam_size,
+            "chunking": self._chunking_enabled,
+            "chunk_min_audio_seconds": self._chunk_min_audio_seconds,
+            "chunk_max_seconds": self._chunk_max_seconds,
+            "chunk_overlap_seconds": self._chunk_overlap_seconds,
+        }
+
+    @property
+    def pool_size(self) -> int:
+        """Number of model copies this service may hold in memory."""
+
+        if self._process_pool is not None:
+            return self._process_pool.workers
+        return self._pool.size
+
+    @property
+    def executor(self) -> str:
+        return self._executor
+
+    @property
+    def in_use(self) -> bool:
+        if self._process_pool is not None and self._process_pool.in_flight > 0:
+            return True
+        return self._pool.stats()["in_use"] > 0
+
+    def unload(self) -> bool:
+        """Release the loaded models unless a request is using one."""
+
+        unloaded = self._pool.clear()
+        if unloaded and self._process_pool is not None:
+            unloaded = self._process_pool.shutdown_if_idle()
+        if unloaded:
+            logger.info("Unloaded Whisper model '%s'", self._model_name)
+        return unloaded
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Return utilisation counters for the underlying model pool."""
+
+        stats = self._pool.stats()
+        stats["executor"] = self._executor
+        if self._process_pool is not None:
+            stats["process_workers"] = self._process_pool.workers
+            stats["process_restarts"] = self._process_pool.restarts
+            stats["process_in_flight"] = self._process_pool.in_flight
+        return stats
+
+    def warm_up(self) -> dict[str, float]:
+        """Load every pooled model and run a synthetic decode on each.
+
+        The first decode on a fresh model pays one-off allocator and kernel
+        initialisation costs; doing it here keeps them out of user requests.
+        Returns the seconds spent loading and decoding.  With the process
+        executor each worker warms itself up as it starts.
+        """
+
+        started_at = time.perf_counter()
+        if self._process_pool is not None:
+            self._process_pool.warm_up()
+            return {"load_seconds": time.perf_counter() - started_at}
+
+        self._pool.warm()
+        loaded_at = time.perf_counter()
+
+        # Low-level noise rather than silence so the decoder actually runs.
+        rng = np.random.default_rng(0)
+        sample = (rng.standard_normal(SAMPLE_RATE) * 0.01).astype(np.float32)
+        for model in self._pool.instances():
+            segments, _ = model.transcribe(sample, beam_size=1, language="en")
+            for _ in segments:
+                pass
+        finished_at = time.perf_counter()
+        return {
+            "load_seconds": loaded_at - started_at,
+            "first_decode_seconds": finished_at - loaded_at,
+        }
+
+    def _load_model(self, index: int) -> WhisperModel:
+        if self._configured_model_name == self._model_name:
+            logger.info("Loading Whisper model '%s'", self._model_name)
+        else:
+            logger.info(
+                "Loading Whisper model '%s' (configured as '%s')",
+                self._model_name,
+                self._configured_model_name,
+            )
+        cores = self._cpu_affinity[index]
+        if cores:
+            logger.info("Pinning Whisper instance %d to CPUs %s", index, sorted(cores))
+        cpu_threads = self._cpu_threads or (len(cores) if cores else 0)
+        model = run_pinned(
+            lambda: WhisperModel(
+                self._model_path or self._model_name,
+                device=self._device,
+                compute_type=self._compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=self._num_workers,
+            ),
+            cores,
+        )
+        return _instrument_encoder(model)
+
+    def transcribe(
+        self,
+        audio_path: AudioInput,
+        *,
+        checkpoint: ChunkCheckpoint | None = None,
+        timer: StageTimer | None = None,
+    ) -> str:
         """Transcribe an audio file located at ``audio_path``.
 
         Parameters
         ----------
         audio_path:
-            Path to the audio file to be transcribed.
+            Path to the audio file to be transcribed, or an already decoded
+            16 kHz mono waveform.
+        checkpoint:
+            Where to record finished chunks of a long recording so a retry
+            resumes after the last one.  Ignored for short recordings.
+        timer:
+            Receives the time spent in VAD chunking, language detection
+            (including feature extraction), the encoder and the decoder.
+            Stages of parallel chunks are summed.
 
         Returns
         -------
         str
-            The transcription text returned by Whisper.
+            The transcription text returned by Whisper.  Recordings longer
+            than the chunking threshold are transcribed in parallel chunks.
+        """
+
+        audio = load_audio(audio_path)
+        if self._should_chunk(audio):
+            return self.transcribe_chunked(audio, checkpoint=checkpoint, timer=timer)
+        if self._process_pool is not None:
+            return self._process_pool.call("transcribe", audio, timer=timer)
+        with self._pool.checkout() as model:
+            return self._transcribe_with_model(model, audio, timer)
+
+    def iter_segments(self, audio_path: AudioInput) -> Iterator[dict[str, Any]]:
+        """Yield segments as Whisper decodes them instead of waiting for the end.
+
+        Each item holds the segment ``text``, its ``start`` and ``end`` in
+        seconds and the decoder's ``avg_logprob``.  The model stays checked
+        out until the generator is exhausted or closed.  With the process
+        executor the segments arrive together once a worker has decoded the
+        whole buffer.
         """
 
-        model = self._get_model()
-        logger.debug("Starting Whisper transcription for file: %s", audio_path)
-        segments, _ = model.transcribe(audio_path)
-        text = " ".join(segment.text for segment in segments).strip()
-        logger.debug("Completed Whisper transcription for file: %s", audio_path)
-        return text
+        audio = load_audio(audio_path)
+        if self._process_pool is not None:
+            yield from self._process_pool.call("iter_segments", audio)
+            return
+        with self._pool.checkout() as model:
+            segments, _ = model.transcribe(audio, **self._decode_options())
+            for segment in segments:
+                yield {
+                    "text": segment.text.strip(),
+                    "start": round(segment.start, 3),
+                    "end": round(segment.end, 3),
+                    "avg_logprob": segment.avg_logprob,
+                }
+
+    def transcribe_chunked(
+        self,
+        audio_path: AudioInput,
+        *,
+        checkpoint: ChunkCheckpoint | None = None,
+        timer: StageTimer | None = None,
+    ) -> str:
+        """Split a long recording at silences and transcribe chunks in parallel.
+
+        Chunks are spread over the model pool (or the worker processes) and
+        the chunk texts are joined in order with words duplicated by the
+        chunk overlap removed.  With a ``checkpoint``, chunks finished by an
+        earlier attempt are reused and every new chunk is recorded as soon as
+        it is done.
+        """
+
+        results = self._transcribe_chunks(audio_path, checkpoint, timer)
+        return stitch_transcripts([_join_segments(segments) for _, segments in results])
+
+    def transcribe_segments(
+        self,
+        audio_path: AudioInput,
+        *,
+        checkpoint: ChunkCheckpoint | None = None,
+        timer: StageTimer | None = None,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Transcribe like :meth:`transcribe` and also return Whisper's timed segments.
+
+        Each segment holds its ``index``, its ``start`` and ``end`` in seconds
+        of the recording and its ``text``.  Segments of a chunked recording
+        are shifted by their chunk's offset; of those decoded twice in the
+        overlap of two chunks, only the copy nearer its chunk's middle is kept.
+        """
+
+        audio = load_audio(audio_path)
+        if not self._should_chunk(audio):
+            segments = self._decode_segments(audio, timer)
+            return _join_segments(segments), _numbered(segments)
+
+        results = self._transcribe_chunks(audio, checkpoint, timer)
+        transcript = stitch_transcripts([_join_segments(segments) for _, segments in results])
+        return transcript, _numbered(_merge_chunk_segments(results))
+
+    def _transcribe_chunks(
+        self,
+        audio_path: AudioInput,
+        checkpoint: ChunkCheckpoint | None,
+        timer: StageTimer | None,
+    ) -> list[tuple[AudioChunk, list[dict[str, Any]]]]:
+        with optional_stage(timer, "vad"):
+            chunks = split_audio(
+                audio_path,
+                max_chunk_seconds=self._chunk_max_seconds,
+                overlap_seconds=self._chunk_overlap_seconds,
+            )
+        if not chunks:
+            return []
+        done: dict[int, list[dict[str, Any]]] = {}
+        if checkpoint is not None:
+            # Chunks are checkpointed as their segments, in recording time.
+            stored = checkpoint.begin(
+                [(chunk.start, chunk.end) for chunk in chunks],
+                identity={**self.cache_identity(), "checkpoint": "segments"},
+            )
+            done.update((index, json.loads(value)) for index, value in stored.items())
+        pending = [chunk for chunk in chunks if chunk.index not in done]
+        logger.debug(
+            "Transcribing %d of %d chunks with %d workers",
+            len(pending),
+            len(chunks),
+            self._chunk_workers,
+        )
+
+        def transcribe_chunk(chunk: AudioChunk) -> list[dict[str, Any]]:
+            segments = [
+                {
+                    **segment,
+                    "start": round(segment["start"] + chunk.start, 3),
+                    "end": round(segment["end"] + chunk.start, 3),
+                }
+                for segment in self._decode_segments(chunk.audio, timer)
+            ]
+            if checkpoint is not None:
+                checkpoint.record(chunk.index, json.dumps(segments))
+            return segments
+
+        if len(pending) <= 1 or self._chunk_workers <= 1:
+            results = [transcribe_chunk(chunk) for chunk in pending]
+        else:
+            workers = min(self._chunk_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr-chunk") as executor:
+                results = list(executor.map(transcribe_chunk, pending))
+        done.update((chunk.index, segments) for chunk, segments in zip(pending, results))
+        return [(chunk, done[chunk.index]) for chunk in chunks]
+
+    def _decode_segments(
+        self, audio: np.ndarray, timer: StageTimer | None = None
+    ) -> list[dict[str, Any]]:
+        if self._process_pool is not None:
+            _, segments = self._process_pool.call("transcribe_segments", audio, timer=timer)
+            return [{key: segment[key] for key in ("start", "end", "text")} for segment in segments]
+        with self._pool.checkout() as model:
+            return self._segments_with_model(model, audio, timer)
+
+    def transcribe_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None
+    ) -> list[TimedWord]:
+        """Greedy-decode a short buffer and return word-level timestamps.
+
+        Used by live streaming, where first-token latency matters more than
+        the small accuracy gain of beam search.
+        """
+
+        if self._process_pool is not None:
+            return self._process_pool.call("transcribe_words", audio, initial_prompt)
+        with self._pool.checkout() as model:
+            segments, _ = model.transcribe(
+                audio,
+                beam_size=1,
+                word_timestamps=True,
+                initial_prompt=initial_prompt,
+                condition_on_previous_text=False,
+            )
+            return [
+                TimedWord(word.start, word.end, word.word)
+                for segment in segments
+                for word in (segment.words or [])
+            ]
+
+    def transcribe_many(self, audio_paths: list[AudioInput]) -> list[str | Exception]:
+        """Transcribe a batch of audio files against a single model checkout.
+
+        Parameters
+        ----------
+        audio_paths:
+            Paths of the audio files (or decoded waveforms) gathered into
+            one batch.
+
+        Returns
+        -------
+        list
+            One entry per input path, in order.  Files that failed to
+            transcribe yield the raised exception instead of a transcript so
+            the caller can report errors per request.  With a pool that can
+            serve several callers the batch is spread across it, and long
+            recordings always take the chunked path.
+        """
+
+        if self._process_pool is not None:
+            return self._transcribe_many_in_processes(audio_paths)
+
+        if self._pool.capacity > 1 and len(audio_paths) > 1:
+            workers = min(self._pool.capacity, len(audio_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self._transcribe_or_error, audio_paths))
+
+        results: list[str | Exception | None] = [None] * len(audio_paths)
+        long_recordings: list[tuple[int, np.ndarray]] = []
+        with self._pool.checkout() as model:
+            for index, audio_path in enumerate(audio_paths):
+                try:
+                    audio = load_audio(audio_path)
+                    if self._should_chunk(audio):
+                        long_recordings.append((index, audio))
+                        continue
+                    results[index] = self._transcribe_with_model(model, audio)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Whisper transcription failed for file: %s", audio_path)
+                    results[index] = exc
+        for index, audio in long_recordings:
+            results[index] = self._transcribe_or_error(audio)
+        return results  # type: ignore[return-value]
+
+    def _transcribe_many_in_processes(
+        self, audio_paths: list[AudioInput]
+    ) -> list[str | Exception]:
+        assert self._process_pool is not None
+        results: list[str | Exception] = []
+        decoded: list[tuple[int, np.ndarray]] = []
+        for index, audio_path in enumerate(audio_paths):
+            try:
+                decoded.append((index, load_audio(audio_path)))
+                results.append("")
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Whisper transcription failed for file: %s", _describe(audio_path))
+                results.append(exc)
+        short = [(index, audio) for index, audio in decoded if not self._should_chunk(audio)]
+        transcripts = self._process_pool.transcribe_many([audio for _, audio in short])
+        for (index, _), transcript in zip(short, transcripts):
+            results[index] = transcript
+        for index, audio in decoded:
+            if self._should_chunk(audio):
+                results[index] = self._transcribe_or_error(audio)
+        return results
+
+    def _should_chunk(self, audio: np.ndarray) -> bool:
+        return (
+            self._chunking_enabled
+            and audio.size / SAMPLE_RATE > self._chunk_min_audio_seconds
+        )
+
+    def _transcribe_or_error(self, audio_path: AudioInput) -> str | Exception:
+        try:
+            return self.transcribe(audio_path)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Whisper transcription failed for file: %s", _describe(audio_path))
+            return exc
+
+    def _decode_options(self) -> dict[str, Any]:
+        return {} if self._beam_size is None else {"beam_size": self._beam_size}
+
+    def _transcribe_with_model(
+        self, model: WhisperModel, audio: AudioInput, timer: StageTimer | None = None
+    ) -> str:
+        return _join_segments(self._segments_with_model(model, audio, timer))
+
+    def _segments_with_model(
+        self, model: WhisperModel, audio: AudioInput, timer: StageTimer | None = None
+    ) -> list[dict[str, Any]]:
+        logger.debug("Starting Whisper transcription for file: %s", _describe(audio))
+        if timer is None:
+            segments, _ = model.transcribe(audio, **self._decode_options())
+            decoded = [_segment_dict(segment) for segment in segments]
+        else:
+            # ``transcribe`` computes the features and detects the language
+            # up front; encoding and decoding happen as segments are consumed.
+            with timer.stage("language_detection"):
+                segments, _ = model.transcribe(audio, **self._decode_options())
+            _encoder_time.seconds = 0.0
+            started_at = time.perf_counter()
+            try:
+                decoded = [_segment_dict(segment) for segment in segments]
+            finally:
+                encoder_seconds = _encoder_time.__dict__.pop("seconds", 0.0)
+            timer.add("encoder", encoder_seconds)
+            timer.add("decoder", time.perf_counter() - started_at - encoder_seconds)
+        logger.debug("Completed Whisper transcription for file: %s", _describe(audio))
+        return decoded
+
+
+def _segment_dict(segment: Any) -> dict[str, Any]:
+    return {
+        "start": round(segment.start, 3),
+        "end": round(segment.end, 3),
+        "text": segment.text.strip(),
+    }
+
+
+def _join_segments(segments: list[dict[str, Any]]) -> str:
+    return " ".join(segment["text"] for segment in segments if segment["text"])
+
+
+def _numbered(segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [{"index": index, **segment} for index, segment in enumerate(segments)]
+
+
+def _merge_chunk_segments(
+    results: list[tuple[AudioChunk, list[dict[str, Any]]]]
+) -> list[dict[str, Any]]:
+    """Concatenate chunk segments, keeping each overlap's segments only once.
+
+    Neighbouring chunks are cut at the middle of their overlap (or of the
+    gap between them); a segment belongs to the chunk its midpoint falls in.
+    """
+
+    merged: list[dict[str, Any]] = []
+    for position, (chunk, segments) in enumerate(results):
+        lower = (results[position - 1][0].end + chunk.start) / 2 if position else float("-inf")
+        upper = (
+            (chunk.end + results[position + 1][0].start) / 2
+            if position + 1 < len(results)
+            else float("inf")
+        )
+        merged.extend(
+            segment
+            for segment in segments
+            if lower <= (segment["start"] + segment["end"]) / 2 < upper
+        )
+    return merged
+
+
+def _instrument_encoder(model: WhisperModel) -> WhisperModel:
+    """Wrap ``model.encode`` so timed decodes can tell encoder from decoder time."""
+
+    encode = getattr(model, "encode", None)
+    if encode is None:
+        return model
+
+    def timed_encode(features: np.ndarray) -> Any:
+        if not hasattr(_encoder_time, "seconds"):
+            return encode(features)
+        started_at = time.perf_counter()
+        try:
+            return encode(features)
+        finally:
+            _encoder_time.seconds += time.perf_counter() - started_at
+
+    model.encode = timed_encode
+    return model
+
 
+def _describe(audio: AudioInput) -> str:
+    if isinstance(audio, np.ndarray):
+        return "<%.1fs of decoded audio>" % (audio.size / SAMPLE_RATE)
+    return str(audio)
@@ -0,0 +1,98 @@
+"""Weighted fair sharing of transcription work between tenants.
+
+A tenant's share is the audio-seconds it has outstanding (dispatched to the
+workers but not finished) divided by its weight.  Work is released to the
+least-served tenant first, so one user's bulk import only takes its
+weighted share of the workers while everybody else's jobs keep flowing.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Generic, Hashable, Iterable, Mapping, TypeVar
+
+DEFAULT_TENANT_KEY = "default"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FairShareItem(Generic[T]):
+    tenant: Hashable
+    cost: float
+    # Lower ranks are served first regardless of share (priority classes).
+    rank: int
+    item: T
+
+
+def parse_tenant_weights(value: str) -> dict[str, float]:
+    """Parse ``"user:12=4,user:7=0.5,default=1"`` into a mapping.
+
+    Weights must be positive; malformed or non-positive entries are ignored.
+    """
+
+    weights: dict[str, float] = {}
+    for entry in value.split(","):
+        key, separator, raw = entry.partition("=")
+        if not separator or not key.strip():
+            continue
+        try:
+            weight = float(raw)
+        except ValueError:
+            continue
+        if weight > 0:
+            weights[key.strip().lower()] = weight
+    return weights
+
+
+def tenant_weight(weights: Mapping[str, float], tenant: Hashable) -> float:
+    return weights.get(str(tenant).lower(), weights.get(DEFAULT_TENANT_KEY, 1.0))
+
+
+def fair_share_order(
+    items: Iterable[FairShareItem[T]],
+    outstanding: Mapping[Hashable, float],
+    weights: Mapping[str, float],
+    *,
+    limit: int | None = None,
+) -> list[T]:
+    """Order ``items`` by weighted fair share, at most ``limit`` of them.
+
+    ``items`` are in arrival order; each tenant's items are served by rank,
+    then in that order.  Repeatedly picks the head item of the tenant with
+    the lowest rank and then the lowest ``(outstanding + already picked
+    cost) / weight``; ties go to the tenant whose head item arrived first.
+    """
+
+    ranked = sorted(enumerate(items), key=lambda pair: (pair[1].rank, pair[0]))
+    queues: dict[Hashable, deque[tuple[int, FairShareItem[T]]]] = {}
+    for position, entry in ranked:
+        queues.setdefault(entry.tenant, deque()).append((position, entry))
+    loads = {tenant: float(outstanding.get(tenant, 0.0)) for tenant in queues}
+
+    ordered: list[T] = []
+    while queues and (limit is None or len(ordered) < limit):
+        tenant = min(
+            queues,
+            key=lambda key: (
+                queues[key][0][1].rank,
+                loads[key] / tenant_weight(weights, key),
+                queues[key][0][0],
+            ),
+        )
+        _, entry = queues[tenant].popleft()
+        if not queues[tenant]:
+            del queues[tenant]
+        loads[tenant] += entry.cost
+        ordered.append(entry.item)
+    return ordered
+
+
+__all__ = [
+    "DEFAULT_TENANT_KEY",
+    "FairShareItem",
+    "fair_share_order",
+    "parse_tenant_weights",
+    "tenant_weight",
+]
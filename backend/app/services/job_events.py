@@ -0,0 +1,175 @@
+"""Job status and progress events, published per user over Redis pub/sub.
+
+Workers publish an event whenever a job changes state or makes progress;
+the API process subscribes once and pushes every event to the websockets
+of the user it is addressed to (see :mod:`app.websocket.job_events`), so
+clients no longer need to poll ``/v1/jobs``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Iterable, Mapping, Optional, Protocol
+
+from app.domain import schemas
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "jobs:events:user:"
+
+Listener = Callable[[int, dict[str, Any]], None]
+
+
+def job_events_channel(user_id: int) -> str:
+    return "%s%d" % (CHANNEL_PREFIX, user_id)
+
+
+class JobEventBus(Protocol):
+    def publish(self, user_id: int, event: Mapping[str, Any]) -> None: ...
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]: ...
+
+
+class MemoryJobEventBus:
+    """Process-local bus, for development and tests.
+
+    Listeners are called synchronously from :meth:`publish`.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: list[Listener] = []
+        self._lock = threading.Lock()
+
+    def publish(self, user_id: int, event: Mapping[str, Any]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(user_id, dict(event))
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+
+class RedisJobEventBus:
+    """Publish events on one Redis channel per user.
+
+    A subscriber pattern-subscribes to every user's channel from a
+    background thread and hands each event to its listener.  Publishing
+    errors are logged and swallowed: a lost event only delays a client's
+    update until the next one, and must never fail the job.
+    """
+
+    def __init__(self, connection: Any, *, poll_seconds: float = 1.0) -> None:
+        self._connection = connection
+        self._poll_seconds = poll_seconds
+
+    def publish(self, user_id: int, event: Mapping[str, Any]) -> None:
+        try:
+            self._connection.publish(job_events_channel(user_id), json.dumps(dict(event)))
+        except Exception:  # noqa: BLE001
+            logger.warning("Publishing a job event for user %s failed", user_id, exc_info=True)
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        stop = threading.Event()
+        threading.Thread(
+            target=self._listen, args=(listener, stop), name="job-events", daemon=True
+        ).start()
+        return stop.set
+
+    def _listen(self, listener: Listener, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                pubsub = self._connection.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(CHANNEL_PREFIX + "*")
+                try:
+                    while not stop.is_set():
+                        message = pubsub.get_message(timeout=self._poll_seconds)
+                        if message is not None:
+                            self._dispatch(listener, message)
+                finally:
+                    pubsub.close()
+            except Exception:  # noqa: BLE001
+                logger.warning("Job event subscription failed; reconnecting", exc_info=True)
+                stop.wait(self._poll_seconds)
+
+    @staticmethod
+    def _dispatch(listener: Listener, message: Mapping[str, Any]) -> None:
+        channel = _text(message.get("channel"))
+        try:
+            user_id = int(channel[len(CHANNEL_PREFIX):])
+            event = json.loads(_text(message.get("data")))
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed job event on '%s'", channel)
+            return
+        listener(user_id, event)
+
+
+class JobEvents:
+    """Publish the events of one job to every user who can see it.
+
+    ``job`` events carry the whole serialized job after a state change and
+    replace the client's copy; ``progress`` events only report the stage
+    and percentage of a running job and may be dropped by slow clients.
+    """
+
+    def __init__(self, bus: JobEventBus, job_id: int, user_ids: Iterable[Optional[int]]) -> None:
+        self._bus = bus
+        self.job_id = job_id
+        self._user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+
+    @classmethod
+    def for_job(cls, bus: JobEventBus, job: Any) -> "JobEvents":
+        return cls(bus, job.id, (job.created_by_id, job.assignee_id))
+
+    def changed(self, job: Any) -> None:
+        self.publish(
+            {
+                "type": "job",
+                "status": job.status,
+                "job": schemas.JobRead.from_orm(job).model_dump(mode="json"),
+            }
+        )
+
+    def progress(self, stage: str, percent: Optional[float] = None) -> None:
+        self.publish(
+            {
+                "type": "progress",
+                "stage": stage,
+                "progress": None if percent is None else round(percent, 1),
+            }
+        )
+
+    def publish(self, event: Mapping[str, Any]) -> None:
+        event = {"job_id": self.job_id, "sent_at": datetime.utcnow().isoformat(), **event}
+        for user_id in self._user_ids:
+            self._bus.publish(user_id, event)
+
+
+def publish_job_changed(bus: JobEventBus, job: Any) -> None:
+    JobEvents.for_job(bus, job).changed(job)
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+__all__ = [
+    "CHANNEL_PREFIX",
+    "JobEventBus",
+    "JobEvents",
+    "MemoryJobEventBus",
+    "RedisJobEventBus",
+    "job_events_channel",
+    "publish_job_changed",
+]
@@ -1,10 +1,45 @@
+import json
+import logging
+import os
 from functools import lru_cache
+from typing import Any
 from urllib.parse import urlparse
 
-from pydantic import AnyUrl, Field
+from pydantic import AnyUrl, Field, TypeAdapter
 from pydantic_settings import BaseSettings
 
 
+logger = logging.getLogger(__name__)
+
+
+def load_profile(path: str) -> dict[str, Any]:
+    """Read a host tuning profile written by ``python -m benchmarks.asr.autotune``.
+
+    Returns the ``settings`` mapping of the profile.  Only ``ASR_*`` keys are
+    accepted so a profile can never change credentials or endpoints.
+    """
+
+    with open(path, encoding="utf-8") as handle:
+        profile = json.load(handle)
+    values = profile.get("settings")
+    if not isinstance(values, dict):
+        raise ValueError("ASR profile '%s' has no 'settings' mapping" % path)
+    unexpected = sorted(key for key in values if not key.startswith("ASR_"))
+    if unexpected:
+        raise ValueError(
+            "ASR profile '%s' may only set ASR_* settings, got: %s" % (path, ", ".join(unexpected))
+        )
+    profiled_cpus = profile.get("host", {}).get("cpu_count")
+    if profiled_cpus and profiled_cpus != os.cpu_count():
+        logger.warning(
+            "ASR profile '%s' was tuned on %s CPUs but this host has %s",
+            path,
+            profiled_cpus,
+            os.cpu_count(),
+        )
+    return values
+
+
 class Settings(BaseSettings):
     APP_NAME: str = "Medical Transcription API"
     ENV: str = Field(default="development")
@@ -43,9 +78,69 @@ class Settings(BaseSettings):
                 origins.add(localhost_variant)
         return sorted(origins)
 
+    JOB_HEARTBEAT_SECONDS: float = 30.0
+    JOB_HEARTBEAT_TIMEOUT_SECONDS: float = 180.0
+    JOB_REAPER_INTERVAL_SECONDS: float = 60.0
+    # Weighted fair sharing of transcription jobs between users; see
+    # app/workers/dispatch.py.  Weights look like "user:12=4,default=1".
+    JOB_FAIR_SCHEDULING_ENABLED: bool = True
+    JOB_DISPATCH_MAX_IN_FLIGHT: int = 16
+    JOB_TENANT_WEIGHTS: str = ""
+    JOB_DEFAULT_AUDIO_SECONDS: float = 300.0
+    # Dispatched jobs no worker claimed for this long (their enqueue was lost)
+    # are dispatched again.  Keep it above the longest retry backoff.
+    JOB_DISPATCH_CLAIM_TIMEOUT_SECONDS: float = 1800.0
+    # Job status/progress events pushed to /v1/jobs/events websockets.
+    JOB_EVENTS_MAX_CONNECTIONS: int = 2000
+    JOB_EVENTS_SEND_QUEUE: int = 32
+
     ASR_MODEL: str = "tiny"
     ASR_WHISPER_DEVICE: str | None = None
     ASR_WHISPER_COMPUTE_TYPE: str | None = None
+    ASR_MODEL_DIR: str | None = None
+    ASR_MODEL_ROUTES: str = ""
+    ASR_MODEL_MEMORY_BUDGET_MB: float = 0
+    ASR_MODEL_IDLE_SECONDS: float = 900
+    ASR_WARMUP_ENABLED: bool = True
+    ASR_MODEL_POOL_SIZE: int = 1
+    ASR_CPU_THREADS: int = 0
+    ASR_NUM_WORKERS: int = 1
+    ASR_BEAM_SIZE: int | None = None
+    ASR_PIN_CPU_THREADS: bool = False
+    ASR_CHUNKING_ENABLED: bool = True
+    ASR_CHUNK_MIN_AUDIO_SECONDS: float = 60.0
+    ASR_CHUNK_MAX_SECONDS: float = 30.0
+    ASR_CHUNK_OVERLAP_SECONDS: float = 1.0
+    ASR_CHUNK_WORKERS: int = 0
+    ASR_CHECKPOINT_TTL_SECONDS: int = 3 * 24 * 60 * 60
+    ASR_STREAM_MAX_CONNECTIONS: int = 500
+    ASR_STREAM_SEND_QUEUE: int = 64
+    ASR_STREAM_MIN_CHUNK_SECONDS: float = 1.0
+    ASR_STREAM_MAX_BUFFER_SECONDS: float = 15.0
+    ASR_DECODE_MEMMAP_THRESHOLD_MB: int = 256
+    ASR_SILENCE_TRIM_ENABLED: bool = True
+    ASR_SILENCE_THRESHOLD_DB: float = -35.0
+    ASR_SILENCE_MIN_MS: int = 600
+    ASR_SILENCE_KEEP_MS: int = 200
+    ASR_CACHE_ENABLED: bool = True
+    ASR_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    ASR_CACHE_REDIS_ENABLED: bool = True
+    ASR_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    # Off by default: faster-whisper 1.0.0 has no batched inference, so a
+    # batch still decodes item by item and batching only adds waiting.
+    ASR_BATCH_ENABLED: bool = False
+    ASR_BATCH_MAX_SIZE: int = 8
+    ASR_BATCH_MAX_WAIT_MS: float = 20.0
+    ASR_INFERENCE_SOCKET: str | None = None
+    ASR_EXECUTOR: str = "thread"
+    ASR_PROCESS_WORKERS: int = 1
+    ASR_ADMISSION_MAX_CONCURRENCY: int = 4
+    ASR_ADMISSION_MAX_QUEUE: int = 32
+    ASR_ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    # Extra waiting each priority class step is worth, so low classes age up.
+    ASR_PRIORITY_AGING_SECONDS: float = 10.0
+    # Tuned defaults for this host; explicit settings still take precedence.
+    ASR_PROFILE_PATH: str | None = None
 
     class Config:
         env_file = ".env"
@@ -58,6 +153,18 @@ class Settings(BaseSettings):
         if self.REFRESH_COOKIE_SECURE is None:
             secure_envs = {"production", "prod", "staging"}
             self.REFRESH_COOKIE_SECURE = self.ENV.lower() in secure_envs
+        if self.ASR_PROFILE_PATH:
+            self._apply_profile(self.ASR_PROFILE_PATH)
+
+    def _apply_profile(self, path: str) -> None:
+        fields = type(self).model_fields
+        for key, value in load_profile(path).items():
+            if key not in fields:
+                logger.warning("Ignoring unknown setting '%s' in ASR profile '%s'", key, path)
+                continue
+            if key in self.model_fields_set:
+                continue
+            setattr(self, key, TypeAdapter(fields[key].annotation).validate_python(value))
 
 @lru_cache
 def get_settings() -> Settings:
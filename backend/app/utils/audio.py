@@ -1,6 +1,233 @@
-"""TODO: Implement audio utilities for preprocessing."""
+"""Audio utilities for preprocessing recordings before inference."""
 
+from __future__ import annotations
 
-def split_audio(file_path: str):
-    raise NotImplementedError("TODO: Implement audio splitting utility")
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Sequence, Union
 
+import av
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+SAMPLE_RATE = 16000
+
+AudioInput = Union[str, BinaryIO, np.ndarray]
+
+_WORD_NORMALISER = re.compile(r"[^\w']+")
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """A slice of a recording, with times expressed in seconds of the original."""
+
+    index: int
+    start: float
+    end: float
+    audio: np.ndarray
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def load_audio(audio: AudioInput, sampling_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Return ``audio`` as a mono float32 waveform at ``sampling_rate``."""
+
+    if isinstance(audio, np.ndarray):
+        return audio.astype(np.float32, copy=False)
+    return decode_stream(audio, sampling_rate=sampling_rate)
+
+
+class _SampleSink:
+    """Collect decoded samples in memory, spilling to a memory-mapped file past a threshold."""
+
+    def __init__(self, memmap_threshold_bytes: int) -> None:
+        self._threshold = memmap_threshold_bytes
+        self._chunks: list[np.ndarray] = []
+        self._size = 0
+        self._file = None
+
+    def write(self, samples: np.ndarray) -> None:
+        if samples.size == 0:
+            return
+        self._size += samples.size
+        if self._file is None and self._threshold > 0 and self._size * 4 > self._threshold:
+            self._file = tempfile.TemporaryFile(suffix=".f32")
+            for chunk in self._chunks:
+                self._file.write(chunk.tobytes())
+            self._chunks = []
+        if self._file is not None:
+            self._file.write(samples.astype(np.float32, copy=False).tobytes())
+        else:
+            self._chunks.append(samples.astype(np.float32, copy=False))
+
+    def finish(self) -> np.ndarray:
+        if self._file is None:
+            if not self._chunks:
+                return np.zeros(0, dtype=np.float32)
+            return np.concatenate(self._chunks)
+        self._file.flush()
+        # The mapping stays valid after the (already unlinked) file is closed.
+        audio = np.memmap(self._file, dtype=np.float32, mode="r", shape=(self._size,))
+        self._file.close()
+        return audio
+
+
+def _decoded_frames(container) -> Iterator["av.AudioFrame"]:
+    frames = container.decode(audio=0)
+    while True:
+        try:
+            yield next(frames)
+        except StopIteration:
+            return
+        except av.error.InvalidDataError:
+            continue
+
+
+def decode_stream(
+    source: Union[str, BinaryIO],
+    *,
+    sampling_rate: int = SAMPLE_RATE,
+    memmap_threshold_bytes: int = 256 * 1024 * 1024,
+) -> np.ndarray:
+    """Decode an encoded audio stream straight into a float32 waveform.
+
+    Frames are resampled to mono ``sampling_rate`` float samples as they are
+    decoded, without an intermediate int16 copy.  Once the decoded audio
+    exceeds ``memmap_threshold_bytes`` it is written to an anonymous
+    temporary file and returned as a read-only memory map, which keeps
+    resident memory flat for very long recordings.  A threshold of ``0``
+    keeps everything in memory.
+    """
+
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=sampling_rate)
+    sink = _SampleSink(memmap_threshold_bytes)
+    with av.open(source, mode="r", metadata_errors="ignore") as container:
+        for frame in _decoded_frames(container):
+            for resampled in resampler.resample(frame):
+                sink.write(resampled.to_ndarray().reshape(-1))
+        for resampled in resampler.resample(None):
+            sink.write(resampled.to_ndarray().reshape(-1))
+    return sink.finish()
+
+
+def plan_chunks(
+    speech_regions: Sequence[tuple[int, int]],
+    total_samples: int,
+    max_chunk_samples: int,
+    overlap_samples: int = 0,
+) -> list[tuple[int, int]]:
+    """Group speech regions into chunks no longer than ``max_chunk_samples``.
+
+    Chunks are cut in the silence after the last speech region that still
+    fits, so words are rarely split.  Regions longer than the limit are cut
+    at the limit.  Every chunk is then widened by ``overlap_samples`` on both
+    sides (clamped to the recording) so boundary words appear in full in at
+    least one chunk.
+    """
+
+    if max_chunk_samples <= 0:
+        raise ValueError("max_chunk_samples must be positive")
+
+    bounds: list[tuple[int, int]] = []
+    chunk_start: int | None = None
+    chunk_end = 0
+    for region_start, region_end in speech_regions:
+        if chunk_start is not None and region_end - chunk_start > max_chunk_samples:
+            bounds.append((chunk_start, chunk_end))
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start = region_start
+            while region_end - chunk_start > max_chunk_samples:
+                bounds.append((chunk_start, chunk_start + max_chunk_samples))
+                chunk_start += max_chunk_samples
+        chunk_end = region_end
+    if chunk_start is not None and chunk_end > chunk_start:
+        bounds.append((chunk_start, chunk_end))
+
+    return [
+        (max(0, start - overlap_samples), min(total_samples, end + overlap_samples))
+        for start, end in bounds
+    ]
+
+
+def split_audio(
+    file_path: AudioInput,
+    *,
+    max_chunk_seconds: float = 30.0,
+    overlap_seconds: float = 1.0,
+    min_silence_ms: int = 500,
+    sampling_rate: int = SAMPLE_RATE,
+) -> list[AudioChunk]:
+    """Split a recording at silences into bounded, slightly overlapping chunks.
+
+    Voice activity detection locates the speech regions; stretches of silence
+    between chunks are dropped entirely.
+    """
+
+    audio = load_audio(file_path, sampling_rate)
+    if audio.size == 0:
+        return []
+
+    timestamps = get_speech_timestamps(
+        audio,
+        VadOptions(min_silence_duration_ms=min_silence_ms, speech_pad_ms=200),
+    )
+    regions = [(item["start"], item["end"]) for item in timestamps]
+    bounds = plan_chunks(
+        regions,
+        total_samples=audio.size,
+        max_chunk_samples=int(max_chunk_seconds * sampling_rate),
+        overlap_samples=int(overlap_seconds * sampling_rate),
+    )
+    return [
+        AudioChunk(
+            index=index,
+            start=start / sampling_rate,
+            end=end / sampling_rate,
+            audio=audio[start:end],
+        )
+        for index, (start, end) in enumerate(bounds)
+    ]
+
+
+def _normalise_word(word: str) -> str:
+    return _WORD_NORMALISER.sub("", word.lower())
+
+
+def stitch_transcripts(texts: Sequence[str], max_overlap_words: int = 12) -> str:
+    """Join chunk transcripts in order, dropping words repeated at the seams.
+
+    For each pair of neighbouring chunks the longest run of words (up to
+    ``max_overlap_words``) that ends the text so far and starts the next
+    chunk is treated as the overlap and kept only once.
+    """
+
+    words: list[str] = []
+    for text in texts:
+        incoming = text.split()
+        if not incoming:
+            continue
+        limit = min(max_overlap_words, len(words), len(incoming))
+        tail = [_normalise_word(word) for word in words[-limit:]] if limit else []
+        head = [_normalise_word(word) for word in incoming[:limit]]
+        overlap = 0
+        for size in range(limit, 0, -1):
+            if tail[-size:] == head[:size]:
+                overlap = size
+                break
+        words.extend(incoming[overlap:])
+    return " ".join(words)
+
+
+__all__ = [
+    "SAMPLE_RATE",
+    "AudioChunk",
+    "decode_stream",
+    "load_audio",
+    "plan_chunks",
+    "split_audio",
+    "stitch_transcripts",
+]
@@ -0,0 +1,66 @@
+"""Fan job events out from the event bus to the users' websockets."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from app.services.job_events import JobEventBus
+from app.websocket.manager import ConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+class JobEventRelay:
+    """Subscribe once per process and forward each event to its user's connections.
+
+    The bus may call back from its own thread, so events are handed to the
+    event loop with :meth:`~asyncio.AbstractEventLoop.call_soon_threadsafe`
+    and put straight into the connections' bounded send queues, never
+    waiting for room.  Progress events are droppable: a client that falls
+    behind skips to the next one.  A client whose queue has no room for a
+    status change is disconnected and resynchronises from the snapshot it
+    gets on reconnecting.
+    """
+
+    def __init__(self, bus: JobEventBus, manager: ConnectionManager) -> None:
+        self._bus = bus
+        self._manager = manager
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._unsubscribe is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Subscribe to the bus (once) and deliver events on ``loop``."""
+
+        self._loop = loop
+        if not self.running:
+            self._unsubscribe = self._bus.subscribe(self._on_event)
+
+    def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _on_event(self, user_id: int, event: dict[str, Any]) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, user_id, event)
+        except RuntimeError:
+            # The loop closed since the check above.
+            pass
+
+    def _deliver(self, user_id: int, event: dict[str, Any]) -> None:
+        try:
+            self._manager.offer_to_user(user_id, event, droppable=event.get("type") == "progress")
+        except Exception:  # noqa: BLE001
+            logger.warning("Forwarding a job event failed", exc_info=True)
+
+
+__all__ = ["JobEventRelay"]
@@ -1,12 +1,182 @@
-"""Placeholder for websocket manager to stream live audio."""
+"""Websocket connection management for real-time transcription."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionRejected(Exception):
+    """Raised when the manager cannot take another websocket connection."""
+
+
+class Connection:
+    """A single accepted websocket with a bounded outbound queue.
+
+    Messages are written by a dedicated sender task so a slow client never
+    blocks the code producing events.  When the queue is full, droppable
+    messages (superseded partial hypotheses) are discarded, while other
+    messages wait for space, applying backpressure to the producer.
+    Producers that must not wait use :meth:`offer` instead.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int) -> None:
+        self.websocket = websocket
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=max_queue)
+        self._sender: asyncio.Task | None = None
+        self.closed = False
+        self.dropped = 0
+        self.overflowed = False
+        self.user_id: int | None = None
+
+    def start(self) -> None:
+        self._sender = asyncio.create_task(self._send_loop())
+
+    async def send(self, message: dict[str, Any], *, droppable: bool = False) -> bool:
+        """Queue ``message`` for delivery; return ``False`` if it was dropped."""
+
+        if self.closed:
+            return False
+        if droppable and self._queue.full():
+            self.dropped += 1
+            return False
+        await self._queue.put(message)
+        return True
+
+    def offer(self, message: dict[str, Any], *, droppable: bool = False) -> bool:
+        """Queue ``message`` without waiting; return ``False`` if it was not queued.
+
+        A droppable message is discarded when the queue is full.  Any other
+        message that finds it full marks the connection ``overflowed`` and
+        discards everything queued: the client has fallen too far behind and
+        must be disconnected, to resynchronise when it reconnects.
+        """
+
+        if self.closed or self.overflowed:
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            if not droppable:
+                self.overflowed = True
+                self.dropped += self._queue.qsize()
+                self._drain()
+            self.dropped += 1
+            return False
+        return True
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._sender is not None:
+            await self._queue.put(None)
+            try:
+                await self._sender
+            except Exception:  # noqa: BLE001
+                logger.debug("Websocket sender finished with an error", exc_info=True)
+        try:
+            await self.websocket.close(code=code)
+        except RuntimeError:
+            # The socket was already closed by the client.
+            pass
+
+    async def _send_loop(self) -> None:
+        while True:
+            message = await self._queue.get()
+            if message is None:
+                return
+            try:
+                await self.websocket.send_json(message)
+            except (WebSocketDisconnect, RuntimeError):
+                self.closed = True
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        # Release producers blocked on a full queue once nobody is reading it.
+        while not self._queue.empty():
+            self._queue.get_nowait()
 
 
 class ConnectionManager:
-    """TODO: Implement websocket broadcast for real-time transcription."""
+    """Track live websocket connections and enforce connection limits."""
+
+    def __init__(self, max_connections: int = 500, max_queue: int = 64) -> None:
+        self.max_connections = max_connections
+        self.max_queue = max_queue
+        self.active_connections: set[Connection] = set()
+        self._user_connections: dict[int, set[Connection]] = {}
+        self._closing: set[asyncio.Task] = set()
+
+    async def connect(self, websocket: WebSocket, *, user_id: int | None = None) -> Connection:
+        """Accept ``websocket``; with ``user_id`` it also receives :meth:`send_to_user`."""
+
+        if len(self.active_connections) >= self.max_connections:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            raise ConnectionRejected("Too many concurrent websocket connections")
+        await websocket.accept()
+        connection = Connection(websocket, self.max_queue)
+        connection.start()
+        self.active_connections.add(connection)
+        if user_id is not None:
+            connection.user_id = user_id
+            self._user_connections.setdefault(user_id, set()).add(connection)
+        return connection
+
+    async def disconnect(
+        self, connection: Connection, code: int = status.WS_1000_NORMAL_CLOSURE
+    ) -> None:
+        self._forget(connection)
+        await connection.close(code)
+
+    async def broadcast(self, message: dict[str, Any], *, droppable: bool = False) -> None:
+        for connection in list(self.active_connections):
+            await connection.send(message, droppable=droppable)
+
+    async def send_to_user(
+        self, user_id: int, message: dict[str, Any], *, droppable: bool = False
+    ) -> int:
+        """Queue ``message`` on every connection of ``user_id``; return how many took it."""
+
+        delivered = 0
+        for connection in list(self._user_connections.get(user_id, ())):
+            delivered += await connection.send(message, droppable=droppable)
+        return delivered
+
+    def offer_to_user(
+        self, user_id: int, message: dict[str, Any], *, droppable: bool = False
+    ) -> int:
+        """Like :meth:`send_to_user`, but never waits for room in a queue.
+
+        Must run on the event loop.  Connections that overflow are closed
+        with ``1013`` so their clients reconnect and fetch a fresh snapshot.
+        """
+
+        delivered = 0
+        for connection in list(self._user_connections.get(user_id, ())):
+            if connection.offer(message, droppable=droppable):
+                delivered += 1
+            elif connection.overflowed:
+                logger.warning("Disconnecting a websocket of user %s that fell behind", user_id)
+                self._forget(connection)
+                task = asyncio.create_task(connection.close(status.WS_1013_TRY_AGAIN_LATER))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+        return delivered
 
-    def __init__(self) -> None:
-        self.active_connections = []
+    def _forget(self, connection: Connection) -> None:
+        self.active_connections.discard(connection)
+        if connection.user_id is not None:
+            connections = self._user_connections.get(connection.user_id, set())
+            connections.discard(connection)
+            if not connections:
+                self._user_connections.pop(connection.user_id, None)
 
-    async def connect(self, websocket):
-        raise NotImplementedError("TODO: Implement websocket connections")
 
+__all__ = ["Connection", "ConnectionManager", "ConnectionRejected"]
@@ -0,0 +1,178 @@
+"""Release transcription jobs to the workers by weighted fair share.
+
+Enqueueing every job as it is submitted lets one user's bulk import fill
+the queues ahead of everybody else.  With ``JOB_FAIR_SCHEDULING_ENABLED``
+new jobs wait in the database instead, and :func:`dispatch_pending` keeps
+at most ``JOB_DISPATCH_MAX_IN_FLIGHT`` jobs on the queues: whenever a job
+is submitted or settles, the free slots go to the tenants with the fewest
+outstanding audio-seconds per unit of weight (``JOB_TENANT_WEIGHTS``),
+most urgent priority class first.  A tenant is the user who submitted the
+job.  Queue depth and outstanding audio per tenant are exported as
+``job_tenant_queue_depth`` and ``job_tenant_audio_seconds``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from app.domain import repositories
+from app.domain.models import JobPriority
+from app.infra.broker import get_queue, priority_queue_name
+from app.infra.db import session_scope
+from app.infra.telemetry import JOB_TENANT_AUDIO_SECONDS, JOB_TENANT_QUEUE_DEPTH
+from app.services.fair_share import FairShareItem, fair_share_order, parse_tenant_weights
+from app.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# Enqueued by path: importing the task module here would be circular.
+TRANSCRIBE_TASK = "app.workers.tasks.transcribe_batch"
+
+PRIORITY_RANKS = {priority.value: rank for rank, priority in enumerate(JobPriority)}
+
+_reported_tenants: set[str] = set()
+_metrics_lock = threading.Lock()
+
+
+def tenant_key(user_id: int) -> str:
+    return "user:%d" % user_id
+
+
+def enqueue_transcription(job: Any) -> None:
+    get_queue(priority_queue_name(job.priority)).enqueue(
+        TRANSCRIBE_TASK,
+        job.id,
+        {"input_uri": job.input_uri, "priority": job.priority, "enqueued_at": time.time()},
+    )
+
+
+def dispatch_pending(
+    job_repo: repositories.JobRepository, settings: Optional[Settings] = None
+) -> list[int]:
+    """Enqueue waiting jobs into the free in-flight slots; return their ids."""
+
+    settings = settings or get_settings()
+    default_seconds = settings.JOB_DEFAULT_AUDIO_SECONDS
+    load = job_repo.dispatched_load(default_seconds)
+    # Plain values: committing the dispatch expires the loaded jobs.
+    waiting = [
+        FairShareItem(
+            tenant=tenant_key(job.created_by_id),
+            cost=job.audio_seconds or default_seconds,
+            rank=PRIORITY_RANKS.get(job.priority, len(PRIORITY_RANKS)),
+            item=job.id,
+        )
+        for job in job_repo.list_undispatched()
+    ]
+
+    free = settings.JOB_DISPATCH_MAX_IN_FLIGHT - sum(count for count, _ in load.values())
+    dispatched = []
+    if free > 0 and waiting:
+        chosen = fair_share_order(
+            waiting,
+            {tenant_key(user_id): seconds for user_id, (_, seconds) in load.items()},
+            parse_tenant_weights(settings.JOB_TENANT_WEIGHTS),
+            limit=free,
+        )
+        # Another dispatcher may have taken some of them meanwhile.
+        claimed = {job.id: job for job in job_repo.mark_dispatched(chosen)}
+        lost = []
+        for job_id in chosen:
+            if job_id not in claimed:
+                continue
+            try:
+                enqueue_transcription(claimed[job_id])
+            except Exception:  # noqa: BLE001
+                logger.exception("Enqueueing job %s failed; it goes back to waiting", job_id)
+                lost.append(job_id)
+            else:
+                dispatched.append(job_id)
+        # Give their slots back instead of counting them as running.
+        job_repo.release_dispatched(lost)
+
+    _report(waiting, set(dispatched), load)
+    if dispatched:
+        logger.info(
+            "Dispatched %d jobs, %d still waiting", len(dispatched), len(waiting) - len(dispatched)
+        )
+    return dispatched
+
+
+def dispatch_pending_jobs() -> list[int]:
+    """Run :func:`dispatch_pending` in its own session; errors are logged."""
+
+    if not get_settings().JOB_FAIR_SCHEDULING_ENABLED:
+        return []
+    try:
+        with session_scope() as session:
+            return dispatch_pending(repositories.JobRepository(session))
+    except Exception:  # noqa: BLE001
+        logger.exception("Dispatching pending jobs failed")
+        return []
+
+
+def release_unclaimed_jobs(now: Optional[datetime] = None) -> list[int]:
+    """Return dispatched jobs no worker claimed in time to waiting; errors are logged.
+
+    Covers enqueues lost after the dispatch was committed, e.g. by a
+    dispatcher that died in between.  Returns the released job ids.
+    """
+
+    settings = get_settings()
+    if not settings.JOB_FAIR_SCHEDULING_ENABLED:
+        return []
+    cutoff = (now or datetime.utcnow()) - timedelta(
+        seconds=settings.JOB_DISPATCH_CLAIM_TIMEOUT_SECONDS
+    )
+    try:
+        with session_scope() as session:
+            job_repo = repositories.JobRepository(session)
+            released = [job.id for job in job_repo.release_unclaimed(cutoff)]
+    except Exception:  # noqa: BLE001
+        logger.exception("Releasing unclaimed jobs failed")
+        return []
+    if released:
+        logger.warning("Released %d dispatched jobs no worker claimed: %s", len(released), released)
+    return released
+
+
+def _report(
+    waiting: list[FairShareItem[int]], dispatched: set[int], load: dict[int, tuple[int, float]]
+) -> None:
+    depth: Counter[str] = Counter()
+    queued_seconds: defaultdict[str, float] = defaultdict(float)
+    running_seconds = {tenant_key(user_id): seconds for user_id, (_, seconds) in load.items()}
+    for entry in waiting:
+        if entry.item in dispatched:
+            running_seconds[entry.tenant] = running_seconds.get(entry.tenant, 0.0) + entry.cost
+        else:
+            depth[entry.tenant] += 1
+            queued_seconds[entry.tenant] += entry.cost
+
+    tenants = set(depth) | set(running_seconds)
+    with _metrics_lock:
+        for tenant in tenants | _reported_tenants:
+            JOB_TENANT_QUEUE_DEPTH.labels(tenant=tenant).set(depth.get(tenant, 0))
+            JOB_TENANT_AUDIO_SECONDS.labels(tenant=tenant, state="queued").set(
+                queued_seconds.get(tenant, 0.0)
+            )
+            JOB_TENANT_AUDIO_SECONDS.labels(tenant=tenant, state="dispatched").set(
+                running_seconds.get(tenant, 0.0)
+            )
+        _reported_tenants.clear()
+        _reported_tenants.update(tenants)
+
+
+__all__ = [
+    "TRANSCRIBE_TASK",
+    "dispatch_pending",
+    "dispatch_pending_jobs",
+    "enqueue_transcription",
+    "release_unclaimed_jobs",
+    "tenant_key",
+]
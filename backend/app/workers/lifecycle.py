@@ -0,0 +1,268 @@
+"""Retries, heartbeats and dead-lettering for background job tasks.
+
+Every task decorated with :func:`job_task` claims its ``Job`` before it
+runs, keeps the job's heartbeat fresh while it works and, when it raises,
+settles the job in a session of its own (the task's session has already
+rolled back).  A failed attempt is re-enqueued with exponential backoff and
+full jitter until the task's :class:`RetryPolicy` runs out of attempts;
+the job is then marked ``failed`` and a copy of the call is parked on the
+dead-letter queue for inspection.  :func:`reap_stale_jobs` handles workers
+that die mid-job: jobs whose heartbeat expired are requeued the same way.
+Every state change is published as a job event for the job's users.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import threading
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from app import deps
+from app.domain import repositories
+from app.domain.models import JobPriority
+from app.infra.broker import get_queue, priority_queue_name
+from app.infra.db import session_scope
+from app.infra.telemetry import JOB_ATTEMPTS
+from app.services.job_events import publish_job_changed
+from app.workers.dispatch import dispatch_pending_jobs, release_unclaimed_jobs
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEAD_LETTER_QUEUE = "dead-letter"
+
+Task = Callable[[int, Dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_seconds: float = 10.0
+    max_delay_seconds: float = 600.0
+
+    def backoff(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (full jitter)."""
+
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1))
+        return (rng or random).uniform(0, ceiling)
+
+
+RETRY_POLICIES: dict[str, RetryPolicy] = {
+    "transcribe_batch": RetryPolicy(max_attempts=4, base_delay_seconds=30, max_delay_seconds=900),
+    "report_build": RetryPolicy(max_attempts=2, base_delay_seconds=10, max_delay_seconds=120),
+}
+# Task that reruns a job of each type from its job row alone.
+REQUEUE_TASKS: dict[str, str] = {"transcription": "transcribe_batch"}
+_TASKS: dict[str, Task] = {}
+
+
+class Heartbeat:
+    """Refresh a job's ``heartbeat_at`` from a background thread while it runs.
+
+    Stops once the job is no longer processing on attempt ``attempts``.
+    """
+
+    def __init__(
+        self, job_id: int, interval_seconds: float, *, attempts: Optional[int] = None
+    ) -> None:
+        self._job_id = job_id
+        self._attempts = attempts
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="job-heartbeat-%d" % job_id, daemon=True
+        )
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                with session_scope() as session:
+                    alive = repositories.JobRepository(session).heartbeat(
+                        self._job_id, attempts=self._attempts
+                    )
+            except Exception:  # noqa: BLE001
+                logger.exception("Heartbeat for job %s failed", self._job_id)
+                continue
+            if not alive:
+                return
+
+
+def job_task(name: str, *, heartbeat_seconds: float | None = None) -> Callable[[Task], Task]:
+    """Run a ``(job_id, payload)`` task under the retry policy registered for ``name``.
+
+    The task receives the attempt it runs as ``payload["attempt"]``, so it
+    can make sure that attempt still holds the job before its side effects.
+    """
+
+    def decorate(fn: Task) -> Task:
+        @functools.wraps(fn)
+        def wrapper(job_id: int, payload: Dict[str, Any]) -> None:
+            with session_scope() as session:
+                job = repositories.JobRepository(session).claim(job_id)
+                attempt = job.attempts if job is not None else 0
+                if job is not None:
+                    publish_job_changed(deps.get_job_event_bus(), job)
+            if job is None:
+                logger.info("Skipping %s for job %s: missing or already claimed", name, job_id)
+                return
+            try:
+                interval = heartbeat_seconds or get_settings().JOB_HEARTBEAT_SECONDS
+                with Heartbeat(job_id, interval, attempts=attempt):
+                    fn(job_id, {**payload, "attempt": attempt})
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("%s failed for job %s (attempt %d)", name, job_id, attempt)
+                handle_failure(name, job_id, payload, attempt, _describe(exc))
+            else:
+                JOB_ATTEMPTS.labels(task=name, outcome="succeeded").inc()
+                _publish(job_id)
+            # The settled job freed a fair-share slot.
+            dispatch_pending_jobs()
+
+        _TASKS[name] = wrapper
+        return wrapper
+
+    return decorate
+
+
+def handle_failure(
+    name: str,
+    job_id: int,
+    payload: Dict[str, Any],
+    attempt: int,
+    error: str,
+    *,
+    rng: random.Random | None = None,
+) -> str:
+    """Settle a failed attempt; return ``"retried"``, ``"dead_lettered"`` or ``"skipped"``."""
+
+    policy = RETRY_POLICIES.get(name, RetryPolicy())
+    with session_scope() as session:
+        job_repo = repositories.JobRepository(session)
+        if attempt < policy.max_attempts:
+            job = job_repo.release_for_retry(job_id, error, attempts=attempt)
+            if job is None:
+                return "skipped"
+            publish_job_changed(deps.get_job_event_bus(), job)
+            delay = policy.backoff(attempt, rng)
+            _queue_for(payload).enqueue_in(timedelta(seconds=delay), _TASKS[name], job_id, payload)
+            JOB_ATTEMPTS.labels(task=name, outcome="retried").inc()
+            logger.warning("Retrying %s for job %s in %.1fs", name, job_id, delay)
+            return "retried"
+        job = job_repo.mark_failed(job_id, error, attempts=attempt)
+        if job is None:
+            return "skipped"
+        publish_job_changed(deps.get_job_event_bus(), job)
+    get_queue(DEAD_LETTER_QUEUE).enqueue(
+        _TASKS[name],
+        job_id,
+        payload,
+        meta={"task": name, "attempts": attempt, "error": error},
+    )
+    JOB_ATTEMPTS.labels(task=name, outcome="dead_lettered").inc()
+    logger.error("Moved job %s to the dead-letter queue after %d attempts", job_id, attempt)
+    return "dead_lettered"
+
+
+def reap_stale_jobs(
+    heartbeat_timeout_seconds: float, *, now: Optional[datetime] = None
+) -> dict[int, str]:
+    """Requeue or fail processing jobs whose heartbeat expired.
+
+    A job is retried with the task :data:`REQUEUE_TASKS` maps its type to;
+    jobs of other types cannot be rebuilt from the job row and are marked
+    failed.  Returns the outcome per job id.
+    """
+
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=heartbeat_timeout_seconds)
+    with session_scope() as session:
+        stale = [
+            (job.id, job.type, job.attempts, job.input_uri, job.priority)
+            for job in repositories.JobRepository(session).list_stale(cutoff)
+        ]
+
+    error = "Worker heartbeat expired"
+    outcomes = {}
+    orphans = []
+    for job_id, job_type, attempts, input_uri, priority in stale:
+        name = REQUEUE_TASKS.get(job_type)
+        if name is not None:
+            payload = {"input_uri": input_uri, "priority": priority}
+            outcomes[job_id] = handle_failure(name, job_id, payload, attempts, error)
+        else:
+            orphans.append(job_id)
+    if orphans:
+        with session_scope() as session:
+            failed = repositories.JobRepository(session).fail_stale(orphans, cutoff, error)
+            failed_ids = set()
+            for job in failed:
+                failed_ids.add(job.id)
+                publish_job_changed(deps.get_job_event_bus(), job)
+        outcomes.update(
+            (job_id, "failed" if job_id in failed_ids else "skipped") for job_id in orphans
+        )
+    if outcomes:
+        logger.warning("Reaped %d stale jobs: %s", len(outcomes), outcomes)
+    return outcomes
+
+
+def start_reaper(interval_seconds: float, heartbeat_timeout_seconds: float) -> threading.Event:
+    """Reap stale jobs, release lost dispatches and dispatch waiting jobs.
+
+    Runs every ``interval_seconds``; set the returned event to stop.
+    """
+
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval_seconds):
+            try:
+                reap_stale_jobs(heartbeat_timeout_seconds)
+            except Exception:  # noqa: BLE001
+                logger.exception("Stale job reaper failed")
+            release_unclaimed_jobs()
+            # Also covers slots freed by workers that died before dispatching.
+            dispatch_pending_jobs()
+
+    threading.Thread(target=run, name="job-reaper", daemon=True).start()
+    return stop
+
+
+def _publish(job_id: int) -> None:
+    with session_scope() as session:
+        job = repositories.JobRepository(session).get(job_id)
+        if job is not None:
+            publish_job_changed(deps.get_job_event_bus(), job)
+
+
+def _queue_for(payload: Dict[str, Any]):
+    return get_queue(priority_queue_name(payload.get("priority") or JobPriority.ROUTINE.value))
+
+
+def _describe(exc: BaseException) -> str:
+    return "".join(traceback.format_exception_only(type(exc), exc)).strip()
+
+
+__all__ = [
+    "DEAD_LETTER_QUEUE",
+    "REQUEUE_TASKS",
+    "RETRY_POLICIES",
+    "Heartbeat",
+    "RetryPolicy",
+    "handle_failure",
+    "job_task",
+    "reap_stale_jobs",
+    "start_reaper",
+]
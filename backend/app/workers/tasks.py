@@ -1,41 +1,178 @@
 from __future__ import annotations
 
+import json
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
 from typing import Any, Dict
 
+from app import deps
 from app.domain import repositories, schemas
-from app.domain.models import JobStatus
+from app.domain.models import JobPriority
 from app.infra import storage
 from app.infra.db import session_scope
+from app.infra.telemetry import ASR_QUEUE_WAIT
+from app.services.asr.checkpoint import ChunkCheckpoint, job_checkpoint_key
+from app.services.asr.silence import SilenceTrim
+from app.services.job_events import JobEvents
+from app.settings import Settings, get_settings
+from app.utils.audio import decode_stream
+from app.workers.lifecycle import job_task
 
+logger = logging.getLogger(__name__)
 
+# Downloads spill from memory to a temporary file beyond this size.
+SPOOL_MAX_MEMORY_BYTES = 8 * 1024 * 1024
+
+
+@job_task("transcribe_batch")
 def transcribe_batch(job_id: int, payload: Dict[str, Any]) -> None:
-    """Background task to process transcription batches.
+    """Transcribe the recording at ``payload["input_uri"]`` for a job.
 
-    Actual ASR pipeline is handled by the AI team.
+    The object is streamed from storage into a spooled temporary file, so
+    only its first few megabytes are ever held in memory, then decoded,
+    trimmed and transcribed on the chunked path with a checkpoint, so a
+    retried job resumes after the last finished chunk.  The transcript and
+    its segments are written to storage under the attempt's own prefix,
+    and only the attempt that still holds the job completes it and copies
+    the transcript to the linked transcription: a reaped or superseded
+    attempt leaves no trace but its unreferenced objects.  Failures are
+    retried by :func:`job_task`.  Progress through the stages, and through
+    the chunks when the model runs in this process, is published as job
+    events.
     """
+    _observe_queue_wait(payload)
+    attempt = payload["attempt"]
     with session_scope() as session:
-        job_repo = repositories.JobRepository(session)
-        job_repo.update_status(job_id, JobStatus.PROCESSING.value)
+        events = JobEvents.for_job(
+            deps.get_job_event_bus(), repositories.JobRepository(session).get(job_id)
+        )
+    result = _run_transcription(job_id, payload["input_uri"], get_settings(), events)
+    if not _holds(job_id, attempt):
+        return
+    events.progress("storing", 100.0)
+    prefix = f"jobs/{job_id}/attempts/{attempt}"
+    transcript_key = f"{prefix}/transcript.txt"
+    storage.storage_client.put_bytes(
+        transcript_key, result.transcript.encode("utf-8"), "text/plain; charset=utf-8"
+    )
+    storage.storage_client.put_bytes(
+        f"{prefix}/segments.json",
+        json.dumps({"job_id": job_id, "segments": result.segments}).encode("utf-8"),
+        "application/json",
+    )
+    with session_scope() as session:
+        job = repositories.JobRepository(session).complete(
+            job_id,
+            output_uri=transcript_key,
+            input_bytes=result.input_bytes,
+            audio_seconds=result.audio_seconds,
+            processing_seconds=result.processing_seconds,
+            attempts=attempt,
+        )
+        if job is None:
+            _log_superseded(job_id, attempt)
+            return
+        if job.transcription_id is not None:
+            repositories.TranscriptionRepository(session).update_text(
+                job.transcription_id, result.transcript
+            )
+
+
+def _holds(job_id: int, attempt: int) -> bool:
+    """Whether ``attempt`` is still the one processing the job."""
+
+    with session_scope() as session:
+        held = repositories.JobRepository(session).heartbeat(job_id, attempts=attempt)
+    if not held:
+        _log_superseded(job_id, attempt)
+    return held
+
 
-        # TODO: Integrate with ASR service (whisper, wav2vec, etc.) once available.
-        # This placeholder simulates output storage key.
-        output_key = f"jobs/{job_id}/transcript.txt"
-        storage.storage_client.put_bytes(output_key, b"TODO: transcript content", "text/plain")
+def _log_superseded(job_id: int, attempt: int) -> None:
+    logger.warning(
+        "Discarding the results of job %s attempt %d: the job was reaped or claimed again",
+        job_id,
+        attempt,
+    )
 
-        job_repo.update_status(job_id, JobStatus.COMPLETED.value, output_uri=output_key)
 
+@dataclass
+class _TranscriptionResult:
+    transcript: str
+    segments: list[dict[str, Any]]
+    input_bytes: int
+    audio_seconds: float
+    processing_seconds: float
 
+
+def _run_transcription(
+    job_id: int, input_uri: str, settings: Settings, events: JobEvents
+) -> _TranscriptionResult:
+    started_at = time.perf_counter()
+    key = storage.storage_client.key_from_uri(input_uri)
+    events.progress("downloading", 0.0)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as spool:
+        input_bytes = storage.storage_client.download_fileobj(key, spool)
+        spool.seek(0)
+        events.progress("decoding", 0.0)
+        audio = decode_stream(
+            spool,
+            memmap_threshold_bytes=settings.ASR_DECODE_MEMMAP_THRESHOLD_MB * 1024 * 1024,
+        )
+
+    silence_trimmer = deps.get_silence_trimmer(settings)
+    trimmed = silence_trimmer(audio) if silence_trimmer is not None else SilenceTrim.untrimmed(audio)
+    checkpoint = ChunkCheckpoint(
+        deps.get_checkpoint_store(settings),
+        job_checkpoint_key(job_id),
+        on_progress=lambda done, total: events.progress(
+            "transcribing", 100.0 * done / total if total else None
+        ),
+    )
+    events.progress("transcribing", 0.0)
+    if trimmed.audio.size == 0:
+        transcript, segments = "", []
+    else:
+        engine = deps.get_asr_engine(settings)
+        transcript, segments = engine.transcribe_segments(trimmed.audio, checkpoint=checkpoint)
+    checkpoint.clear()
+
+    for segment in segments:
+        segment["start"] = round(trimmed.offsets.to_original(segment["start"]), 3)
+        segment["end"] = round(trimmed.offsets.to_original(segment["end"]), 3)
+    return _TranscriptionResult(
+        transcript=transcript,
+        segments=segments,
+        input_bytes=input_bytes,
+        audio_seconds=trimmed.original_seconds,
+        processing_seconds=time.perf_counter() - started_at,
+    )
+
+
+def _observe_queue_wait(payload: Dict[str, Any]) -> None:
+    enqueued_at = payload.get("enqueued_at")
+    if enqueued_at is None:
+        return
+    ASR_QUEUE_WAIT.labels(
+        queue="jobs", priority=payload.get("priority") or JobPriority.ROUTINE.value
+    ).observe(max(time.time() - enqueued_at, 0.0))
+
+
+@job_task("report_build")
 def report_build(job_id: int, report_payload: Dict[str, Any]) -> None:
+    attempt = report_payload["attempt"]
     with session_scope() as session:
         job_repo = repositories.JobRepository(session)
-        job_repo.update_status(job_id, JobStatus.PROCESSING.value)
 
         builder = report_payload["builder"]
         report_in: schemas.ReportCreate = report_payload["report_in"]
         report_repo = repositories.ReportRepository(session)
 
         output_key, _ = builder.generate(report_in)
+        if job_repo.complete(job_id, output_uri=output_key, attempts=attempt) is None:
+            _log_superseded(job_id, attempt)
+            return
         report_repo.create(report_in, output_key)
 
-        job_repo.update_status(job_id, JobStatus.COMPLETED.value, output_uri=output_key)
-
@@ -0,0 +1,115 @@
+"""RQ worker that keeps the ASR models resident between jobs.
+
+The stock ``rq worker`` forks a work horse for every job, so each job either
+loads the Whisper model again or pays copy-on-write faults on the parent's
+copy.  This worker loads the configured models once, before it takes any
+job, and runs jobs in its own process so they all reuse the warm models.
+With ``ASR_EXECUTOR=process`` decoding still happens in the pre-warmed child
+processes started during preload; with ``ASR_INFERENCE_SOCKET`` the models
+live in the inference server and preloading only waits for it to answer.
+
+Run it with the queues most urgent first::
+
+    python -m app.workers.worker asr-stat asr-urgent asr-routine
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Any
+
+from app import deps
+from app.domain.models import JobPriority
+from app.infra.broker import priority_queue_name, redis_conn
+from app.infra.telemetry import ASR_JOB_MODEL_LOAD_SECONDS
+from app.services.asr.pool import model_load_seconds
+from app.services.asr.registry import parse_model_routes
+from app.settings import Settings, get_settings
+from app.workers import tasks  # noqa: F401  (registers the job tasks for retries)
+from app.workers.lifecycle import start_reaper
+
+try:
+    from rq import SimpleWorker  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    class SimpleWorker:  # type: ignore[no-redef]
+        def __init__(self, queues, connection=None, **kwargs):
+            self.queues = queues
+            self.connection = connection
+
+        def perform_job(self, job, queue):
+            return job.perform()
+
+        def work(self, **kwargs):
+            raise RuntimeError("rq is not installed")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUES = [priority_queue_name(priority.value) for priority in JobPriority]
+
+
+def preload_models(settings: Settings) -> dict[str, dict[str, float]]:
+    """Warm the default model and every routed model; return their timings."""
+
+    routed = set(parse_model_routes(settings.ASR_MODEL_ROUTES).values()) - {settings.ASR_MODEL}
+    timings = {}
+    for name in [settings.ASR_MODEL, *sorted(routed)]:
+        timings[name] = deps.get_asr_engine(settings, name).warm_up()
+        logger.info(
+            "Preloaded ASR model '%s' (%s)",
+            name,
+            ", ".join("%s=%.2fs" % item for item in timings[name].items()),
+        )
+    return timings
+
+
+class ModelResidentWorker(SimpleWorker):
+    """Run jobs in the worker process and report the model loading each one paid.
+
+    The seconds spent creating model instances while a job runs are
+    exported as ``asr_job_model_load_seconds`` and stored in the job's
+    ``meta["model_load_seconds"]``; with preloaded models both stay at zero.
+    Jobs run one at a time, so the process-wide load time is attributable
+    to the current job.
+    """
+
+    def perform_job(self, job: Any, queue: Any) -> Any:
+        loaded_before = model_load_seconds()
+        try:
+            return super().perform_job(job, queue)
+        finally:
+            overhead = model_load_seconds() - loaded_before
+            ASR_JOB_MODEL_LOAD_SECONDS.labels(queue=queue.name).observe(overhead)
+            if overhead > 0:
+                logger.warning("Job %s spent %.2fs loading ASR models", job.id, overhead)
+            job.meta["model_load_seconds"] = round(overhead, 3)
+            if hasattr(job, "save_meta"):
+                job.save_meta()
+
+
+def main(argv: list[str] | None = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run an RQ worker with resident ASR models.")
+    parser.add_argument("queues", nargs="*", default=DEFAULT_QUEUES, help="Queues, most urgent first")
+    parser.add_argument("--burst", action="store_true", help="Exit once the queues are empty")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if settings.ASR_WARMUP_ENABLED:
+        preload_models(settings)
+    reaper = start_reaper(
+        settings.JOB_REAPER_INTERVAL_SECONDS, settings.JOB_HEARTBEAT_TIMEOUT_SECONDS
+    )
+    worker = ModelResidentWorker(args.queues, connection=redis_conn)
+    try:
+        # The scheduler releases retries that were enqueued with a backoff.
+        worker.work(burst=args.burst, with_scheduler=True)
+    finally:
+        reaper.set()
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["DEFAULT_QUEUES", "ModelResidentWorker", "main", "preload_models"]
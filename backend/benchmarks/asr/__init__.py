@@ -0,0 +1 @@
+"""Benchmarks for the ASR pipeline. Run the modules with ``python -m``."""
@@ -0,0 +1,179 @@
+"""Benchmark WhisperService on synthetic audio and print a JSON report.
+
+Usage::
+
+    python -m benchmarks.asr --model tiny --scenarios single,concurrent,long \
+        --output baseline.json
+
+Scenarios
+---------
+``single``
+    Sequential requests, one at a time, for each of ``--lengths``.
+``concurrent``
+    ``--requests`` clips of ``--clip-seconds`` from ``--concurrency`` callers.
+``long``
+    One ``--long-seconds`` recording, which takes the chunked path.
+
+Every scenario reports the real-time factor (processing seconds per audio
+second, lower is better) and latency percentiles; the report also holds the
+model load and first-decode times and the peak RSS of the process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.services.asr.whisper_service import WhisperService
+from app.utils.audio import SAMPLE_RATE
+from benchmarks.asr.audio import synthetic_speech
+from benchmarks.asr.stats import latency_summary, peak_rss_mb
+
+SCENARIOS = ("single", "concurrent", "long")
+
+
+def _timed(service: WhisperService, audio) -> float:
+    started_at = time.perf_counter()
+    service.transcribe(audio)
+    return time.perf_counter() - started_at
+
+
+def run_single(service: WhisperService, args: argparse.Namespace) -> list[dict[str, Any]]:
+    results = []
+    for seconds in args.lengths:
+        clip = synthetic_speech(seconds, seed=args.seed)
+        latencies = [_timed(service, clip) for _ in range(args.repeat)]
+        results.append(
+            {
+                "scenario": "single",
+                "audio_seconds": seconds,
+                "requests": len(latencies),
+                "rtf": round(sum(latencies) / (seconds * len(latencies)), 4),
+                **latency_summary(latencies),
+            }
+        )
+    return results
+
+
+def run_concurrent(service: WhisperService, args: argparse.Namespace) -> list[dict[str, Any]]:
+    clips = [synthetic_speech(args.clip_seconds, seed=args.seed + index) for index in range(args.requests)]
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as callers:
+        latencies = list(callers.map(lambda clip: _timed(service, clip), clips))
+    elapsed = time.perf_counter() - started_at
+    audio_seconds = args.clip_seconds * args.requests
+    return [
+        {
+            "scenario": "concurrent",
+            "audio_seconds": audio_seconds,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_rps": round(args.requests / elapsed, 3),
+            # Wall-clock RTF across the whole run, i.e. inverse throughput.
+            "rtf": round(elapsed / audio_seconds, 4),
+            **latency_summary(latencies),
+        }
+    ]
+
+
+def run_long(service: WhisperService, args: argparse.Namespace) -> list[dict[str, Any]]:
+    recording = synthetic_speech(args.long_seconds, seed=args.seed)
+    latency = _timed(service, recording)
+    return [
+        {
+            "scenario": "long",
+            "audio_seconds": args.long_seconds,
+            "requests": 1,
+            "rtf": round(latency / args.long_seconds, 4),
+            **latency_summary([latency]),
+        }
+    ]
+
+
+RUNNERS = {"single": run_single, "concurrent": run_concurrent, "long": run_long}
+
+
+def build_report(args: argparse.Namespace) -> dict[str, Any]:
+    service = WhisperService(
+        args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+        pool_size=args.pool_size,
+        cpu_threads=args.cpu_threads,
+        num_workers=args.num_workers,
+        executor=args.executor,
+        process_workers=args.pool_size,
+    )
+    rss_before_load = peak_rss_mb()
+    warm = service.warm_up()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    results: list[dict[str, Any]] = []
+    for name in scenarios:
+        if name not in RUNNERS:
+            raise SystemExit("Unknown scenario '%s'; choose from %s" % (name, ", ".join(SCENARIOS)))
+        results.extend(RUNNERS[name](service, args))
+
+    return {
+        "model": service.model_name,
+        "config": {
+            "device": args.device or "auto",
+            "compute_type": args.compute_type or "int8",
+            "pool_size": args.pool_size,
+            "cpu_threads": args.cpu_threads,
+            "num_workers": args.num_workers,
+            "executor": args.executor,
+        },
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "sample_rate": SAMPLE_RATE,
+        "model_load_seconds": round(warm.get("load_seconds", 0.0), 3),
+        "first_decode_seconds": round(warm.get("first_decode_seconds", 0.0), 3),
+        "peak_rss_before_load_mb": rss_before_load,
+        "peak_rss_mb": peak_rss_mb(),
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark WhisperService on synthetic audio.")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--compute-type", default=None)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--num-workers", type=int, default=1)
+    parser.add_argument("--executor", default="thread", choices=("thread", "process"))
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--lengths", type=float, nargs="+", default=[5.0, 15.0, 30.0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--clip-seconds", type=float, default=10.0)
+    parser.add_argument("--long-seconds", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = json.dumps(build_report(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Sweep decoding and threading options on this host and write a settings profile.
+
+Usage::
+
+    python -m benchmarks.asr.autotune --model small --audio refs/ \
+        --output /etc/asr/profile.json
+
+Every combination of ``--compute-types``, ``--beam-sizes``, ``--cpu-threads``
+and ``--num-workers`` that fits on the local CPUs (threads x workers <= cores)
+is loaded on ``device=cpu``, warmed up and measured on the reference set:
+
+* latency percentiles of sequential requests,
+* throughput, as audio seconds transcribed per wall-clock second with
+  ``num_workers`` concurrent callers,
+* WER drift against the most accurate configuration of the sweep (highest
+  precision, widest beam).  When every clip has a reference transcript the
+  drift is the difference of the WERs against those references, otherwise it
+  is the WER against the baseline configuration's own output.
+
+The reference set is ``--audio`` files or directories; ``name.txt`` next to
+``name.wav`` is read as its reference transcript.  Without ``--audio`` the
+sweep runs on synthetic speech, which measures speed but not accuracy.
+
+The best configuration whose drift stays within ``--max-wer-drift`` is
+written as a profile; point ``ASR_PROFILE_PATH`` at it and ``Settings`` picks
+the values up at boot unless they are set explicitly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from app.services.asr.whisper_service import WhisperService
+from app.utils.audio import SAMPLE_RATE, load_audio
+from benchmarks.asr.audio import synthetic_speech
+from benchmarks.asr.stats import latency_summary, word_error_rate
+
+AUDIO_SUFFIXES = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm"}
+OBJECTIVES = ("throughput", "latency")
+# Most to least precise; used to pick the sweep's accuracy baseline.
+COMPUTE_PRECISION = (
+    "float32",
+    "float16",
+    "bfloat16",
+    "int8_float32",
+    "int8_float16",
+    "int8_bfloat16",
+    "int8",
+)
+
+
+class Clip(NamedTuple):
+    name: str
+    audio: np.ndarray
+    reference: Optional[str]
+
+    @property
+    def seconds(self) -> float:
+        return self.audio.size / SAMPLE_RATE
+
+
+class Candidate(NamedTuple):
+    compute_type: str
+    beam_size: int
+    cpu_threads: int
+    num_workers: int
+
+    def as_settings(self) -> dict[str, Any]:
+        return {
+            "ASR_WHISPER_DEVICE": "cpu",
+            "ASR_WHISPER_COMPUTE_TYPE": self.compute_type,
+            "ASR_BEAM_SIZE": self.beam_size,
+            "ASR_CPU_THREADS": self.cpu_threads,
+            "ASR_NUM_WORKERS": self.num_workers,
+        }
+
+
+def load_reference_set(paths: list[str], *, synthetic_seconds: float = 20.0) -> list[Clip]:
+    files: list[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in AUDIO_SUFFIXES))
+        else:
+            files.append(path)
+    if not files:
+        return [
+            Clip("synthetic-%d" % seed, synthetic_speech(synthetic_seconds, seed=seed), None)
+            for seed in range(3)
+        ]
+
+    clips = []
+    for path in files:
+        transcript = path.with_suffix(".txt")
+        reference = transcript.read_text(encoding="utf-8").strip() if transcript.exists() else None
+        clips.append(Clip(path.name, load_audio(str(path)), reference))
+    return clips
+
+
+def build_candidates(
+    compute_types: list[str],
+    beam_sizes: list[int],
+    cpu_threads: list[int],
+    num_workers: list[int],
+    *,
+    cpu_count: int,
+) -> list[Candidate]:
+    return [
+        Candidate(*combination)
+        for combination in itertools.product(compute_types, beam_sizes, cpu_threads, num_workers)
+        if combination[2] * combination[3] <= cpu_count
+    ]
+
+
+def default_thread_counts(cpu_count: int) -> list[int]:
+    return sorted({count for count in (1, 2, 4, cpu_count // 2, cpu_count) if 0 < count <= cpu_count})
+
+
+def baseline_of(candidates: list[Candidate]) -> Candidate:
+    def accuracy(candidate: Candidate) -> tuple[int, int]:
+        precision = (
+            COMPUTE_PRECISION.index(candidate.compute_type)
+            if candidate.compute_type in COMPUTE_PRECISION
+            else len(COMPUTE_PRECISION)
+        )
+        return (-precision, candidate.beam_size)
+
+    return max(candidates, key=accuracy)
+
+
+def measure(candidate: Candidate, clips: list[Clip], args: argparse.Namespace) -> dict[str, Any]:
+    service = WhisperService(
+        args.model,
+        device="cpu",
+        compute_type=candidate.compute_type,
+        cpu_threads=candidate.cpu_threads,
+        num_workers=candidate.num_workers,
+        beam_size=candidate.beam_size,
+    )
+    try:
+        warm = service.warm_up()
+        latencies: list[float] = []
+        transcripts: list[str] = []
+        for clip in clips:
+            for _ in range(args.repeat):
+                started_at = time.perf_counter()
+                transcript = service.transcribe(clip.audio)
+                latencies.append(time.perf_counter() - started_at)
+            transcripts.append(transcript)
+
+        workload = [clip.audio for clip in clips] * args.repeat
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=candidate.num_workers) as callers:
+            list(callers.map(service.transcribe, workload))
+        elapsed = time.perf_counter() - started_at
+    finally:
+        service.unload()
+
+    audio_seconds = sum(clip.seconds for clip in clips) * args.repeat
+    return {
+        **candidate._asdict(),
+        "model_load_seconds": round(warm.get("load_seconds", 0.0), 3),
+        "throughput_audio_seconds_per_second": round(audio_seconds / elapsed, 3),
+        **latency_summary(latencies),
+        "transcripts": transcripts,
+    }
+
+
+def score_wer(results: list[dict[str, Any]], clips: list[Clip], baseline: dict[str, Any]) -> None:
+    """Add ``wer`` (when references exist) and ``wer_drift`` to every result."""
+
+    def mean_wer(references: list[str], hypotheses: list[str]) -> float:
+        return float(np.mean([word_error_rate(ref, hyp) for ref, hyp in zip(references, hypotheses)]))
+
+    references = [clip.reference for clip in clips]
+    if all(reference is not None for reference in references):
+        baseline_wer = mean_wer(references, baseline["transcripts"])
+        for result in results:
+            result["wer"] = round(mean_wer(references, result["transcripts"]), 4)
+            result["wer_drift"] = round(result["wer"] - baseline_wer, 4)
+    else:
+        for result in results:
+            result["wer_drift"] = round(mean_wer(baseline["transcripts"], result["transcripts"]), 4)
+
+
+def choose(results: list[dict[str, Any]], *, objective: str, max_wer_drift: float) -> dict[str, Any]:
+    eligible = [result for result in results if result["wer_drift"] <= max_wer_drift] or results
+    if objective == "latency":
+        return min(eligible, key=lambda result: result["latency_p95_seconds"])
+    return max(eligible, key=lambda result: result["throughput_audio_seconds_per_second"])
+
+
+def build_profile(args: argparse.Namespace) -> dict[str, Any]:
+    cpu_count = os.cpu_count() or 1
+    threads = args.cpu_threads or default_thread_counts(cpu_count)
+    candidates = build_candidates(
+        args.compute_types, args.beam_sizes, threads, args.num_workers, cpu_count=cpu_count
+    )
+    if not candidates:
+        raise SystemExit("No configuration fits on %d CPUs" % cpu_count)
+    clips = load_reference_set(args.audio)
+
+    results = []
+    for index, candidate in enumerate(candidates, start=1):
+        print("[%d/%d] %s" % (index, len(candidates), dict(candidate._asdict())), file=sys.stderr)
+        results.append(measure(candidate, clips, args))
+
+    baseline = results[candidates.index(baseline_of(candidates))]
+    score_wer(results, clips, baseline)
+    best = choose(results, objective=args.objective, max_wer_drift=args.max_wer_drift)
+    for result in results:
+        result.pop("transcripts")
+
+    return {
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "model": args.model,
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "cpu_count": cpu_count,
+        },
+        "objective": args.objective,
+        "max_wer_drift": args.max_wer_drift,
+        "reference_clips": len(clips),
+        "has_reference_transcripts": all(clip.reference is not None for clip in clips),
+        "baseline": dict(baseline_of(candidates)._asdict()),
+        "settings": Candidate(*(best[field] for field in Candidate._fields)).as_settings(),
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tune ASR settings for this host.")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--audio", nargs="*", default=[], help="Reference audio files or directories")
+    parser.add_argument("--compute-types", nargs="+", default=["int8", "int8_float32", "float32"])
+    parser.add_argument("--beam-sizes", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--cpu-threads", type=int, nargs="+", default=None)
+    parser.add_argument("--num-workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="throughput")
+    parser.add_argument("--max-wer-drift", type=float, default=0.02)
+    parser.add_argument("--output", help="Write the profile here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    profile = json.dumps(build_profile(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(profile + "\n")
+    else:
+        print(profile)
+
+
+if __name__ == "__main__":
+    main()
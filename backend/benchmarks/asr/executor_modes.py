@@ -0,0 +1,77 @@
+"""Compare the thread and process ASR executors on throughput and tail latency.
+
+Usage::
+
+    python -m benchmarks.asr.executor_modes --model tiny --requests 40 --concurrency 4
+
+Each mode builds a ``WhisperService`` with the same model and parallelism
+(``--workers`` pooled models for threads, ``--workers`` child processes for
+processes), warms it up, then pushes ``--requests`` synthetic clips through
+it from ``--concurrency`` caller threads.  Results are printed as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.services.asr.whisper_service import WhisperService
+from benchmarks.asr.audio import synthetic_speech
+from benchmarks.asr.stats import latency_summary
+
+
+def run_mode(executor: str, args: argparse.Namespace, clip: np.ndarray) -> dict:
+    service = WhisperService(
+        args.model,
+        executor=executor,
+        pool_size=args.workers if executor == "thread" else 1,
+        process_workers=args.workers,
+        cpu_threads=args.cpu_threads,
+        chunking_enabled=False,
+    )
+    warm = service.warm_up()
+
+    def one_request(_: int) -> float:
+        started_at = time.perf_counter()
+        service.transcribe(clip)
+        return time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as callers:
+        latencies = list(callers.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - started_at
+    service.unload()
+
+    return {
+        "executor": executor,
+        "warm_up_seconds": round(sum(warm.values()), 3),
+        "requests": args.requests,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 3),
+        "audio_seconds_per_second": round(args.requests * args.clip_seconds / elapsed, 3),
+        **latency_summary(latencies),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--modes", default="thread,process", help="Comma separated executors")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--clip-seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    clip = synthetic_speech(args.clip_seconds)
+    results = [run_mode(mode.strip(), args, clip) for mode in args.modes.split(",") if mode.strip()]
+    print(json.dumps({"model": args.model, "workers": args.workers, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""add job priority"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "priority",
+                sa.String(length=20),
+                nullable=False,
+                server_default="routine",
+            )
+        )
+        batch_op.create_index("ix_jobs_priority", ["priority"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_jobs_priority")
+        batch_op.drop_column("priority")
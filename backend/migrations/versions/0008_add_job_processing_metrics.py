@@ -0,0 +1,24 @@
+"""add job processing metrics"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("input_bytes", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("audio_seconds", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("processing_rtf", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.drop_column("processing_rtf")
+        batch_op.drop_column("audio_seconds")
+        batch_op.drop_column("input_bytes")
@@ -0,0 +1,24 @@
+"""add job idempotency key"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("idempotency_key", sa.String(length=255), nullable=True))
+        batch_op.create_unique_constraint(
+            "uq_jobs_created_by_idempotency_key", ["created_by_id", "idempotency_key"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_jobs_created_by_idempotency_key", type_="unique")
+        batch_op.drop_column("idempotency_key")
@@ -0,0 +1,24 @@
+"""add job dispatched_at"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("dispatched_at", sa.DateTime(), nullable=True))
+        batch_op.create_index("ix_jobs_status_dispatched_at", ["status", "dispatched_at"])
+    # Existing jobs were enqueued when they were created.
+    op.execute("UPDATE jobs SET dispatched_at = created_at")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_jobs_status_dispatched_at")
+        batch_op.drop_column("dispatched_at")
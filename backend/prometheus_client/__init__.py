@@ -16,6 +16,15 @@ class _Metric:
     def inc(self, amount: float = 1.0) -> None:
         pass
 
+    def dec(self, amount: float = 1.0) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
     @contextmanager
     def time(self):
         yield
@@ -25,6 +34,10 @@ class Counter(_Metric):
     pass
 
 
+class Gauge(_Metric):
+    pass
+
+
 class Histogram(_Metric):
     pass
 
@@ -33,4 +46,4 @@ def generate_latest() -> bytes:
     return b""
 
 
-__all__ = ["Counter", "Histogram", "generate_latest", "CONTENT_TYPE_LATEST"]
+__all__ = ["Counter", "Gauge", "Histogram", "generate_latest", "CONTENT_TYPE_LATEST"]
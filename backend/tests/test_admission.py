@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.services.asr.admission import AdmissionController, AdmissionRejected
+
+
+def test_admits_up_to_concurrency_then_queues_in_order():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=2)
+        order = []
+        first = await controller.acquire()
+
+        async def waiter(name):
+            async with controller.admit():
+                order.append(name)
+
+        tasks = [asyncio.create_task(waiter("a")), asyncio.create_task(waiter("b"))]
+        await asyncio.sleep(0)
+        assert controller.queued == 2
+        first.release()
+        await asyncio.gather(*tasks)
+        return order, controller.in_flight, controller.queued
+
+    order, in_flight, queued = asyncio.run(scenario())
+
+    assert order == ["a", "b"]
+    assert (in_flight, queued) == (0, 0)
+
+
+def test_rejects_when_queue_is_full_with_retry_after():
+    async def scenario():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue=1, initial_service_seconds=4.0
+        )
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire()
+        queued.cancel()
+        return exc.value
+
+    rejected = asyncio.run(scenario())
+
+    assert rejected.reason == "queue_full"
+    # One running and one queued job at ~4s each ahead of the caller.
+    assert rejected.retry_after == 8
+
+
+def test_queue_timeout_rejects_and_frees_the_queue_slot():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout_seconds=0.01)
+        ticket = await controller.acquire()
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire()
+        queued_after_timeout = controller.queued
+        ticket.release()
+        ticket.release()
+        return exc.value.reason, queued_after_timeout, controller.in_flight
+
+    assert asyncio.run(scenario()) == ("timeout", 0, 0)
+
+
+def test_release_from_worker_thread_wakes_waiter():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        ticket = await controller.acquire()
+        pending = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        await asyncio.to_thread(ticket.release)
+        second = await asyncio.wait_for(pending, 1)
+        second.release()
+        return controller.in_flight
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_waiters_are_served_by_priority_with_aging(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.asr.admission.time.monotonic", lambda: clock[0])
+
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, aging_seconds=10.0)
+        order = []
+        ticket = await controller.acquire()
+
+        async def waiter(name, priority):
+            async with controller.admit(priority):
+                order.append(name)
+
+        tasks = [asyncio.create_task(waiter("old-routine", "routine"))]
+        await asyncio.sleep(0)
+        # Two classes below "stat", so it overtakes routine callers until
+        # they have waited 20s longer.
+        clock[0] += 25.0
+        tasks.append(asyncio.create_task(waiter("routine", "routine")))
+        tasks.append(asyncio.create_task(waiter("stat", "stat")))
+        tasks.append(asyncio.create_task(waiter("urgent", "urgent")))
+        await asyncio.sleep(0)
+        ticket.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["old-routine", "stat", "urgent", "routine"]
+
+
+def test_unknown_priority_is_rejected():
+    controller = AdmissionController(max_concurrency=1, max_queue=1)
+
+    with pytest.raises(ValueError):
+        asyncio.run(controller.acquire("whenever"))
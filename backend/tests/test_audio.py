@@ -0,0 +1,64 @@
+import io
+
+import av
+import numpy as np
+import pytest
+
+from app.utils import audio
+
+
+def test_plan_chunks_cuts_at_silence_between_regions():
+    regions = [(0, 10), (12, 20), (25, 40), (45, 50)]
+
+    chunks = audio.plan_chunks(regions, total_samples=60, max_chunk_samples=20)
+
+    assert chunks == [(0, 20), (25, 40), (45, 50)]
+
+
+def test_plan_chunks_splits_long_regions_and_adds_overlap():
+    chunks = audio.plan_chunks([(0, 50)], total_samples=50, max_chunk_samples=20, overlap_samples=2)
+
+    assert chunks == [(0, 22), (18, 42), (38, 50)]
+
+
+def test_split_audio_returns_no_chunks_for_silence():
+    silence = np.zeros(audio.SAMPLE_RATE * 2, dtype=np.float32)
+
+    assert audio.split_audio(silence) == []
+
+
+def test_stitch_transcripts_removes_overlap_words():
+    texts = [
+        "The patient reports chest pain",
+        "chest pain since Tuesday.",
+        "",
+        "Since Tuesday. No fever",
+    ]
+
+    stitched = audio.stitch_transcripts(texts)
+
+    assert stitched == "The patient reports chest pain since Tuesday. No fever"
+
+
+def _wav_bytes(seconds: float, rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format="wav") as container:
+        stream = container.add_stream("pcm_s16le", rate=rate)
+        stream.layout = "mono"
+        samples = (np.sin(np.arange(int(seconds * rate)) * 0.1) * 8000).astype(np.int16)
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("threshold, expected_type", [(0, np.ndarray), (1024, np.memmap)])
+def test_decode_stream_resamples_to_16khz(threshold, expected_type):
+    decoded = audio.decode_stream(io.BytesIO(_wav_bytes(1.0)), memmap_threshold_bytes=threshold)
+
+    assert type(decoded) is expected_type
+    assert decoded.dtype == np.float32
+    assert abs(decoded.size - audio.SAMPLE_RATE) < 100
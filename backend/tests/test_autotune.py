@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from app.settings import Settings
+from benchmarks.asr.autotune import Candidate, baseline_of, build_candidates, choose
+from benchmarks.asr.stats import word_error_rate
+
+
+def _write_profile(tmp_path, settings):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"host": {}, "settings": settings}))
+    return str(path)
+
+
+def test_profile_fills_settings_not_set_explicitly(tmp_path):
+    path = _write_profile(
+        tmp_path,
+        {"ASR_WHISPER_COMPUTE_TYPE": "int8_float32", "ASR_CPU_THREADS": "4", "ASR_BEAM_SIZE": 1},
+    )
+
+    settings = Settings(ASR_PROFILE_PATH=path, ASR_CPU_THREADS=2)
+
+    assert settings.ASR_WHISPER_COMPUTE_TYPE == "int8_float32"
+    assert settings.ASR_BEAM_SIZE == 1
+    assert settings.ASR_CPU_THREADS == 2
+
+
+def test_profile_cannot_set_non_asr_settings(tmp_path):
+    path = _write_profile(tmp_path, {"SECRET_KEY": "oops"})
+
+    with pytest.raises(ValueError, match="SECRET_KEY"):
+        Settings(ASR_PROFILE_PATH=path)
+
+
+def test_word_error_rate():
+    assert word_error_rate("the patient is stable", "The patient is stable") == 0.0
+    assert word_error_rate("the patient is stable", "the patient stable today") == 0.5
+    assert word_error_rate("", "") == 0.0
+
+
+def test_candidates_fit_cores_and_choice_respects_wer_drift():
+    candidates = build_candidates(["int8", "float32"], [1, 5], [2, 4], [1, 2], cpu_count=4)
+
+    assert all(c.cpu_threads * c.num_workers <= 4 for c in candidates)
+    assert baseline_of(candidates) == Candidate("float32", 5, 2, 1)
+
+    results = [
+        {"compute_type": "int8", "throughput_audio_seconds_per_second": 9.0, "wer_drift": 0.08},
+        {"compute_type": "int8_float32", "throughput_audio_seconds_per_second": 6.0, "wer_drift": 0.01},
+        {"compute_type": "float32", "throughput_audio_seconds_per_second": 3.0, "wer_drift": 0.0},
+    ]
+    assert choose(results, objective="throughput", max_wer_drift=0.02)["compute_type"] == "int8_float32"
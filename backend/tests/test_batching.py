@@ -0,0 +1,85 @@
+import pytest
+
+from app import deps
+from app.services.asr.batching import BatchScheduler
+
+
+def test_concurrent_requests_share_a_batch():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item.upper() for item in items]
+
+    scheduler = BatchScheduler(batch_fn, max_batch_size=4, max_wait_ms=200)
+    try:
+        futures = [scheduler.submit(name) for name in ("a", "b", "c")]
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        scheduler.shutdown()
+
+    assert results == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+
+
+def test_batch_is_capped_at_max_size():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(len(items))
+        return items
+
+    scheduler = BatchScheduler(batch_fn, max_batch_size=2, max_wait_ms=200)
+    try:
+        futures = [scheduler.submit(index) for index in range(5)]
+        assert [future.result(timeout=5) for future in futures] == list(range(5))
+    finally:
+        scheduler.shutdown()
+
+    assert max(batches) == 2
+    assert sum(batches) == 5
+
+
+def test_per_item_errors_are_isolated():
+    def batch_fn(items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    scheduler = BatchScheduler(batch_fn, max_batch_size=4, max_wait_ms=50)
+    try:
+        good = scheduler.submit("good")
+        bad = scheduler.submit("bad")
+        assert good.result(timeout=5) == "good"
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+    finally:
+        scheduler.shutdown()
+
+
+def test_submit_after_shutdown_is_rejected():
+    scheduler = BatchScheduler(lambda items: items)
+    scheduler.shutdown()
+
+    with pytest.raises(RuntimeError):
+        scheduler.submit("late")
+
+
+def test_replacing_the_service_shuts_the_old_scheduler_down(monkeypatch):
+    class Service:
+        def transcribe_many(self, items):
+            return items
+
+    monkeypatch.setattr(deps, "_batch_scheduler", None)
+    service = Service()
+    first = deps._get_batch_scheduler_cached(service, 4, 10.0)
+    assert first.submit("a").result(timeout=5) == "a"
+    assert deps._get_batch_scheduler_cached(service, 4, 10.0) is first
+
+    second = deps._get_batch_scheduler_cached(Service(), 4, 10.0)
+    try:
+        assert second is not first
+        with pytest.raises(RuntimeError):
+            first.submit("late")
+        first._thread.join(timeout=5)
+        assert not first._thread.is_alive()
+    finally:
+        second.shutdown()
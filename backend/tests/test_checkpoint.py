@@ -0,0 +1,100 @@
+import json
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.services.asr import whisper_service
+from app.services.asr.checkpoint import ChunkCheckpoint, MemoryCheckpointStore, RedisCheckpointStore
+from app.utils.audio import AudioChunk
+
+
+def _chunks(count):
+    return [
+        AudioChunk(index=index, start=index * 30.0, end=(index + 1) * 30.0, audio=np.zeros(10, dtype=np.float32))
+        for index in range(count)
+    ]
+
+
+def test_checkpoint_resumes_only_for_the_same_plan():
+    store = MemoryCheckpointStore()
+    checkpoint = ChunkCheckpoint(store, "job:1")
+    plan = [(0.0, 30.0), (29.0, 60.0)]
+
+    assert checkpoint.begin(plan) == {}
+    checkpoint.record(0, "first part")
+
+    assert checkpoint.progress() == {"completed_chunks": 1, "total_chunks": 2}
+    assert ChunkCheckpoint(store, "job:1").begin(plan) == {0: "first part"}
+    assert ChunkCheckpoint(store, "job:1").begin([(0.0, 45.0)]) == {}
+    assert checkpoint.progress() == {"completed_chunks": 0, "total_chunks": 1}
+
+
+def test_checkpoint_restarts_for_other_decode_settings():
+    store = MemoryCheckpointStore()
+    plan = [(0.0, 30.0), (29.0, 60.0)]
+    checkpoint = ChunkCheckpoint(store, "job:2")
+    checkpoint.begin(plan, identity={"model": "small", "beam_size": 5})
+    checkpoint.record(0, "first part")
+
+    resumed = ChunkCheckpoint(store, "job:2").begin(plan, identity={"model": "small", "beam_size": 5})
+    assert resumed == {0: "first part"}
+    assert ChunkCheckpoint(store, "job:2").begin(plan, identity={"model": "large-v3", "beam_size": 5}) == {}
+
+
+def test_concurrent_records_report_progress_in_order():
+    reported = []
+    checkpoint = ChunkCheckpoint(
+        MemoryCheckpointStore(), "job:3", on_progress=lambda done, total: reported.append(done)
+    )
+    checkpoint.begin([(float(index), index + 1.0) for index in range(64)])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda index: checkpoint.record(index, "text"), range(64)))
+
+    assert reported == list(range(65))
+
+
+def test_redis_checkpoint_errors_are_ignored():
+    class BrokenRedis:
+        def __getattr__(self, name):
+            def fail(*args, **kwargs):
+                raise ConnectionError("redis down")
+
+            return fail
+
+    store = RedisCheckpointStore(BrokenRedis())
+
+    store.save("job:1", {"chunk:0": "text"})
+    assert store.load("job:1") == {}
+
+
+def test_retried_transcription_skips_checkpointed_chunks(monkeypatch):
+    decoded = []
+
+    class FakeModel:
+        def transcribe(self, audio):
+            decoded.append(audio.size)
+            segment = types.SimpleNamespace(text="chunk %d" % len(decoded), start=0.0, end=30.0)
+            return [segment], None
+
+    monkeypatch.setattr(whisper_service, "split_audio", lambda audio, **kwargs: _chunks(3))
+    monkeypatch.setattr(
+        whisper_service.WhisperService, "_load_model", lambda self, index: FakeModel()
+    )
+    service = whisper_service.WhisperService("tiny", chunk_min_audio_seconds=1.0, chunk_workers=1)
+    store = MemoryCheckpointStore()
+    checkpoint = ChunkCheckpoint(store, "job:7")
+    checkpoint.begin(
+        [(chunk.start, chunk.end) for chunk in _chunks(3)],
+        identity={**service.cache_identity(), "checkpoint": "segments"},
+    )
+    checkpoint.record(0, json.dumps([{"start": 0.0, "end": 30.0, "text": "earlier work"}]))
+    checkpoint.record(1, json.dumps([{"start": 30.0, "end": 60.0, "text": "was kept"}]))
+
+    audio = np.zeros(whisper_service.SAMPLE_RATE * 2, dtype=np.float32)
+    transcript = service.transcribe(audio, checkpoint=ChunkCheckpoint(store, "job:7"))
+
+    assert transcript == "earlier work was kept chunk 1"
+    assert len(decoded) == 1
+    assert checkpoint.progress() == {"completed_chunks": 3, "total_chunks": 3}
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+from app.domain import repositories, schemas
+from app.infra import auth, db
+from app.services.fair_share import FairShareItem, fair_share_order, parse_tenant_weights
+from app.settings import get_settings
+from app.workers import dispatch
+from tests.conftest import TestingSessionLocal
+
+
+def _items(tenant, count, *, cost=60.0, rank=2):
+    return [FairShareItem(tenant, cost, rank, "%s%d" % (tenant, index)) for index in range(count)]
+
+
+def test_bulk_tenant_only_gets_its_weighted_share():
+    items = _items("bulk", 10) + _items("small", 2)
+
+    assert fair_share_order(items, {}, {}, limit=4) == ["bulk0", "small0", "bulk1", "small1"]
+    assert fair_share_order(items, {"bulk": 600.0}, {}, limit=3) == ["small0", "small1", "bulk0"]
+    assert fair_share_order(items, {}, {"small": 0.5}, limit=3) == ["bulk0", "small0", "bulk1"]
+
+
+def test_priority_class_wins_over_fair_share():
+    items = _items("bulk", 3) + [FairShareItem("bulk", 60.0, 0, "stat")]
+
+    assert fair_share_order(items, {"bulk": 1e6}, {}, limit=1) == ["stat"]
+
+
+def test_parse_tenant_weights_skips_invalid_entries():
+    assert parse_tenant_weights("user:12=4, USER:7=0.5,default=1,bad,user:9=0,user:3=x") == {
+        "user:12": 4.0,
+        "user:7": 0.5,
+        "default": 1.0,
+    }
+
+
+class RecordingGauge:
+    def __init__(self):
+        self.values = {}
+
+    def labels(self, **labels):
+        gauge = self
+
+        class Child:
+            def set(self, value):
+                gauge.values[tuple(sorted(labels.items()))] = value
+
+        return Child()
+
+
+def test_dispatcher_fills_free_slots_fairly_and_reports_depth(db_session, monkeypatch):
+    users = repositories.UserRepository(db_session)
+    bulk = users.create("fair-bulk", auth.hash_password("securepass"), "doctor")
+    small = users.create("fair-small", auth.hash_password("securepass"), "doctor")
+    job_repo = repositories.JobRepository(db_session)
+    bulk_ids = [
+        job_repo.create(
+            bulk.id, schemas.JobCreate(type="transcription", input_uri="s3://bucket/b%d.wav" % n)
+        ).id
+        for n in range(5)
+    ]
+    small_id = job_repo.create(
+        small.id,
+        schemas.JobCreate(type="transcription", input_uri="s3://bucket/s.wav", audio_seconds=30),
+    ).id
+
+    enqueued = []
+
+    class RecordingQueue:
+        def __init__(self, name):
+            self.name = name
+
+        def enqueue(self, task, job_id, payload):
+            enqueued.append((self.name, task, job_id))
+
+    depth = RecordingGauge()
+    monkeypatch.setattr(dispatch, "get_queue", RecordingQueue)
+    monkeypatch.setattr(dispatch, "JOB_TENANT_QUEUE_DEPTH", depth)
+    settings = get_settings().model_copy(update={"JOB_DISPATCH_MAX_IN_FLIGHT": 3})
+
+    assert dispatch.dispatch_pending(job_repo, settings) == [bulk_ids[0], small_id, bulk_ids[1]]
+    assert enqueued[1] == ("asr-routine", dispatch.TRANSCRIBE_TASK, small_id)
+    assert depth.values[(("tenant", dispatch.tenant_key(bulk.id)),)] == 3
+    assert depth.values[(("tenant", dispatch.tenant_key(small.id)),)] == 0
+
+    assert dispatch.dispatch_pending(job_repo, settings) == []
+    job_repo.claim(small_id)
+    job_repo.complete(small_id)
+    assert dispatch.dispatch_pending(job_repo, settings) == [bulk_ids[2]]
+
+
+def test_failed_enqueues_give_their_slots_back(db_session, monkeypatch):
+    user = repositories.UserRepository(db_session).create(
+        "fair-redis-down", auth.hash_password("securepass"), "doctor"
+    )
+    job_repo = repositories.JobRepository(db_session)
+    job_ids = [
+        job_repo.create(
+            user.id, schemas.JobCreate(type="transcription", input_uri="s3://bucket/r%d.wav" % n)
+        ).id
+        for n in range(3)
+    ]
+    enqueued = []
+
+    class FlakyQueue:
+        def __init__(self, name):
+            pass
+
+        def enqueue(self, task, job_id, payload):
+            if job_id == job_ids[0]:
+                raise ConnectionError("redis down")
+            enqueued.append(job_id)
+
+    monkeypatch.setattr(dispatch, "get_queue", FlakyQueue)
+    monkeypatch.setattr(dispatch, "JOB_TENANT_QUEUE_DEPTH", RecordingGauge())
+    settings = get_settings().model_copy(update={"JOB_DISPATCH_MAX_IN_FLIGHT": 3})
+
+    assert dispatch.dispatch_pending(job_repo, settings) == job_ids[1:]
+    assert enqueued == job_ids[1:]
+    db_session.expire_all()
+    assert job_repo.get(job_ids[0]).dispatched_at is None
+    assert job_repo.dispatched_load(300.0)[user.id][0] == 2
+
+    # A dispatch whose enqueue was lost without an error is released after the timeout.
+    job_repo.mark_dispatched([job_ids[0]])
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+    timeout = get_settings().JOB_DISPATCH_CLAIM_TIMEOUT_SECONDS
+    assert dispatch.release_unclaimed_jobs() == []
+    later = datetime.utcnow() + timedelta(seconds=timeout + 1)
+    assert job_ids[0] in dispatch.release_unclaimed_jobs(now=later)
+    db_session.expire_all()
+    assert job_repo.get(job_ids[0]).dispatched_at is None
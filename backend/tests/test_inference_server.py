@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.asr.client import InferenceClient, InferenceError
+from app.services.asr.registry import ModelRegistry
+from app.services.asr.server import InferenceServer
+from app.services.asr.streaming import TimedWord
+from app.services.asr.timing import StageTimer
+
+
+class FakeService:
+    pool_size = 1
+
+    def __init__(self, name):
+        self.model_name = name
+
+    def cache_identity(self):
+        return {"model": self.model_name}
+
+    def pool_stats(self):
+        return {"size": 1}
+
+    def transcribe(self, audio, timer=None):
+        if timer is not None:
+            timer.add("decoder", 0.25)
+        if audio.size == 0:
+            raise ValueError("no audio")
+        return "%s heard %d samples" % (self.model_name, audio.size)
+
+    def transcribe_words(self, audio, initial_prompt=None):
+        return [TimedWord(0.0, 0.5, " hello"), TimedWord(0.5, 1.0, " there")]
+
+    def iter_segments(self, audio):
+        for index in range(3):
+            yield {"text": "segment %d" % index, "start": float(index), "end": index + 1.0}
+
+    def unload(self):
+        return True
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    registry = ModelRegistry(lambda name, path: FakeService(name), default_model="tiny")
+    path = str(tmp_path / "asr.sock")
+    server = InferenceServer(registry, path)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(5)
+    yield path
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def test_client_transcribes_through_server(socket_path):
+    client = InferenceClient(socket_path)
+    audio = np.zeros(1600, dtype=np.float32)
+
+    assert client.model_name == "tiny"
+    assert client.cache_identity() == {"model": "tiny"}
+    assert client.transcribe(audio) == "tiny heard 1600 samples"
+    assert client.for_model("small").transcribe(audio) == "small heard 1600 samples"
+    assert client.transcribe_words(audio) == [
+        TimedWord(0.0, 0.5, " hello"),
+        TimedWord(0.5, 1.0, " there"),
+    ]
+    assert [segment["text"] for segment in client.iter_segments(audio)] == [
+        "segment 0",
+        "segment 1",
+        "segment 2",
+    ]
+
+
+def test_client_collects_server_stage_timings(socket_path):
+    timer = StageTimer()
+
+    InferenceClient(socket_path).transcribe(np.zeros(16, dtype=np.float32), timer=timer)
+
+    assert timer.stages == {"decoder": 0.25}
+
+
+def test_server_errors_are_raised_per_request(socket_path):
+    client = InferenceClient(socket_path)
+
+    results = client.transcribe_many([np.zeros(0, dtype=np.float32), np.ones(10, dtype=np.float32)])
+
+    assert isinstance(results[0], InferenceError)
+    assert "no audio" in str(results[0])
+    assert results[1] == "tiny heard 10 samples"
+
+
+def test_warm_up_waits_for_server(socket_path):
+    assert "connect_seconds" in InferenceClient(socket_path).warm_up()
+
+    with pytest.raises(FileNotFoundError):
+        InferenceClient(socket_path + ".missing").warm_up(wait_seconds=0)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect, status
+from fastapi.testclient import TestClient
+
+from app import deps
+from app.domain import repositories, schemas
+from app.infra import auth, db
+from app.main import app
+from app.services.asr.checkpoint import ChunkCheckpoint, MemoryCheckpointStore
+from app.services.job_events import (
+    JobEvents,
+    MemoryJobEventBus,
+    RedisJobEventBus,
+    job_events_channel,
+    publish_job_changed,
+)
+from app.websocket.manager import ConnectionManager
+from tests.conftest import TestingSessionLocal
+
+
+def test_job_events_are_pushed_only_to_the_jobs_users(db_session, monkeypatch):
+    users = repositories.UserRepository(db_session)
+    owner = users.create("events-owner", auth.hash_password("securepass"), "doctor")
+    other = users.create("events-other", auth.hash_password("securepass"), "doctor")
+    job_repo = repositories.JobRepository(db_session)
+    job = job_repo.create(owner.id, schemas.JobCreate(type="transcription"))
+    other_job = job_repo.create(other.id, schemas.JobCreate(type="transcription"))
+
+    bus = MemoryJobEventBus()
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+    monkeypatch.setattr(deps, "get_job_event_bus", lambda: bus)
+    deps.get_job_event_relay.cache_clear()
+    token = auth.create_access_token(subject=owner.id)
+
+    try:
+        with TestClient(app).websocket_connect("/v1/jobs/events?token=%s" % token) as websocket:
+            snapshot = websocket.receive_json()
+            assert snapshot["type"] == "snapshot"
+            assert [item["id"] for item in snapshot["jobs"]] == [job.id]
+
+            publish_job_changed(bus, other_job)
+            JobEvents.for_job(bus, job).progress("transcribing", 50.0)
+            job_repo.claim(job.id)
+            publish_job_changed(bus, job_repo.get(job.id))
+
+            progress = websocket.receive_json()
+            assert (progress["type"], progress["job_id"], progress["progress"]) == (
+                "progress",
+                job.id,
+                50.0,
+            )
+            changed = websocket.receive_json()
+            assert changed["type"] == "job"
+            assert changed["job"]["id"] == job.id
+            assert changed["job"]["status"] == "processing"
+    finally:
+        deps.get_job_event_relay().stop()
+        deps.get_job_event_relay.cache_clear()
+
+
+def test_relayed_events_never_wait_for_a_slow_client():
+    class StalledWebSocket:
+        def __init__(self):
+            self.closed_with = None
+            self.unblock = asyncio.Event()
+
+        async def accept(self):
+            pass
+
+        async def send_json(self, message):
+            await self.unblock.wait()
+
+        async def close(self, code):
+            self.closed_with = code
+
+    async def scenario():
+        manager = ConnectionManager(max_queue=2)
+        websocket = StalledWebSocket()
+        connection = await manager.connect(websocket, user_id=5)
+        await asyncio.sleep(0)  # the sender takes the first message and stalls
+
+        offered = [
+            manager.offer_to_user(5, {"type": "progress", "n": n}, droppable=True) for n in range(4)
+        ]
+        assert offered == [1, 1, 0, 0]
+        assert manager.offer_to_user(5, {"type": "job"}) == 0
+        assert connection.overflowed and not manager.active_connections
+        websocket.unblock.set()
+        await asyncio.sleep(0.01)
+        return websocket.closed_with
+
+    assert asyncio.run(scenario()) == status.WS_1013_TRY_AGAIN_LATER
+
+
+def test_websocket_rejects_invalid_tokens(monkeypatch):
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with TestClient(app).websocket_connect("/v1/jobs/events?token=bogus"):
+            pass
+
+    assert closed.value.code == status.WS_1008_POLICY_VIOLATION
+
+
+def test_redis_bus_publishes_per_user_channels_and_parses_messages():
+    class FakeRedis:
+        def __init__(self):
+            self.published = []
+
+        def publish(self, channel, data):
+            self.published.append((channel, data))
+
+    connection = FakeRedis()
+    bus = RedisJobEventBus(connection)
+    received = []
+
+    bus.publish(7, {"type": "progress", "job_id": 3})
+    channel, data = connection.published[0]
+    RedisJobEventBus._dispatch(
+        lambda user_id, event: received.append((user_id, event)),
+        {"channel": channel.encode(), "data": data.encode()},
+    )
+
+    assert channel == job_events_channel(7)
+    assert received == [(7, json.loads(data))]
+
+
+def test_checkpoint_reports_chunk_progress():
+    reported = []
+    checkpoint = ChunkCheckpoint(
+        MemoryCheckpointStore(), "job:1", on_progress=lambda done, total: reported.append((done, total))
+    )
+
+    checkpoint.begin([(0.0, 30.0), (29.0, 60.0)])
+    checkpoint.record(0, "first")
+    checkpoint.record(1, "second")
+
+    assert reported == [(0, 2), (1, 2), (2, 2)]
@@ -0,0 +1,95 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain import repositories, schemas
+from app.domain.models import JobStatus
+from app.infra import auth, db
+from app.workers import lifecycle
+from tests.conftest import TestingSessionLocal
+
+
+class RecordingQueue:
+    def __init__(self, name, calls):
+        self.name = name
+        self._calls = calls
+
+    def enqueue(self, *args, **kwargs):
+        self._calls.append((self.name, None, args, kwargs))
+
+    def enqueue_in(self, delay, *args, **kwargs):
+        self._calls.append((self.name, delay, args, kwargs))
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+    monkeypatch.setattr(lifecycle, "get_queue", lambda name="default": RecordingQueue(name, calls))
+    return calls
+
+
+def _job(db_session, username, job_type="transcription", **fields):
+    user = repositories.UserRepository(db_session).create(
+        username, auth.hash_password("securepass"), "doctor"
+    )
+    return repositories.JobRepository(db_session).create(
+        user.id, schemas.JobCreate(type=job_type, **fields)
+    )
+
+
+def test_backoff_is_exponential_with_full_jitter():
+    policy = lifecycle.RetryPolicy(base_delay_seconds=10, max_delay_seconds=60)
+    rng = random.Random(0)
+
+    delays = [policy.backoff(attempt, rng) for attempt in (1, 2, 3, 4, 5)]
+
+    assert all(0 <= delay <= ceiling for delay, ceiling in zip(delays, (10, 20, 40, 60, 60)))
+
+
+def test_failed_task_is_retried_then_dead_lettered(db_session, queued, monkeypatch):
+    monkeypatch.setitem(
+        lifecycle.RETRY_POLICIES, "flaky", lifecycle.RetryPolicy(max_attempts=2, base_delay_seconds=1)
+    )
+
+    @lifecycle.job_task("flaky", heartbeat_seconds=60)
+    def flaky(job_id, payload):
+        raise RuntimeError("decoder crashed")
+
+    job = _job(db_session, "lifecycle-retry", priority="urgent")
+    payload = {"priority": "urgent"}
+
+    flaky(job.id, payload)
+    db_session.expire_all()
+    retried = repositories.JobRepository(db_session).get(job.id)
+    assert (retried.status, retried.attempts) == (JobStatus.PENDING.value, 1)
+    assert "decoder crashed" in retried.last_error
+    assert queued[0][0] == "asr-urgent" and queued[0][1] <= timedelta(seconds=1)
+
+    flaky(job.id, payload)
+    db_session.expire_all()
+    failed = repositories.JobRepository(db_session).get(job.id)
+    assert (failed.status, failed.attempts) == (JobStatus.FAILED.value, 2)
+    assert queued[1][0] == lifecycle.DEAD_LETTER_QUEUE
+    assert queued[1][3]["meta"]["attempts"] == 2
+
+
+def test_reaper_requeues_jobs_with_expired_heartbeats(db_session, queued):
+    from app.workers import tasks  # noqa: F401  (registers transcribe_batch)
+
+    job_repo = repositories.JobRepository(db_session)
+    stale = _job(db_session, "lifecycle-stale", input_uri="s3://bucket/a.wav")
+    orphan = _job(db_session, "lifecycle-orphan", "report", input_uri="s3://bucket/c.wav")
+    fresh = _job(db_session, "lifecycle-fresh", input_uri="s3://bucket/b.wav")
+    for job in (stale, orphan, fresh):
+        job_repo.claim(job.id)
+
+    outcomes = lifecycle.reap_stale_jobs(60, now=datetime.utcnow() + timedelta(seconds=120))
+    outcomes = {job_id: outcome for job_id, outcome in outcomes.items() if job_id in {stale.id, orphan.id, fresh.id}}
+
+    assert outcomes[stale.id] == "retried"
+    assert outcomes[orphan.id] == "failed"
+    db_session.expire_all()
+    assert job_repo.get(stale.id).status == JobStatus.PENDING.value
+    assert job_repo.get(orphan.id).status == JobStatus.FAILED.value
@@ -1,6 +1,10 @@
 import types
 from collections import Counter
+from datetime import datetime
 
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.api.v1 import routes_jobs
@@ -23,11 +27,11 @@ def test_create_and_get_job(db_session: Session, monkeypatch) -> None:
     def fake_queue(name: str = "default"):
         class DummyQueue:
             def enqueue(self, *args, **kwargs):
-                dummy_queue.enqueued.append((args, kwargs))
+                dummy_queue.enqueued.append((name, args, kwargs))
 
         return DummyQueue()
 
-    monkeypatch.setattr("app.api.v1.routes_jobs.get_queue", fake_queue)
+    monkeypatch.setattr("app.workers.dispatch.get_queue", fake_queue)
 
     job_repo = repositories.JobRepository(db_session)
     job_in = schemas.JobCreate(type="transcription", input_uri="s3://bucket/audio.wav")
@@ -35,15 +39,50 @@ def test_create_and_get_job(db_session: Session, monkeypatch) -> None:
     assert job_read.type == "transcription"
     assert job_read.created_by_id == user_db.id
     assert dummy_queue.enqueued
+    assert job_read.priority == "routine"
+    assert dummy_queue.enqueued[0][0] == "asr-routine"
+
+    stat_job = routes_jobs.create_job(
+        schemas.JobCreate(type="transcription", input_uri="s3://bucket/stat.wav", priority="stat"),
+        current_user=user_db,
+        job_repo=job_repo,
+    )
+    assert stat_job.priority == "stat"
+    assert dummy_queue.enqueued[1][0] == "asr-stat"
+    assert dummy_queue.enqueued[1][1][2]["priority"] == "stat"
 
     jobs = routes_jobs.list_jobs(current_user=user_db, job_repo=job_repo)
-    assert len(jobs) == 1
+    assert len(jobs) == 2
 
     job_detail = routes_jobs.get_job(job_read.id, current_user=user_db, job_repo=job_repo)
     assert job_detail.id == job_read.id
     assert job_detail.created_by_id == user_db.id
 
 
+def test_job_without_recording_is_rejected(db_session: Session, monkeypatch) -> None:
+    user_db = repositories.UserRepository(db_session).create(
+        "clinician-no-recording", auth.hash_password("securepass"), "doctor"
+    )
+    enqueued = []
+
+    class DummyQueue:
+        def enqueue(self, *args, **kwargs):
+            enqueued.append(args)
+
+    monkeypatch.setattr("app.api.v1.routes_jobs.get_queue", lambda name="default": DummyQueue())
+    monkeypatch.setattr("app.workers.dispatch.get_queue", lambda name="default": DummyQueue())
+    job_repo = repositories.JobRepository(db_session)
+
+    with pytest.raises(HTTPException) as rejected:
+        routes_jobs.create_job(
+            schemas.JobCreate(type="transcription"), current_user=user_db, job_repo=job_repo
+        )
+
+    assert rejected.value.status_code == 422
+    assert enqueued == []
+    assert job_repo.list_for_user(user_db.id) == []
+
+
 def test_job_history_stats(db_session: Session) -> None:
     user_repo = repositories.UserRepository(db_session)
     user_db = user_repo.create(
@@ -66,13 +105,10 @@ def test_job_history_stats(db_session: Session) -> None:
         job_in=schemas.JobCreate(type="transcription"),
     )
 
-    job_repo.update_status(job_processing.id, JobStatus.PROCESSING.value)
-    job_repo.update_status(
-        job_completed.id,
-        JobStatus.COMPLETED.value,
-        output_uri="s3://bucket/result.txt",
-    )
-    job_repo.update_status(job_failed.id, JobStatus.FAILED.value)
+    job_repo.claim(job_processing.id)
+    job_repo.claim(job_completed.id)
+    job_repo.complete(job_completed.id, output_uri="s3://bucket/result.txt")
+    job_repo.transition(job_failed.id, JobStatus.FAILED.value)
 
     history = routes_jobs.get_job_history(current_user=user_db, job_repo=job_repo)
 
@@ -113,9 +149,9 @@ def test_review_queue_filters_statuses(db_session: Session) -> None:
         created_by_id=user_db.id, job_in=schemas.JobCreate(type="transcription")
     )
 
-    job_repo.update_status(job_processing.id, JobStatus.PROCESSING.value)
-    job_repo.update_status(job_completed.id, JobStatus.COMPLETED.value)
-    job_repo.update_status(job_failed.id, JobStatus.FAILED.value)
+    job_repo.transition_many([job_processing.id, job_completed.id], JobStatus.PROCESSING.value)
+    job_repo.transition(job_completed.id, JobStatus.COMPLETED.value)
+    job_repo.transition(job_failed.id, JobStatus.FAILED.value)
 
     queue = routes_jobs.get_review_queue(current_user=user_db, job_repo=job_repo)
 
@@ -176,3 +212,91 @@ def test_jobs_visible_to_assignee(db_session: Session) -> None:
     assert retrieved.id == job.id
     assert retrieved.assignee_id == receptionist.id
 
+
+
+def test_repeated_submission_returns_the_existing_job(db_session: Session, monkeypatch) -> None:
+    user_db = repositories.UserRepository(db_session).create(
+        "clinician-idempotent", auth.hash_password("securepass"), "doctor"
+    )
+    enqueued = []
+
+    class DummyQueue:
+        def enqueue(self, *args, **kwargs):
+            enqueued.append(args)
+
+    monkeypatch.setattr("app.workers.dispatch.get_queue", lambda name="default": DummyQueue())
+    monkeypatch.setattr(
+        "app.api.v1.routes_jobs.storage.storage_client.content_hash", lambda key: "etag-1"
+    )
+    job_repo = repositories.JobRepository(db_session)
+    job_in = schemas.JobCreate(type="transcription", input_uri="s3://bucket/visit.wav")
+
+    first = routes_jobs.create_job(job_in, "retry-key", current_user=user_db, job_repo=job_repo)
+    again = routes_jobs.create_job(job_in, "retry-key", current_user=user_db, job_repo=job_repo)
+    derived = routes_jobs.create_job(job_in, current_user=user_db, job_repo=job_repo)
+    derived_again = routes_jobs.create_job(job_in, current_user=user_db, job_repo=job_repo)
+
+    assert again.id == first.id
+    assert derived_again.id == derived.id != first.id
+    assert len(enqueued) == 2
+
+    with pytest.raises(HTTPException) as conflict:
+        routes_jobs.create_job(
+            schemas.JobCreate(type="transcription", input_uri="s3://bucket/other.wav"),
+            "retry-key",
+            current_user=user_db,
+            job_repo=job_repo,
+        )
+    assert conflict.value.status_code == 409
+
+    job_repo.transition(derived.id, JobStatus.PROCESSING.value)
+    job_repo.mark_failed(derived.id, "decoder crashed")
+    resubmitted = routes_jobs.create_job(job_in, current_user=user_db, job_repo=job_repo)
+    assert resubmitted.id != derived.id
+    assert len(enqueued) == 3
+
+
+def test_only_one_worker_claims_a_job(db_session: Session) -> None:
+    user_db = repositories.UserRepository(db_session).create(
+        "clinician-claim", auth.hash_password("securepass"), "doctor"
+    )
+    job_repo = repositories.JobRepository(db_session)
+    job = job_repo.create(user_db.id, schemas.JobCreate(type="transcription"))
+
+    claimed = job_repo.claim(job.id)
+
+    assert claimed is not None and claimed.status == JobStatus.PROCESSING.value
+    assert job_repo.claim(job.id) is None
+
+
+def test_transitions_follow_the_state_machine_in_one_statement(db_session: Session) -> None:
+    user_db = repositories.UserRepository(db_session).create(
+        "clinician-transition", auth.hash_password("securepass"), "doctor"
+    )
+    job_repo = repositories.JobRepository(db_session)
+    job_ids = [
+        job_repo.create(user_db.id, schemas.JobCreate(type="transcription")).id for _ in range(3)
+    ]
+    job_repo.claim(job_ids[0])
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        claimed = job_repo.transition_many(
+            job_ids, JobStatus.PROCESSING.value, heartbeat_at=datetime.utcnow()
+        )
+        assert sorted(job.id for job in claimed) == job_ids[1:]
+        completed = job_repo.complete(job_ids[1], output_uri="jobs/out.txt")
+        assert (completed.status, completed.output_uri) == (JobStatus.COMPLETED.value, "jobs/out.txt")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(statements) == 2
+    assert all(statement.lstrip().upper().startswith("UPDATE") for statement in statements)
+
+    assert job_repo.transition(job_ids[1], JobStatus.PENDING.value) is None
+    with pytest.raises(ValueError):
+        job_repo.transition(
+            job_ids[2], JobStatus.COMPLETED.value, from_statuses=[JobStatus.PENDING.value]
+        )
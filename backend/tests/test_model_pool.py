@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from app.services.asr.pool import ModelPool, cpu_slices
+
+
+def test_instances_are_created_lazily_up_to_size():
+    created = []
+
+    def factory(index):
+        created.append(index)
+        return object()
+
+    pool = ModelPool(factory, size=2)
+    with pool.checkout() as first:
+        with pool.checkout() as second:
+            assert first is not second
+    with pool.checkout():
+        pass
+
+    assert created == [0, 1]
+    assert pool.stats()["checkouts"] == 3
+    assert pool.stats()["in_use"] == 0
+
+
+def test_checkout_waits_for_a_free_instance():
+    pool = ModelPool(lambda index: object(), size=1)
+    acquired = []
+
+    def borrower():
+        with pool.checkout() as instance:
+            acquired.append(instance)
+
+    with pool.checkout() as held:
+        thread = threading.Thread(target=borrower)
+        thread.start()
+        thread.join(timeout=0.1)
+        assert thread.is_alive()
+    thread.join(timeout=5)
+
+    assert acquired == [held]
+
+
+def test_checkout_times_out_when_pool_is_busy():
+    pool = ModelPool(lambda index: object(), size=1)
+
+    with pool.checkout():
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.05):
+                pass
+
+
+def test_warm_creates_every_instance():
+    pool = ModelPool(lambda index: index, size=3)
+    pool.warm()
+
+    assert pool.loaded == 3
+
+
+def test_cpu_slices_are_disjoint():
+    slices = cpu_slices(1)
+    assert len(slices) == 1
+
+    many = cpu_slices(2, threads_per_instance=1)
+    if all(many):
+        assert not (many[0] & many[1])
+        assert all(len(cores) == 1 for cores in many)
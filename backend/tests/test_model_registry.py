@@ -0,0 +1,152 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.asr.registry import ModelRegistry, discover_local_models, parse_model_routes
+
+
+class FakeService:
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.pool_size = 1
+        self.busy = False
+        self.unloaded = False
+
+    def unload(self):
+        if self.busy:
+            return False
+        self.unloaded = True
+        return True
+
+
+def _registry(**kwargs):
+    created = []
+
+    def factory(name, path):
+        service = FakeService(name, path)
+        created.append(service)
+        return service
+
+    return ModelRegistry(factory, default_model="tiny", **kwargs), created
+
+
+def test_parse_model_routes():
+    routes = parse_model_routes("draft=tiny, final = small,specialty:Cardiology=medium,bad")
+
+    assert routes == {"draft": "tiny", "final": "small", "specialty:cardiology": "medium"}
+
+
+def test_select_prefers_specialty_then_job_type():
+    registry, _ = _registry(routes={"final": "small", "specialty:cardiology": "medium"})
+
+    assert registry.select(job_type="final", specialty="Cardiology") == "medium"
+    assert registry.select(job_type="final", specialty="radiology") == "small"
+    assert registry.select() == "tiny"
+
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    registry, created = _registry(memory_budget_mb=700)
+    registry.get("tiny")
+    small = registry.get("small")
+    registry.get("tiny")
+
+    registry.get("small.en")
+
+    assert small.unloaded
+    assert registry.resident_models() == ["tiny", "small.en"]
+
+
+def test_busy_models_are_not_evicted():
+    registry, _ = _registry(memory_budget_mb=700)
+    small = registry.get("small")
+    small.busy = True
+
+    registry.get("small.en")
+
+    assert not small.unloaded
+    assert set(registry.resident_models()) == {"small", "small.en"}
+
+
+def test_leased_models_are_not_evicted_until_released():
+    registry, _ = _registry(idle_timeout_seconds=0.001)
+
+    with registry.lease("base") as base:
+        time.sleep(0.01)
+        assert registry.evict_idle() == []
+        assert not base.unloaded
+
+    time.sleep(0.01)
+    assert registry.evict_idle() == ["base"]
+    assert base.unloaded
+
+
+def test_idle_models_are_unloaded_but_default_is_pinned():
+    registry, _ = _registry(idle_timeout_seconds=0.001)
+    registry.get("tiny")
+    base = registry.get("base")
+
+    time.sleep(0.01)
+    assert registry.evict_idle() == ["base"]
+    assert base.unloaded
+    assert registry.resident_models() == ["tiny"]
+
+
+def test_discover_local_models(tmp_path):
+    (tmp_path / "cardio-small").mkdir()
+    (tmp_path / "cardio-small" / "model.bin").write_bytes(b"0" * 10)
+    (tmp_path / "notes").mkdir()
+
+    models = discover_local_models(str(tmp_path))
+
+    assert list(models) == ["cardio-small"]
+
+    registry, created = _registry(model_dir=str(tmp_path))
+    registry.get("cardio-small")
+    assert created[-1].path == str(tmp_path / "cardio-small")
+
+
+def test_cold_load_does_not_block_other_models():
+    loading = threading.Event()
+    release = threading.Event()
+    created = []
+
+    def factory(name, path):
+        if name == "large-v3":
+            loading.set()
+            release.wait(5)
+        service = FakeService(name, path)
+        created.append(service)
+        return service
+
+    registry = ModelRegistry(factory, default_model="tiny")
+    tiny = registry.get("tiny")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(registry.get, "large-v3")
+        assert loading.wait(5)
+        second = executor.submit(registry.get, "large-v3")
+
+        assert registry.get("tiny") is tiny
+        with registry.lease("base") as base:
+            assert base.name == "base"
+        assert not first.done()
+        release.set()
+        assert first.result(5) is second.result(5)
+
+    assert [service.name for service in created].count("large-v3") == 1
+
+
+def test_failed_load_is_not_kept():
+    def factory(name, path):
+        if name == "broken":
+            raise OSError("model files missing")
+        return FakeService(name, path)
+
+    registry = ModelRegistry(factory, default_model="tiny")
+
+    with pytest.raises(OSError):
+        with registry.lease("broken"):
+            pass
+    assert registry.resident_models() == []
@@ -0,0 +1,109 @@
+import functools
+import os
+import time
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+
+from app.services.asr import whisper_service
+from app.services.asr.executor import ProcessPoolTranscriber
+from app.services.asr.timing import StageTimer
+
+
+class FakeTranscriber:
+    """Built inside each worker process by the pool's initializer."""
+
+    def __init__(self, crash_marker=None):
+        self.crash_marker = crash_marker
+
+    def transcribe(self, audio, timer=None):
+        if audio.size == 0:
+            raise ValueError("no audio")
+        if self.crash_marker and not os.path.exists(self.crash_marker):
+            open(self.crash_marker, "w").close()
+            os._exit(1)
+        if timer is not None:
+            timer.add("decoder", 0.25)
+        return "pid %d heard %d samples" % (os.getpid(), audio.size)
+
+    def slow(self, seconds):
+        time.sleep(seconds)
+        return "slept"
+
+    def iter_words(self, count):
+        for index in range(count):
+            yield "word %d" % index
+
+
+def test_process_pool_transcribes_outside_the_parent():
+    pool = ProcessPoolTranscriber(FakeTranscriber, workers=1)
+    try:
+        transcript = pool.transcribe(np.zeros(160, dtype=np.float32))
+        results = pool.transcribe_many([np.zeros(0, dtype=np.float32), np.ones(8, dtype=np.float32)])
+    finally:
+        pool.shutdown()
+
+    assert transcript.endswith("heard 160 samples")
+    assert "pid %d " % os.getpid() not in transcript
+    assert isinstance(results[0], ValueError)
+    assert results[1].endswith("heard 8 samples")
+
+
+def test_process_pool_restarts_after_worker_crash(tmp_path):
+    marker = str(tmp_path / "crashed")
+    pool = ProcessPoolTranscriber(functools.partial(FakeTranscriber, crash_marker=marker), workers=1)
+    try:
+        transcript = pool.transcribe(np.zeros(16, dtype=np.float32))
+    finally:
+        pool.shutdown()
+
+    assert transcript.endswith("heard 16 samples")
+    assert pool.restarts == 1
+
+
+def test_process_pool_merges_worker_stage_times_and_drains_generators():
+    pool = ProcessPoolTranscriber(FakeTranscriber, workers=1)
+    timer = StageTimer()
+    try:
+        transcript = pool.call("transcribe", np.zeros(4, dtype=np.float32), timer=timer)
+        words = pool.call("iter_words", 2)
+    finally:
+        pool.shutdown()
+
+    assert transcript.endswith("heard 4 samples")
+    assert timer.stages == {"decoder": 0.25}
+    assert words == ["word 0", "word 1"]
+
+
+def test_shutdown_resolves_queued_requests():
+    pool = ProcessPoolTranscriber(FakeTranscriber, workers=1)
+    pool.warm_up()
+    futures = [pool._submit("slow", (0.2,), False) for _ in range(6)]
+
+    assert pool.in_flight == 6
+    assert not pool.shutdown_if_idle()
+    pool.shutdown()
+
+    outcomes = []
+    for future in futures:
+        try:
+            outcomes.append(future.result(timeout=10)[0])
+        except CancelledError:
+            outcomes.append("cancelled")
+    assert "cancelled" in outcomes
+    assert pool.in_flight == 0
+    assert pool.shutdown_if_idle()
+
+
+def test_whisper_service_stays_loaded_while_worker_requests_run():
+    service = whisper_service.WhisperService("tiny", executor="process")
+    service._process_pool._in_flight = 1
+
+    assert service.in_use
+    assert not service.unload()
+
+
+def test_whisper_service_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        whisper_service.WhisperService("tiny", executor="gpu-cluster")
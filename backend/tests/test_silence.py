@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from app.services.asr.silence import SilenceTrim, trim_silence
+from app.utils.audio import SAMPLE_RATE
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+
+
+def _noise(seconds, amplitude=1e-4):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * amplitude).astype(np.float32)
+
+
+def test_long_silences_are_compressed_and_times_map_back():
+    audio = np.concatenate([_noise(2), _tone(1), _noise(3), _tone(1), _noise(2)])
+
+    trimmed = trim_silence(audio, min_silence_ms=600, keep_silence_ms=200)
+
+    # Two seconds of speech plus one 0.2s gap and 0.1s pads at each end.
+    assert trimmed.kept_seconds == pytest.approx(2.4, abs=0.07)
+    assert trimmed.skipped_ratio == pytest.approx(1 - 2.4 / 9, abs=0.01)
+    # Speech that started at 6.0s in the original follows the 0.2s gap.
+    second_tone_start = 0.1 + 1.0 + 0.2
+    assert trimmed.offsets.to_original(second_tone_start) == pytest.approx(6.0, abs=0.04)
+    assert trimmed.offsets.to_original(0.1) == pytest.approx(2.0, abs=0.04)
+
+
+def test_short_pauses_are_kept():
+    audio = np.concatenate([_tone(1), _noise(0.3), _tone(1)])
+
+    trimmed = trim_silence(audio, min_silence_ms=600)
+
+    assert trimmed.audio.size == audio.size
+    assert trimmed.skipped_ratio == 0.0
+    assert trimmed.offsets.to_original(1.5) == pytest.approx(1.5)
+
+
+def test_loud_click_does_not_silence_quiet_speech():
+    click = np.full(SAMPLE_RATE // 20, 0.9, dtype=np.float32)
+    audio = np.concatenate([_noise(1), click, _tone(2, amplitude=0.01), _noise(1)])
+
+    trimmed = trim_silence(audio, min_silence_ms=600, keep_silence_ms=200)
+
+    # The click, the quiet speech and the 0.1s pads at each end are kept.
+    assert trimmed.kept_seconds == pytest.approx(2.25, abs=0.07)
+
+
+def test_all_silence_is_removed():
+    trimmed = trim_silence(np.zeros(SAMPLE_RATE * 2, dtype=np.float32))
+
+    assert trimmed.audio.size == 0
+    assert trimmed.skipped_ratio == 1.0
+
+
+def test_untrimmed_is_identity():
+    audio = _tone(0.5)
+
+    trimmed = SilenceTrim.untrimmed(audio)
+
+    assert trimmed.audio is audio
+    assert trimmed.offsets.to_original(0.25) == 0.25
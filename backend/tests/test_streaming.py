@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from fastapi import WebSocketDisconnect, status
+from fastapi.testclient import TestClient
+
+from app import deps
+from app.domain import repositories
+from app.infra import auth, db
+from app.main import app
+from app.services.asr.streaming import AudioFrameDecoder, StreamingTranscriber, TimedWord
+from app.utils.audio import SAMPLE_RATE
+from tests.conftest import TestingSessionLocal
+
+
+def _words(*texts):
+    return [TimedWord(index * 0.5, index * 0.5 + 0.4, text) for index, text in enumerate(texts)]
+
+
+def test_words_are_committed_once_two_hypotheses_agree():
+    hypotheses = iter(
+        [
+            _words("the", "patient"),
+            _words("the", "patient", "is"),
+            _words("is", "stable"),
+        ]
+    )
+    transcriber = StreamingTranscriber(lambda audio, prompt: next(hypotheses), min_chunk_seconds=1.0)
+
+    transcriber.append(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert transcriber.ready
+    first = transcriber.process()
+    assert [event.type for event in first] == ["partial"]
+    assert first[0].text == "the patient"
+
+    transcriber.append(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    second = transcriber.process()
+    assert [event.type for event in second] == ["committed", "partial"]
+    assert second[0].text == "the patient"
+    assert second[1].text == "is"
+
+    final = transcriber.flush()
+    assert final[0].text == "is stable"
+    assert transcriber.transcript == "the patient is stable"
+
+
+def test_buffer_is_force_committed_past_the_limit():
+    transcriber = StreamingTranscriber(
+        lambda audio, prompt: _words("hello"), min_chunk_seconds=0.5, max_buffer_seconds=1.0
+    )
+
+    transcriber.append(np.zeros(2 * SAMPLE_RATE, dtype=np.float32))
+    events = transcriber.process()
+
+    assert events[0].type == "committed"
+    assert transcriber.buffered_seconds < 2.0
+
+
+def test_pcm_frames_are_scaled_to_float():
+    decoder = AudioFrameDecoder("pcm_s16le")
+
+    samples = decoder.decode(np.array([0, 16384, -32768], dtype="<i2").tobytes())
+
+    assert samples.dtype == np.float32
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_decoding_failure_closes_the_stream_at_once(db_session, monkeypatch):
+    class BrokenService:
+        def transcribe_words(self, audio, prompt=None):
+            raise RuntimeError("decoder crashed")
+
+    user = repositories.UserRepository(db_session).create(
+        "stream-broken", auth.hash_password("securepass"), "doctor"
+    )
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+    app.dependency_overrides[deps.get_whisper_service] = BrokenService
+    token = auth.create_access_token(subject=user.id)
+    try:
+        with TestClient(app).websocket_connect("/v1/transcribe/stream?token=%s" % token) as websocket:
+            assert websocket.receive_json()["type"] == "ready"
+            websocket.send_bytes(np.zeros(SAMPLE_RATE * 2, dtype=np.int16).tobytes())
+
+            assert websocket.receive_json() == {"type": "error", "detail": "Transcription failed"}
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+    finally:
+        app.dependency_overrides.pop(deps.get_whisper_service, None)
+
+    assert closed.value.code == status.WS_1011_INTERNAL_ERROR
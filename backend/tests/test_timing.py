@@ -0,0 +1,53 @@
+import time
+import types
+
+import numpy as np
+
+from app.services.asr import whisper_service
+from app.services.asr.timing import StageTimer, duration_bucket
+
+
+def test_stage_timer_accumulates_and_renders_server_timing():
+    timer = StageTimer()
+    timer.add("decode", 0.0125)
+    timer.add("inference", 0.5)
+    timer.add("decode", 0.0125)
+
+    assert timer.as_milliseconds() == {"decode": 25.0, "inference": 500.0}
+    assert timer.server_timing() == "decode;dur=25.0, inference;dur=500.0"
+
+
+def test_duration_bucket():
+    assert duration_bucket(3) == "lt_15s"
+    assert duration_bucket(59.9) == "15s_1m"
+    assert duration_bucket(600) == "5m_20m"
+    assert duration_bucket(3600) == "gte_20m"
+
+
+def test_transcribe_splits_encoder_and_decoder_time(monkeypatch):
+    class FakeModel:
+        def encode(self, features):
+            time.sleep(0.02)
+            return features
+
+        def transcribe(self, audio):
+            def segments():
+                self.encode(audio)
+                yield types.SimpleNamespace(text="hello", start=0.0, end=0.1)
+
+            return segments(), None
+
+    monkeypatch.setattr(
+        whisper_service.WhisperService,
+        "_load_model",
+        lambda self, index: whisper_service._instrument_encoder(FakeModel()),
+    )
+    service = whisper_service.WhisperService("tiny")
+    timer = StageTimer()
+
+    transcript = service.transcribe(np.zeros(1600, dtype=np.float32), timer=timer)
+
+    assert transcript == "hello"
+    assert list(timer.stages) == ["language_detection", "encoder", "decoder"]
+    assert timer.stages["encoder"] >= 0.02
+    assert timer.stages["decoder"] < timer.stages["encoder"]
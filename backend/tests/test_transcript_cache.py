@@ -0,0 +1,61 @@
+from app.services.asr.cache import RedisTranscriptStore, TranscriptCache, cache_key
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+class BrokenRedis:
+    def get(self, key):
+        raise ConnectionError("redis is down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("redis is down")
+
+
+def test_cache_key_depends_on_model_config():
+    base = cache_key("abc", {"model": "tiny", "compute_type": "int8"})
+
+    assert base == cache_key("abc", {"compute_type": "int8", "model": "tiny"})
+    assert base != cache_key("abc", {"model": "tiny", "compute_type": "float32"})
+    assert base.startswith("abc:")
+
+
+def test_lru_evicts_least_recently_used_by_size():
+    cache = TranscriptCache(max_bytes=10)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    assert cache.get("a") == "aaaa"
+
+    cache.set("c", "cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+    assert cache.size_bytes == 8
+
+
+def test_shared_store_hits_are_promoted_to_memory():
+    redis = FakeRedis()
+    RedisTranscriptStore(redis).set("key", "stored transcript")
+    cache = TranscriptCache(store=RedisTranscriptStore(redis))
+
+    assert cache.get("key") == "stored transcript"
+    redis.values.clear()
+    assert cache.get("key") == "stored transcript"
+
+
+def test_store_errors_are_treated_as_misses():
+    cache = TranscriptCache(store=RedisTranscriptStore(BrokenRedis()))
+
+    cache.set("key", "transcript")
+
+    assert cache.get("key") == "transcript"
+    assert cache.get("other") is None
@@ -0,0 +1,68 @@
+import asyncio
+
+from fastapi import Response
+
+from app.api.v1 import routes_health
+from app.services.asr.warmup import WarmupState, WarmupStatus, warm_up
+
+
+def test_warm_up_marks_state_ready_and_records_timings():
+    state = WarmupState()
+
+    asyncio.run(warm_up("tiny", lambda: {"load_seconds": 0.5}, state))
+
+    assert state.status is WarmupStatus.READY
+    assert state.ready
+    assert state.timings == {"load_seconds": 0.5}
+    assert state.cold_start_seconds is not None
+
+
+def test_warm_up_waits_for_routed_models():
+    state = WarmupState()
+    warmed = []
+
+    def warm(name):
+        return lambda: warmed.append(name) or {"load_seconds": 0.1}
+
+    def broken():
+        raise RuntimeError("model files missing")
+
+    asyncio.run(warm_up("small", warm("small"), state, routed={"medium": warm("medium")}))
+
+    assert warmed == ["small", "medium"]
+    assert state.status is WarmupStatus.READY
+    assert state.timings == {"load_seconds": 0.1}
+
+    asyncio.run(warm_up("small", warm("small"), state, routed={"large": broken}))
+
+    assert state.status is WarmupStatus.FAILED
+    assert not state.ready
+
+
+def test_warm_up_failure_keeps_instance_not_ready():
+    state = WarmupState()
+
+    def broken():
+        raise RuntimeError("model files missing")
+
+    asyncio.run(warm_up("tiny", broken, state))
+
+    assert state.status is WarmupStatus.FAILED
+    assert not state.ready
+    assert state.as_dict()["error"] == "model files missing"
+
+
+def test_ready_reports_503_until_models_are_warm(monkeypatch):
+    state = WarmupState()
+    monkeypatch.setattr(routes_health, "warmup_state", state)
+    monkeypatch.setattr(routes_health, "health_check", lambda: True)
+
+    response = Response()
+    body = routes_health.ready(response)
+    assert response.status_code == 503
+    assert body["asr"]["status"] == "pending"
+
+    state.status = WarmupStatus.READY
+    response = Response()
+    routes_health.ready(response)
+    assert response.status_code == 200
@@ -1,6 +1,10 @@
+import types
+
+import numpy as np
 import pytest
 
 from app.services.asr import whisper_service
+from app.utils.audio import AudioChunk
 
 
 def test_resolve_model_name_alias(monkeypatch):
@@ -41,3 +45,122 @@ def test_resolve_model_name_invalid(monkeypatch):
         whisper_service.WhisperService._resolve_model_name("unknown-model")
 
     assert "Unknown Whisper model 'unknown-model'" in str(exc.value)
+
+
+def test_long_audio_is_transcribed_in_chunks(monkeypatch):
+    monkeypatch.setattr(
+        whisper_service,
+        "AVAILABLE_MODELS",
+        {"tiny", "tiny.en"},
+        raising=False,
+    )
+
+    chunk_texts = iter(["first part of the note", "the note continues"])
+
+    class FakeModel:
+        def transcribe(self, audio):
+            return [types.SimpleNamespace(text=next(chunk_texts), start=0.0, end=30.0)], None
+
+    chunks = [
+        AudioChunk(index=0, start=0.0, end=30.0, audio=np.zeros(10, dtype=np.float32)),
+        AudioChunk(index=1, start=29.0, end=60.0, audio=np.zeros(10, dtype=np.float32)),
+    ]
+    monkeypatch.setattr(whisper_service, "split_audio", lambda audio, **kwargs: chunks)
+
+    monkeypatch.setattr(
+        whisper_service.WhisperService, "_load_model", lambda self, index: FakeModel()
+    )
+    service = whisper_service.WhisperService(
+        "tiny", chunk_min_audio_seconds=1.0, chunk_workers=1
+    )
+
+    transcript = service.transcribe(np.zeros(whisper_service.SAMPLE_RATE * 2, dtype=np.float32))
+
+    assert transcript == "first part of the note continues"
+
+
+def test_transcribe_segments_returns_whisper_segments_in_recording_time(monkeypatch):
+    decoded = iter(
+        [
+            [(" First part", 0.0, 20.0), (" of the note.", 28.5, 29.8)],
+            [(" the note.", 0.0, 0.8), (" It continues.", 1.0, 5.0)],
+        ]
+    )
+
+    class FakeModel:
+        def transcribe(self, audio):
+            segments = [
+                types.SimpleNamespace(text=text, start=start, end=end)
+                for text, start, end in next(decoded)
+            ]
+            return segments, None
+
+    chunks = [
+        AudioChunk(index=0, start=0.0, end=30.0, audio=np.zeros(10, dtype=np.float32)),
+        AudioChunk(index=1, start=29.0, end=60.0, audio=np.zeros(10, dtype=np.float32)),
+    ]
+    monkeypatch.setattr(whisper_service, "split_audio", lambda audio, **kwargs: chunks)
+    monkeypatch.setattr(
+        whisper_service.WhisperService, "_load_model", lambda self, index: FakeModel()
+    )
+    service = whisper_service.WhisperService(
+        "tiny", chunk_min_audio_seconds=1.0, chunk_workers=1
+    )
+
+    transcript, segments = service.transcribe_segments(
+        np.zeros(whisper_service.SAMPLE_RATE * 2, dtype=np.float32)
+    )
+
+    assert transcript == "First part of the note. It continues."
+    # "the note." decoded again at 29.0-29.8 lies before the overlap's middle.
+    assert segments == [
+        {"index": 0, "start": 0.0, "end": 20.0, "text": "First part"},
+        {"index": 1, "start": 28.5, "end": 29.8, "text": "of the note."},
+        {"index": 2, "start": 30.0, "end": 34.0, "text": "It continues."},
+    ]
+
+
+def test_short_recording_keeps_whisper_segments(monkeypatch):
+    class FakeModel:
+        def transcribe(self, audio):
+            segments = [
+                types.SimpleNamespace(text=" Blood pressure normal.", start=0.0, end=2.4),
+                types.SimpleNamespace(text=" Follow up in two weeks.", start=2.4, end=4.9),
+            ]
+            return segments, None
+
+    monkeypatch.setattr(
+        whisper_service.WhisperService, "_load_model", lambda self, index: FakeModel()
+    )
+    service = whisper_service.WhisperService("tiny")
+
+    transcript, segments = service.transcribe_segments(np.zeros(1600, dtype=np.float32))
+
+    assert transcript == "Blood pressure normal. Follow up in two weeks."
+    assert [(segment["start"], segment["end"]) for segment in segments] == [(0.0, 2.4), (2.4, 4.9)]
+
+
+def test_iter_segments_yields_segments_lazily(monkeypatch):
+    decoded = []
+
+    def segments():
+        for index, text in enumerate([" Hello.", " Second segment."]):
+            decoded.append(index)
+            yield types.SimpleNamespace(text=text, start=index, end=index + 1, avg_logprob=-0.1)
+
+    class FakeModel:
+        def transcribe(self, audio):
+            return segments(), None
+
+    monkeypatch.setattr(
+        whisper_service.WhisperService, "_load_model", lambda self, index: FakeModel()
+    )
+    service = whisper_service.WhisperService("tiny")
+
+    stream = service.iter_segments(np.zeros(10, dtype=np.float32))
+    first = next(stream)
+
+    assert first == {"text": "Hello.", "start": 0, "end": 1, "avg_logprob": -0.1}
+    assert decoded == [0]
+    assert [segment["text"] for segment in stream] == ["Second segment."]
+    assert service.pool_stats()["in_use"] == 0
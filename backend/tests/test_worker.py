@@ -0,0 +1,61 @@
+import time
+import types
+
+from app.services.asr.pool import ModelPool
+from app.workers import worker
+
+
+class FakeJob:
+    def __init__(self, job_id, fn):
+        self.id = job_id
+        self.meta = {}
+        self._fn = fn
+
+    def perform(self):
+        return self._fn()
+
+
+def _slow_model(index):
+    time.sleep(0.02)
+    return object()
+
+
+def test_worker_reports_model_load_overhead_per_job(monkeypatch):
+    monkeypatch.setattr(worker.SimpleWorker, "perform_job", lambda self, job, queue: job.perform())
+    pool = ModelPool(_slow_model, name="worker-test")
+    queue = types.SimpleNamespace(name="asr-routine")
+    rq_worker = worker.ModelResidentWorker([queue])
+
+    def use_model():
+        with pool.checkout():
+            return "done"
+
+    cold = FakeJob("cold", use_model)
+    warm = FakeJob("warm", use_model)
+    rq_worker.perform_job(cold, queue)
+    rq_worker.perform_job(warm, queue)
+
+    assert cold.meta["model_load_seconds"] > 0
+    assert warm.meta["model_load_seconds"] == 0
+
+
+def test_preload_warms_default_and_routed_models(monkeypatch):
+    warmed = []
+
+    class FakeEngine:
+        def __init__(self, name):
+            self.name = name
+
+        def warm_up(self):
+            warmed.append(self.name)
+            return {"load_seconds": 0.1}
+
+    settings = types.SimpleNamespace(
+        ASR_MODEL="small", ASR_MODEL_ROUTES="final=medium,specialty:cardiology=small"
+    )
+    monkeypatch.setattr(worker.deps, "get_asr_engine", lambda settings, name: FakeEngine(name))
+
+    timings = worker.preload_models(settings)
+
+    assert warmed == ["small", "medium"]
+    assert set(timings) == {"small", "medium"}
@@ -0,0 +1,122 @@
+import io
+import json
+import wave
+
+import numpy as np
+
+from app.domain import repositories, schemas
+from app.domain.models import JobStatus
+from app.infra import auth, db, storage
+from app.workers import tasks
+from tests.conftest import TestingSessionLocal
+
+
+def _wav_bytes(seconds: float) -> bytes:
+    t = np.arange(int(seconds * 16000)) / 16000
+    samples = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(16000)
+        handle.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe_segments(self, audio, *, checkpoint=None, timer=None):
+        self.calls.append((audio.size, checkpoint.key))
+        return "patient is stable", [{"index": 0, "start": 0.0, "end": 2.0, "text": "patient is stable"}]
+
+
+def test_transcribe_batch_streams_input_and_stores_outputs(db_session, monkeypatch):
+    user = repositories.UserRepository(db_session).create(
+        "worker-doctor", auth.hash_password("securepass"), "doctor"
+    )
+    patient = repositories.PatientRepository(db_session).create(
+        patient_identifier="PAT-W1", patient_name="Jane Roe"
+    )
+    transcription = repositories.TranscriptionRepository(db_session).create(
+        patient_id=patient.id, doctor_specialty=None, transcript_text="", receptionist_id=None
+    )
+    job = repositories.JobRepository(db_session).create(
+        user.id,
+        schemas.JobCreate(
+            type="transcription",
+            input_uri="s3://test-bucket/uploads/visit.wav",
+            transcription_id=transcription.id,
+        ),
+    )
+
+    wav = _wav_bytes(2.0)
+    stored = {}
+    downloaded = []
+
+    def download_fileobj(key, fileobj):
+        downloaded.append(key)
+        fileobj.write(wav)
+        return len(wav)
+
+    def put_bytes(key, data, content_type=None):
+        stored[key] = data
+        return key
+
+    engine = FakeEngine()
+    monkeypatch.setattr(storage.storage_client, "download_fileobj", download_fileobj)
+    monkeypatch.setattr(storage.storage_client, "put_bytes", put_bytes)
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+    monkeypatch.setattr(tasks.deps, "get_asr_engine", lambda settings: engine)
+
+    tasks.transcribe_batch(job.id, {"input_uri": job.input_uri})
+
+    assert downloaded == ["uploads/visit.wav"]
+    assert engine.calls == [(32000, "job:%d" % job.id)]
+    assert stored["jobs/%d/attempts/1/transcript.txt" % job.id] == b"patient is stable"
+    segments = json.loads(stored["jobs/%d/attempts/1/segments.json" % job.id])["segments"]
+    assert segments[0]["text"] == "patient is stable"
+
+    db_session.expire_all()
+    finished = repositories.JobRepository(db_session).get(job.id)
+    assert finished.status == JobStatus.COMPLETED.value
+    assert finished.output_uri == "jobs/%d/attempts/1/transcript.txt" % job.id
+    assert finished.input_bytes == len(wav)
+    assert finished.audio_seconds == 2.0
+    assert finished.processing_rtf > 0
+    db_session.refresh(transcription)
+    assert transcription.transcript_text == "patient is stable"
+
+
+def test_superseded_attempt_writes_nothing(db_session, monkeypatch):
+    user = repositories.UserRepository(db_session).create(
+        "worker-superseded", auth.hash_password("securepass"), "doctor"
+    )
+    job = repositories.JobRepository(db_session).create(
+        user.id,
+        schemas.JobCreate(type="transcription", input_uri="s3://test-bucket/uploads/late.wav"),
+    )
+    wav = _wav_bytes(1.0)
+    stored = {}
+
+    def download_fileobj(key, fileobj):
+        fileobj.write(wav)
+        # The reaper gives the job to another worker while this one decodes.
+        with TestingSessionLocal() as session:
+            job_repo = repositories.JobRepository(session)
+            job_repo.release_for_retry(job.id, "Worker heartbeat expired", attempts=1)
+            job_repo.claim(job.id)
+        return len(wav)
+
+    monkeypatch.setattr(storage.storage_client, "download_fileobj", download_fileobj)
+    monkeypatch.setattr(storage.storage_client, "put_bytes", lambda key, data, *args: stored.setdefault(key, data))
+    monkeypatch.setattr(db, "get_sessionmaker", lambda: TestingSessionLocal)
+    monkeypatch.setattr(tasks.deps, "get_asr_engine", lambda settings: FakeEngine())
+
+    tasks.transcribe_batch(job.id, {"input_uri": job.input_uri})
+
+    assert stored == {}
+    db_session.expire_all()
+    current = repositories.JobRepository(db_session).get(job.id)
+    assert (current.status, current.attempts, current.output_uri) == (JobStatus.PROCESSING.value, 2, None)
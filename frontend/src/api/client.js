@@ -166,6 +166,13 @@ export const listJobs = async (token) => {
   return handleResponse(response);
 };
 
+export const jobEventsUrl = (token) => {
+  const url = new URL("/v1/jobs/events", API_BASE_URL);
+  url.protocol = url.protocol === "https:" ? "wss:" : "ws:";
+  url.searchParams.set("token", token);
+  return url.toString();
+};
+
 export const createJob = async (token, payload) => {
   const response = await fetch(`${API_BASE_URL}/v1/jobs`, {
     method: "POST",
@@ -1,7 +1,7 @@
 import { message } from "antd";
 import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 
-import { listJobs } from "../api/client.js";
+import { jobEventsUrl, listJobs } from "../api/client.js";
 import { useUser } from "../context/UserContext.jsx";
 
 const normaliseStatus = (status) =>
@@ -57,8 +57,38 @@ const sortByRecentActivity = (jobs) => {
     .slice(0, 5);
 };
 
+const RECONNECT_MIN_MS = 1000;
+const RECONNECT_MAX_MS = 30000;
+
+const upsertJob = (jobs, job) => {
+  const index = jobs.findIndex((item) => item.id === job.id);
+  if (index === -1) {
+    return [job, ...jobs];
+  }
+  const next = [...jobs];
+  next[index] = { ...jobs[index], ...job };
+  return next;
+};
+
+const applyJobEvent = (jobs, event) => {
+  switch (event?.type) {
+    case "snapshot":
+      return Array.isArray(event.jobs) ? event.jobs : jobs;
+    case "job":
+      return event.job ? upsertJob(jobs, { ...event.job, stage: null, progress: null }) : jobs;
+    case "progress":
+      return jobs.map((job) =>
+        job.id === event.job_id
+          ? { ...job, stage: event.stage, progress: event.progress }
+          : job
+      );
+    default:
+      return jobs;
+  }
+};
+
 const useJobsData = (options = {}) => {
-  const { callWithAuth, isAuthenticated } = useUser();
+  const { accessToken, callWithAuth, isAuthenticated } = useUser();
   const [jobs, setJobs] = useState([]);
   const [loading, setLoading] = useState(false);
   const [lastUpdated, setLastUpdated] = useState(null);
@@ -74,6 +104,9 @@ const useJobsData = (options = {}) => {
 
   const autoFetch =
     typeof options === "boolean" ? options : options?.autoFetch ?? true;
+  // Live updates replace polling: the server pushes a snapshot, then every
+  // job change and progress update over a websocket.
+  const live = typeof options === "boolean" ? options : options?.live ?? true;
 
   const refresh = useCallback(async () => {
     if (!isAuthenticated) {
@@ -114,10 +147,75 @@ const useJobsData = (options = {}) => {
   }, [callWithAuth, isAuthenticated]);
 
   useEffect(() => {
-    if (autoFetch) {
+    if (autoFetch && !live) {
       refresh();
     }
-  }, [autoFetch, refresh]);
+  }, [autoFetch, live, refresh]);
+
+  const refreshRef = useRef(refresh);
+  useEffect(() => {
+    refreshRef.current = refresh;
+  }, [refresh]);
+
+  useEffect(() => {
+    if (!live) {
+      return undefined;
+    }
+    if (!isAuthenticated || !accessToken) {
+      setJobs([]);
+      setLastUpdated(null);
+      return undefined;
+    }
+
+    let socket = null;
+    let retryTimer = null;
+    let retryDelay = RECONNECT_MIN_MS;
+    let stopped = false;
+
+    const connect = () => {
+      let synced = false;
+      socket = new WebSocket(jobEventsUrl(accessToken));
+      socket.onmessage = (messageEvent) => {
+        let event;
+        try {
+          event = JSON.parse(messageEvent.data);
+        } catch {
+          return;
+        }
+        if (!mountedRef.current) {
+          return;
+        }
+        if (event.type === "snapshot") {
+          synced = true;
+          retryDelay = RECONNECT_MIN_MS;
+          setLoading(false);
+          setError(null);
+        }
+        setJobs((current) => applyJobEvent(current, event));
+        setLastUpdated(new Date());
+      };
+      socket.onclose = () => {
+        if (stopped) {
+          return;
+        }
+        if (!synced) {
+          // The socket never came up: load the list over HTTP meanwhile.
+          refreshRef.current();
+        }
+        // The next snapshot catches up on anything missed while disconnected.
+        retryTimer = setTimeout(connect, retryDelay);
+        retryDelay = Math.min(retryDelay * 2, RECONNECT_MAX_MS);
+      };
+    };
+
+    setLoading(true);
+    connect();
+    return () => {
+      stopped = true;
+      clearTimeout(retryTimer);
+      socket?.close();
+    };
+  }, [live, isAuthenticated, accessToken]);
 
   const stats = useMemo(() => buildStats(jobs), [jobs]);
   const recentJobs = useMemo(() => sortByRecentActivity(jobs), [jobs]);